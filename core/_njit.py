@@ -0,0 +1,19 @@
+"""
+Numba JIT 兼容層
+已安裝 numba 時使用 numba.njit 編譯，否則原樣返回函數 (純 Python/numpy 執行)
+"""
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        """numba 未安裝時的空裝飾器，支持 @njit 與 @njit(...) 兩種寫法"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
+
+
+__all__ = ["njit"]
@@ -10,6 +10,7 @@ from typing import Tuple, Optional
 from enum import Enum
 
 from config import settings
+from core._njit import njit
 
 
 class TrendDirection(Enum):
@@ -70,6 +71,58 @@ class IndicatorValues:
     low: float
 
 
+@njit(cache=True)
+def _supertrend_loop(
+    close: np.ndarray,
+    upper_band: np.ndarray,
+    lower_band: np.ndarray,
+    period: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Supertrend 逐根K線遞推 (numba 可用時編譯執行)"""
+    n = len(close)
+    supertrend = np.zeros(n)
+    direction = np.zeros(n)
+    final_upper = np.zeros(n)
+    final_lower = np.zeros(n)
+    
+    # 初始值
+    final_upper[period-1] = upper_band[period-1]
+    final_lower[period-1] = lower_band[period-1]
+    supertrend[period-1] = lower_band[period-1]  # 預設為上升趨勢
+    direction[period-1] = 1
+    
+    for i in range(period, n):
+        # 更新上軌
+        if upper_band[i] < final_upper[i-1] or close[i-1] > final_upper[i-1]:
+            final_upper[i] = upper_band[i]
+        else:
+            final_upper[i] = final_upper[i-1]
+        
+        # 更新下軌
+        if lower_band[i] > final_lower[i-1] or close[i-1] < final_lower[i-1]:
+            final_lower[i] = lower_band[i]
+        else:
+            final_lower[i] = final_lower[i-1]
+        
+        # 判斷趨勢方向
+        if direction[i-1] == 1:  # 之前是上升趨勢
+            if close[i] < final_lower[i]:
+                direction[i] = -1  # 轉為下降
+                supertrend[i] = final_upper[i]
+            else:
+                direction[i] = 1
+                supertrend[i] = final_lower[i]
+        else:  # 之前是下降趨勢或初始
+            if close[i] > final_upper[i]:
+                direction[i] = 1  # 轉為上升
+                supertrend[i] = final_lower[i]
+            else:
+                direction[i] = -1
+                supertrend[i] = final_upper[i]
+    
+    return supertrend, direction, final_upper, final_lower
+
+
 class Indicators:
     """技術指標計算器"""
     
@@ -112,49 +165,8 @@ class Indicators:
         upper_band = hl2 + (multiplier * atr)
         lower_band = hl2 - (multiplier * atr)
         
-        # 初始化結果數組
-        n = len(close)
-        supertrend = np.zeros(n)
-        direction = np.zeros(n)
-        final_upper = np.zeros(n)
-        final_lower = np.zeros(n)
-        
-        # 初始值
-        final_upper[period-1] = upper_band[period-1]
-        final_lower[period-1] = lower_band[period-1]
-        supertrend[period-1] = lower_band[period-1]  # 預設為上升趨勢
-        direction[period-1] = 1
-        
-        for i in range(period, n):
-            # 更新上軌
-            if upper_band[i] < final_upper[i-1] or close[i-1] > final_upper[i-1]:
-                final_upper[i] = upper_band[i]
-            else:
-                final_upper[i] = final_upper[i-1]
-            
-            # 更新下軌
-            if lower_band[i] > final_lower[i-1] or close[i-1] < final_lower[i-1]:
-                final_lower[i] = lower_band[i]
-            else:
-                final_lower[i] = final_lower[i-1]
-            
-            # 判斷趨勢方向
-            if direction[i-1] == 1:  # 之前是上升趨勢
-                if close[i] < final_lower[i]:
-                    direction[i] = -1  # 轉為下降
-                    supertrend[i] = final_upper[i]
-                else:
-                    direction[i] = 1
-                    supertrend[i] = final_lower[i]
-            else:  # 之前是下降趨勢或初始
-                if close[i] > final_upper[i]:
-                    direction[i] = 1  # 轉為上升
-                    supertrend[i] = final_lower[i]
-                else:
-                    direction[i] = -1
-                    supertrend[i] = final_upper[i]
-        
-        return supertrend, direction, final_upper, final_lower
+        # 逐根遞推上下軌與趨勢方向
+        return _supertrend_loop(close, upper_band, lower_band, period)
     
     def get_supertrend_result(
         self,
@@ -317,14 +329,10 @@ class Indicators:
             raise ValueError(f"慢速時間框架數據不足: {len(df_slow)} < {min_required}")
         
         # 從快速時間框架取得價格數據
-        high_fast = df_fast['high'].values.astype(np.float64)
-        low_fast = df_fast['low'].values.astype(np.float64)
-        close_fast = df_fast['close'].values.astype(np.float64)
+        high_fast, low_fast, close_fast = self._hlc_arrays(df_fast)
         
         # 從慢速時間框架取得價格數據
-        high_slow = df_slow['high'].values.astype(np.float64)
-        low_slow = df_slow['low'].values.astype(np.float64)
-        close_slow = df_slow['close'].values.astype(np.float64)
+        high_slow, low_slow, close_slow = self._hlc_arrays(df_slow)
         
         current_price = close_fast[-1]
         
@@ -384,6 +392,18 @@ class Indicators:
             low=low_fast[-1]
         )
     
+    @staticmethod
+    def _hlc_arrays(df: pd.DataFrame) -> np.ndarray:
+        """
+        一次性取出 high/low/close 為 float64 數組
+
+        Returns:
+            形狀 (3, n) 的 C 連續數組，每行可直接傳入 TA-Lib
+        """
+        return np.ascontiguousarray(
+            df[['high', 'low', 'close']].to_numpy(dtype=np.float64).T
+        )
+    
     def _safe_get_last(self, arr: np.ndarray, default: float) -> float:
         """安全取得數組最後一個值，處理 NaN"""
         if len(arr) == 0:
@@ -421,16 +441,11 @@ class Indicators:
         if len(close) < lookback:
             return 0.0
         
-        recent_close = close[-lookback:]
-        trend_count = 0
-        
-        for i in range(len(recent_close) - 1):
-            if direction == TrendDirection.UP:
-                if recent_close[i + 1] > recent_close[i]:
-                    trend_count += 1
-            else:
-                if recent_close[i + 1] < recent_close[i]:
-                    trend_count += 1
+        changes = np.diff(close[-lookback:])
+        if direction == TrendDirection.UP:
+            trend_count = int(np.count_nonzero(changes > 0))
+        else:
+            trend_count = int(np.count_nonzero(changes < 0))
         
         strength = trend_count / (lookback - 1) if lookback > 1 else 0
         return strength
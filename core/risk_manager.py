@@ -2,6 +2,7 @@
 風險管理模組
 處理動態槓桿、風險控制、回撤保護等
 """
+import time
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from typing import List, Optional
@@ -52,6 +53,9 @@ class RiskMetrics:
 class RiskManager:
     """風險管理器"""
     
+    # get_metrics() 結果的快取時間 (秒)，同一週期內的多次調用共用一次計算
+    METRICS_CACHE_TTL = 1.0
+    
     def __init__(self, initial_balance: float):
         self.config = settings
         self.initial_balance = initial_balance
@@ -81,6 +85,9 @@ class RiskManager:
         
         # 最大回撤追蹤
         self.max_drawdown = 0.0
+        
+        # 風險指標快取 (monotonic 時間戳, RiskMetrics)，狀態變更時清除
+        self._metrics_cache: Optional[tuple[float, RiskMetrics]] = None
     
     def _get_day_start(self) -> datetime:
         """取得今天 UTC 0:00"""
@@ -114,6 +121,8 @@ class RiskManager:
     
     def update_balance(self, new_balance: float):
         """更新餘額並追蹤峰值"""
+        if new_balance != self.current_balance:
+            self._metrics_cache = None
         self.current_balance = new_balance
         
         if new_balance > self.peak_balance:
@@ -128,6 +137,7 @@ class RiskManager:
             strategy: 使用的策略
         """
         self._check_reset_periods()
+        self._metrics_cache = None
         
         pnl_percent = pnl / self.current_balance if self.current_balance > 0 else 0
         is_win = pnl > 0
@@ -271,13 +281,18 @@ class RiskManager:
         return False, None
     
     def get_metrics(self) -> RiskMetrics:
-        """取得風險指標"""
+        """取得風險指標 (METRICS_CACHE_TTL 內返回快取結果)"""
+        now = time.monotonic()
+        cached = self._metrics_cache
+        if cached and now - cached[0] < self.METRICS_CACHE_TTL:
+            return cached[1]
+        
         self._check_reset_periods()
         
         can_trade, stop_reason = self.can_trade()
         leverage = self.calculate_leverage() if can_trade else 0
         
-        return RiskMetrics(
+        metrics = RiskMetrics(
             current_leverage=leverage,
             available_leverage=self.config.leverage.max_leverage,
             total_trades=len(self.trade_history),
@@ -294,21 +309,26 @@ class RiskManager:
             stop_reason=stop_reason,
             cooldown_until=self.cooldown_until
         )
+        self._metrics_cache = (now, metrics)
+        return metrics
     
     def reset_daily(self):
         """重置日統計"""
+        self._metrics_cache = None
         self.daily_pnl = 0.0
         self.daily_trades = 0
         self.day_start = self._get_day_start()
     
     def reset_weekly(self):
         """重置週統計"""
+        self._metrics_cache = None
         self.weekly_pnl = 0.0
         self.weekly_trades = 0
         self.week_start = self._get_week_start()
     
     def reset_all(self):
         """完全重置"""
+        self._metrics_cache = None
         self.trade_history.clear()
         self.consecutive_wins = 0
         self.consecutive_losses = 0
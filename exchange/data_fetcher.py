@@ -40,6 +40,9 @@ class DataFetcher:
         "1d": 86400
     }
     
+    # 批量獲取時的最大並發市場數 (避免超過 API 速率限制)
+    BATCH_CONCURRENCY = 8
+    
     def __init__(self):
         self.config = settings
         self._api_client = None
@@ -387,6 +390,31 @@ class DataFetcher:
 
         return fast_df, slow_df
     
+    async def get_dual_timeframe_batch(
+        self,
+        market_ids: List[int]
+    ) -> Dict[int, tuple[pd.DataFrame, pd.DataFrame] | Exception]:
+        """
+        批量獲取多個市場的雙時間框架數據
+
+        Args:
+            market_ids: 市場 ID 列表
+
+        Returns:
+            {market_id: (fast_df, slow_df)}，獲取失敗的市場對應其異常
+        """
+        semaphore = asyncio.Semaphore(self.BATCH_CONCURRENCY)
+
+        async def fetch_one(market_id: int):
+            async with semaphore:
+                return await self.get_dual_timeframe_data(market_id=market_id)
+
+        results = await asyncio.gather(
+            *(fetch_one(market_id) for market_id in market_ids),
+            return_exceptions=True
+        )
+        return dict(zip(market_ids, results))
+    
     def clear_cache(self):
         """清除緩存"""
         self._candle_cache.clear()
@@ -2,10 +2,11 @@
 Lighter DEX 客戶端適配器
 將已封裝好的 LighterClient 適配成量化交易機器人需要的接口
 """
+import asyncio
 import os
 import time
 from typing import Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 
 from config import settings, SignalType
@@ -29,7 +30,7 @@ class LeverageResult:
     message: str
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     """持倉資訊"""
     market_id: int
@@ -40,6 +41,7 @@ class Position:
     leverage: float               # 槓桿
     liquidation_price: Optional[float]  # 強平價格
     side: str = "LONG"            # 方向 (LONG/SHORT) - 默認為 LONG，初始化後會根據 size 更新
+    entry_value: float = field(init=False, repr=False)  # 進場名義價值 (|size| × entry_price)
 
     def __post_init__(self):
         """初始化後處理"""
@@ -47,6 +49,8 @@ class Position:
             self.side = "SHORT"
         else:
             self.side = "LONG"
+        # slots 類別沒有 __dict__，無法用 cached_property，改為建構時計算一次
+        self.entry_value = abs(self.size) * self.entry_price
 
 
 @dataclass
@@ -269,7 +273,7 @@ class LighterClientAdapter:
         
         try:
             # 使用實際客戶端創建市價單
-            client_order_index = int(time.time() * 1000) % 1000000
+            client_order_index = self._client.next_client_order_index()
             
             result = await self._client.create_market_order(
                 market_index=market_id,
@@ -337,7 +341,7 @@ class LighterClientAdapter:
             )
         
         try:
-            client_order_index = int(time.time() * 1000) % 1000000
+            client_order_index = self._client.next_client_order_index()
             
             # 設置 time_in_force
             if post_only:
@@ -446,7 +450,7 @@ class LighterClientAdapter:
                     trigger_price = current_price * (1 + max_price_deviation)
                 logger.info(f"調整後的止損價格: {trigger_price:.2f}")
 
-            client_order_index = int(time.time() * 1000) % 1000000
+            client_order_index = self._client.next_client_order_index()
             
             # 使用 WebSocket 方式創建止損單（如果可用）
             if hasattr(self._client, 'ws_create_stop_loss_order'):
@@ -560,7 +564,7 @@ class LighterClientAdapter:
                     trigger_price = current_price * (1 - max_price_deviation)
                 logger.info(f"調整後的止盈價格: {trigger_price:.2f}")
 
-            client_order_index = int(time.time() * 1000) % 1000000
+            client_order_index = self._client.next_client_order_index()
             
             # 使用 WebSocket 方式創建止盈單（如果可用）
             if hasattr(self._client, 'ws_create_take_profit_order'):
@@ -746,21 +750,24 @@ class LighterClientAdapter:
                         logger.info(f"market_id={market_id} 沒有待取消的訂單")
                         return True
 
-                    # 逐一取消訂單
-                    success_count = 0
-                    for order in open_orders:
-                        order_index = order.get("order_index")
-                        order_market = order.get("market_index")
-                        if order_index is not None and order_market == market_id:
-                            try:
-                                cancel_result = await self._client.cancel_order_by_market_index(
-                                    market_index=market_id,
-                                    order_index=order_index
-                                )
-                                if cancel_result.get("success"):
-                                    success_count += 1
-                            except Exception as cancel_err:
-                                logger.warning(f"取消訂單 {order_index} 失敗: {cancel_err}")
+                    # 並行取消各訂單
+                    async def cancel_one(order_index) -> bool:
+                        try:
+                            cancel_result = await self._client.cancel_order_by_market_index(
+                                market_index=market_id,
+                                order_index=order_index
+                            )
+                            return bool(cancel_result.get("success"))
+                        except Exception as cancel_err:
+                            logger.warning(f"取消訂單 {order_index} 失敗: {cancel_err}")
+                            return False
+
+                    cancel_results = await asyncio.gather(*(
+                        cancel_one(order.get("order_index"))
+                        for order in open_orders
+                        if order.get("order_index") is not None and order.get("market_index") == market_id
+                    ))
+                    success_count = sum(cancel_results)
 
                     logger.info(f"market_id={market_id} 取消了 {success_count}/{len(open_orders)} 個訂單")
                     return success_count > 0 or len(open_orders) == 0
@@ -859,13 +866,13 @@ class LighterClientAdapter:
             if hasattr(self._client, 'ws_close_all_positions'):
                 return await self._client.ws_close_all_positions()
             else:
-                # 手動平倉每個持倉
+                # 手動並行平倉每個持倉
                 account = await self.get_account_info()
-                results = []
-                for pos in account.positions:
-                    if abs(pos.size) > 1e-9:
-                        result = await self.close_position(pos.market_id)
-                        results.append(result)
+                results = await asyncio.gather(*(
+                    self.close_position(pos.market_id)
+                    for pos in account.positions
+                    if abs(pos.size) > 1e-9
+                ))
                 
                 return {
                     "success": all(r.success for r in results),
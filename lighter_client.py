@@ -4,13 +4,21 @@
 """
 
 import asyncio
+import functools
+import itertools
 import json
 import logging
+import re
 import time
 import threading
-from typing import Dict, List, Optional, Any, Callable
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+from typing import Dict, List, Optional, Any, Callable, Tuple, Final, Iterable
 from decimal import Decimal
 
+import numpy as np
+
 # Lighter SDK imports
 from lighter import Configuration
 from lighter.signer_client import SignerClient, CreateOrderTxReq
@@ -23,13 +31,244 @@ from lighter.models.detailed_accounts import DetailedAccounts
 from lighter.models.orders import Orders
 from lighter.models.order_books import OrderBooks
 
-# WebSocket imports
+# HTTP / WebSocket imports
+import aiohttp
 import websockets
 
+# JSON 編解碼：優先使用 orjson (C 實現)，未安裝時回退到標準庫 json
+try:
+    import orjson
+    _json_loads = orjson.loads
+    
+    def _json_dumps(obj) -> str:
+        # orjson 返回 bytes；WebSocket 文本幀與表單字段需要 str
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+
+# 下單路徑常用的 SignerClient 常數，綁定為模塊常量，避免每筆訂單查找類屬性
+# 交易類型與 IOC 過期時間並非所有 SDK 版本都有定義 (如 lighter-sdk 0.1.5)，缺少時使用協議數值
+_TX_CREATE_ORDER: Final[int] = getattr(SignerClient, "TX_TYPE_CREATE_ORDER", 14)
+_TX_CANCEL_ORDER: Final[int] = getattr(SignerClient, "TX_TYPE_CANCEL_ORDER", 15)
+_TX_CANCEL_ALL_ORDERS: Final[int] = getattr(SignerClient, "TX_TYPE_CANCEL_ALL_ORDERS", 16)
+_IOC_EXPIRY: Final[int] = getattr(SignerClient, "DEFAULT_IOC_EXPIRY", 0)
+_ORDER_TYPE_MARKET: Final[int] = SignerClient.ORDER_TYPE_MARKET
+_TIME_IN_FORCE_IOC: Final[int] = SignerClient.ORDER_TIME_IN_FORCE_IMMEDIATE_OR_CANCEL
+_TIME_IN_FORCE_GTT: Final[int] = SignerClient.ORDER_TIME_IN_FORCE_GOOD_TILL_TIME
+_CANCEL_ALL_TIF_IMMEDIATE: Final[int] = SignerClient.CANCEL_ALL_TIF_IMMEDIATE
+
+# 止損/止盈單的有效期 (30 天，毫秒)
+_THIRTY_DAYS_MS: Final[int] = 30 * 24 * 3600 * 1000
+
 # 設置日誌
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("lighter_client")
 
+
+# 交易回執中的 tx_hash，短回執命中時無需完整解析 JSON
+_TX_HASH_RE = re.compile(r'"tx_hash"\s*:\s*"([^"]+)"')
+
+# 視為短回執的最大長度，更長的回應走完整解析
+_SHORT_ACK_MAX_LEN = 256
+
+
+def _noop():
+    """空操作，用於替換只需執行一次的檢查"""
+
+
+# 10 的冪次查表，用於數量精度換算
+_TENS = tuple(10 ** i for i in range(19))
+
+# 持倉對象沒有 __dict__ 時需要讀取的欄位
+_POS_FIELDS = (
+    'market_id', 'market_index', 'position', 'position_amount', 'base_amount', 'size', 'amount',
+    'symbol', 'initial_margin_fraction', 'open_order_count', 'pending_order_count',
+    'position_tied_order_count', 'sign', 'avg_entry_price', 'average_entry_price',
+    'position_value', 'unrealized_pnl', 'realized_pnl', 'liquidation_price',
+    'total_funding_paid_out', 'margin_mode', 'allocated_margin',
+)
+
+
+def _safe_float(val) -> float:
+    if val is None:
+        return 0.0
+    try:
+        return float(val)
+    except Exception:
+        return 0.0
+
+
+def _safe_int(val) -> int:
+    if val is None:
+        return 0
+    try:
+        return int(val)
+    except Exception:
+        return 0
+
+
+def _safe_str(val) -> str:
+    return str(val) if val is not None else ""
+
+
+def _optional_int(val) -> Optional[int]:
+    """轉為整數，缺失或無法轉換時返回 None (用於市場索引)"""
+    if val is None:
+        return None
+    try:
+        return int(val)
+    except Exception:
+        return None
+
+
+# 持倉數量的候選欄位 (依序取第一個非空值)；官方欄位為 "position"
+_POSITION_AMOUNT_KEYS = ('position', 'position_amount', 'base_amount', 'size', 'amount')
+
+
+def _tx_hash_value(tx_hash):
+    """安全地提取 tx_hash 值 - tx_hash 是 RespSendTx 對象"""
+    if not tx_hash:
+        return None
+    if hasattr(tx_hash, 'tx_hash'):
+        return tx_hash.tx_hash
+    if hasattr(tx_hash, 'hash'):
+        return tx_hash.hash
+    return str(tx_hash)
+
+
+def _ws_api_handler(operation: str):
+    """WS 交易方法的統一包裝：先確認客戶端已初始化，異常轉換為統一的錯誤格式"""
+    def decorator(method):
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            try:
+                self._ensure_initialized()
+                return await method(self, *args, **kwargs)
+            except Exception as e:
+                return self._handle_api_error(operation, e)
+        return wrapper
+    return decorator
+
+
+# 訂單資訊構造函數，REST 與 WebSocket 下單路徑共用，保證兩者回傳的欄位一致
+# 參數僅限關鍵字傳入：is_ask / reduce_only 同為布林值，按位置傳入時互換不會報錯
+
+def _limit_order_info(*, market_index: int, client_order_index: int, base_amount: float,
+                      price: float, is_ask: bool, reduce_only: bool) -> Dict:
+    """限價訂單資訊"""
+    return {
+        "market_index": market_index,
+        "client_order_index": client_order_index,
+        "base_amount": base_amount,
+        "price": price,
+        "is_ask": is_ask,
+        "order_type": "limit",
+        "reduce_only": reduce_only
+    }
+
+
+def _market_order_info(*, market_index: int, client_order_index: int, base_amount: float,
+                       is_ask: bool, reduce_only: bool, max_slippage: Optional[float]) -> Dict:
+    """市價訂單資訊"""
+    return {
+        "market_index": market_index,
+        "client_order_index": client_order_index,
+        "base_amount": base_amount,
+        "is_ask": is_ask,
+        "order_type": "market",
+        "reduce_only": reduce_only,
+        "max_slippage": max_slippage
+    }
+
+
+def _cancel_order_info(*, market_index: int, order_index: int) -> Dict:
+    """取消訂單資訊"""
+    return {
+        "market_index": market_index,
+        "order_index": order_index
+    }
+
+
+def _build_order_formatter(operation: str, info_key: str, build_info: Callable[..., Dict]):
+    """為固定形狀的訂單回應生成專用格式化方法
+    
+    與 _format_response 的結果一致，訂單資訊由對應的構造函數 (僅限關鍵字參數) 生成。
+    """
+    def format_order_response(self, created_tx, tx_hash, error, **fields) -> Dict:
+        if error is not None:
+            return self._handle_api_error(operation, Exception(str(error)))
+        if tx_hash is None:
+            return self._handle_api_error(operation, Exception("API回應無效：tx_hash為空"))
+        
+        info = build_info(**fields)
+        result = {
+            "success": True,
+            "tx_hash": _tx_hash_value(tx_hash),
+            info_key: info
+        }
+        
+        self._invalidate_open_orders_cache()
+        logger.info(f"{operation}成功 - TX Hash: {result['tx_hash']}")
+        return result
+    
+    return format_order_response
+
+
+class _DispatchChannel:
+    """有界回調分發通道
+    
+    WebSocket 處理函數只把數據放入緩衝區，由獨立的工作任務調用用戶回調，
+    慢速或阻塞的回調不會拖慢 WebSocket 讀取，也不會影響其他訂閱者。
+    緩衝區滿時丟棄最舊的數據。
+    """
+    
+    def __init__(self, callback: Callable[[Dict], Any], name: str, maxsize: int = 1024):
+        self.callback = callback
+        self.name = name
+        self.dropped = 0
+        self._buffer = deque(maxlen=maxsize)
+        self._ready = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        self._task = self._loop.create_task(self._run())
+    
+    def put_nowait(self, payload: Dict):
+        """放入一筆數據，永不阻塞"""
+        if len(self._buffer) == self._buffer.maxlen:
+            self.dropped += 1
+        self._buffer.append(payload)
+        
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is self._loop:
+            self._ready.set()
+        else:
+            # 處理函數可能在其他線程被調用 (例如同步模式的 WsClient)
+            self._loop.call_soon_threadsafe(self._ready.set)
+    
+    async def _run(self):
+        buffer = self._buffer
+        while True:
+            await self._ready.wait()
+            self._ready.clear()
+            while buffer:
+                payload = buffer.popleft()
+                try:
+                    result = self.callback(payload)
+                    if asyncio.iscoroutine(result):
+                        await result
+                except Exception as cb_error:
+                    logger.error(f"處理{self.name}回調時出錯: {cb_error}")
+    
+    def close(self):
+        """停止工作任務"""
+        if self.dropped:
+            logger.warning(f"{self.name}回調通道共丟棄 {self.dropped} 筆數據")
+        self._task.cancel()
+
+
 class LighterClient:
     """Lighter API 客戶端 - 重構版本
     
@@ -37,6 +276,78 @@ class LighterClient:
     參考 backpack_futures_client.py 的接口設計
     """
     
+    # 單次批量提交的最大訂單數
+    MAX_BATCH_ORDERS = 50
+    
+    # 持倉條目數達到此值時改用向量化解析
+    POSITIONS_FRAME_THRESHOLD = 8
+    
+    # 未提供當前價格時市價單的最差可接受價格，以 is_ask 索引：
+    # 買單 $10,000,000 / 賣單 $0.01 (價格 * 100000)
+    _WORST_PRICES = (1000000000000, 1000)
+    # ws_create_market_order 使用的執行價格：買單 $1000.00 / 賣單 $10.00
+    _WS_AVG_EXEC_PRICES = (100000 * 100, 1000 * 100)
+    
+    # 最優買賣價緩存的最大有效時間 (秒)，超過則視為過期
+    TOB_MAX_AGE = 2.0
+    
+    # 平倉所有持倉時同時在途的平倉訂單上限
+    CLOSE_ALL_CONCURRENCY = 8
+    
+    # 掛單緩存的有效時間 (秒)
+    OPEN_ORDERS_CACHE_TTL = 0.5
+    
+    # 持倉緩存的有效時間 (秒)
+    POSITIONS_CACHE_TTL = 0.5
+    
+    # 常用訂單回應的專用格式化方法
+    _format_limit_order_response = _build_order_formatter("創建限價訂單", "order_info", _limit_order_info)
+    _format_market_order_response = _build_order_formatter("創建市價訂單", "order_info", _market_order_info)
+    _format_cancel_order_response = _build_order_formatter("取消訂單", "cancelled_order", _cancel_order_info)
+    
+    # 市場數值欄位
+    _MARKET_FIELDS = ("funding_rate", "mark_price", "index_price", "open_interest")
+    
+    # 市場信息中駝峰命名欄位 -> 統一的蛇形命名
+    _MARKET_KEY_ALIASES = {
+        "fundingRate": "funding_rate",
+        "markPrice": "mark_price",
+        "indexPrice": "index_price",
+        "openInterest": "open_interest",
+    }
+    
+    # 市場數值欄位緩存有效時間 (秒)：資金費率按小時結算，價格變化較快
+    MARKET_FIELD_TTLS = {
+        "funding_rate": 3600.0,
+        "mark_price": 0.5,
+        "index_price": 0.5,
+        "open_interest": 5.0,
+    }
+    
+    # 認證令牌有效期 (SDK 默認 10 分鐘) 與提前刷新的餘量 (秒)
+    AUTH_TOKEN_TTL = 600
+    AUTH_TOKEN_REFRESH_MARGIN = 5
+    
+    # 完整的Ticker到Market ID映射 (從API獲取)
+    TICKER_TO_MARKET_ID = {
+        "1000BONK": 18, "1000FLOKI": 19, "1000PEPE": 4, "1000SHIB": 17,
+        "AAVE": 27, "ADA": 39, "AERO": 65, "AI16Z": 22, "APT": 31, "ARB": 50,
+        "AVAX": 9, "BCH": 58, "BERA": 20, "BNB": 25, "BTC": 1, "CRO": 73,
+        "CRV": 36, "DOGE": 3, "DOLO": 75, "DOT": 11, "DYDX": 62, "EIGEN": 49,
+        "ENA": 29, "ETH": 0, "ETHFI": 64, "FARTCOIN": 21, "GMX": 61, "GRASS": 52,
+        "HBAR": 59, "HYPE": 24, "IP": 34, "JUP": 26, "KAITO": 33, "LAUNCHCOIN": 54,
+        "LDO": 46, "LINEA": 76, "LINK": 8, "LTC": 35, "MKR": 28, "MNT": 63,
+        "MORPHO": 68, "NEAR": 10, "NMR": 74, "ONDO": 38, "OP": 55, "PAXG": 48,
+        "PENDLE": 37, "PENGU": 47, "POL": 14, "POPCAT": 23, "PROVE": 57, "PUMP": 45,
+        "RESOLV": 51, "S": 40, "SEI": 32, "SOL": 2, "SPX": 42, "SUI": 16,
+        "SYRUP": 44, "TAO": 13, "TIA": 67, "TON": 12, "TRUMP": 15, "TRX": 43,
+        "UNI": 30, "USELESS": 66, "VIRTUAL": 41, "VVV": 69, "WIF": 5, "WLD": 6,
+        "WLFI": 72, "XPL": 71, "XRP": 7, "YZY": 70, "ZK": 56, "ZORA": 53, "ZRO": 60,
+    }
+    
+    # 反向映射 (Market ID -> Ticker)，由正向映射生成一次
+    MARKET_ID_TO_TICKER = {market_id: ticker for ticker, market_id in TICKER_TO_MARKET_ID.items()}
+    
     # 從 SignerClient 繼承常數
     ORDER_TYPE_LIMIT = SignerClient.ORDER_TYPE_LIMIT
     ORDER_TYPE_MARKET = SignerClient.ORDER_TYPE_MARKET
@@ -67,7 +378,9 @@ class LighterClient:
                  account_index: Optional[int] = None,
                  max_api_key_index: int = -1,
                  private_keys: Optional[Dict[int, str]] = None,
-                 base_url: str = "https://mainnet.zklighter.elliot.ai"):
+                 base_url: str = "https://mainnet.zklighter.elliot.ai",
+                 use_ws_orders: bool = True,
+                 tob_market_ids: Optional[List[int]] = None):
         """
         初始化 Lighter 客戶端 - 重構版本
         
@@ -78,6 +391,8 @@ class LighterClient:
             max_api_key_index: 最大 API 密鑰索引
             private_keys: 多個 API 私鑰字典（可選）
             base_url: API 基礎 URL
+            use_ws_orders: 是否優先通過持久 WebSocket 提交限價/市價訂單 (斷線時回退到 REST)
+            tob_market_ids: 初始化時訂閱訂單簿並維護最優買賣價的市場列表 (可選)
         """
         self.api_private_key = api_private_key
         self.api_key_index = api_key_index
@@ -85,6 +400,8 @@ class LighterClient:
         self.max_api_key_index = max_api_key_index
         self.private_keys = private_keys or {}
         self.base_url = base_url
+        self.use_ws_orders = use_ws_orders
+        self.tob_market_ids = list(tob_market_ids or [])
         
         # 配置 Lighter SDK
         self.configuration = Configuration(host=base_url)
@@ -96,17 +413,85 @@ class LighterClient:
         self.transaction_api = None
         self.ws_client = None
         
+        # 共享的 HTTP 連接池 (keep-alive)，供 SignerClient 與查詢 API 共用
+        self._http_session: Optional[aiohttp.ClientSession] = None
+        
+        # WebSocket 端點：從 base_url 解析一次，連接與訂閱共用
+        url_parts = urlsplit(base_url)
+        self._ws_scheme = 'wss' if url_parts.scheme == 'https' else 'ws'
+        self._ws_host = url_parts.netloc
+        
         # WebSocket 持久連接管理 (用於交易)
         self._ws_connection = None
         self._ws_lock = asyncio.Lock()
-        self._ws_url = None
+        self._ws_url = f"{self._ws_scheme}://{self._ws_host}/stream"
         self._last_ws_error_time = 0
         
+        # 交易回應由單一讀取任務接收，按發送順序分派給等待中的請求
+        # (連接, 讀取任務, 待回應隊列)，隨連接重建
+        self._ws_reader: Optional[Tuple[Any, asyncio.Task, deque]] = None
+        self._ws_send_lock = asyncio.Lock()
+        
         # WebSocket 訂閱管理 (用於數據訂閱) - 重構為持久連接模式
         self._subscription_ws_client = None
         self._subscription_active = False
         self._subscribed_accounts = set()
         self._subscribed_orderbooks = set()
+        # 待套用的訂閱，由 _flush_subscriptions() 一次性寫入 WsClient
+        self._pending_account_adds: List[int] = []
+        self._pending_ob_adds: List[int] = []
+        
+        # nonce 分配：優先共用 SignerClient 的 nonce 管理器，否則本地計數
+        self._sdk_nonce_manager = None
+        self._next_nonce: Optional[int] = None
+        # 交易失敗後 SDK nonce 管理器的樂觀計數可能超前鏈上，下次分配前需重新同步
+        self._sdk_nonce_stale = False
+        self._nonce_lock = asyncio.Lock()
+        
+        # 簽名在專用線程中執行 (簽名庫經 ctypes 調用，執行期間釋放 GIL)，不阻塞事件循環；
+        # 單線程保證簽名按 nonce 分配順序完成，發送順序與 nonce 一致
+        self._sign_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lighter-sign")
+        
+        # 客戶端訂單索引計數器：啟動時以毫秒時間戳為種子，之後單調遞增，避免同毫秒併發下單衝突
+        self._coi_counter = itertools.count(time.time_ns() // 1_000_000 % 1000000)
+        
+        # 最優買賣價緩存 (由 _orderbook_loop 維護): market_index -> (best_bid, best_ask, 更新時間)
+        self._tob: Dict[int, Tuple[float, float, float]] = {}
+        self._orderbooks: Dict[int, Tuple[Dict[float, float], Dict[float, float]]] = {}
+        self._tob_task: Optional[asyncio.Task] = None
+        
+        # 掛單緩存 (由帳戶推送或 REST 查詢刷新): market_id -> 訂單列表 / 更新時間
+        self._orders_by_market: Dict[int, List[Dict]] = {}
+        self._orders_cache_ts: Dict[int, float] = {}
+        
+        # 持倉緩存: (過期時間, market_index -> 持倉, 持倉列表)
+        self._positions_cache: Optional[Tuple[float, Dict[int, Dict], List[Dict]]] = None
+        # 持倉緩存的失效計數，查詢期間緩存被失效時不寫回查詢結果 (結果可能早於成交)
+        self._positions_cache_gen = 0
+        
+        # 限價單模板緩存 (由 prepare_order_template 填充)
+        self._order_templates: Dict[tuple, Dict] = {}
+        
+        # 進行中的市場信息請求: (market_id, 欄位) -> Future，併發調用共用同一次請求
+        self._market_info_inflight: Dict[tuple, asyncio.Future] = {}
+        
+        # 市場數值欄位緩存: (market_index, 欄位) -> (值, 過期時間 monotonic)
+        self._market_field_cache: Dict[Tuple[int, str], Tuple[float, float]] = {}
+        
+        # 認證令牌緩存 (token, 過期時間戳)
+        self._auth_token_cache: Optional[Tuple[str, float]] = None
+        
+        # 市場精度信息 (size_decimals, price_decimals)，初始化時從 market.json 載入一次
+        self._market_meta: Optional[Dict[int, tuple]] = None
+        
+        # 市場索引 -> 數量乘數，由 _get_amount_multiplier 按需填充
+        self._amount_multipliers: Dict[int, int] = {}
+        
+        # 市場索引 -> 價格乘數，由 _get_price_multiplier 按需填充
+        self._price_multipliers: Dict[int, int] = {}
+        
+        # 交易對符號 -> 市場索引緩存，預先填入已知 ticker
+        self._symbol_cache: Dict[str, int] = dict(self.TICKER_TO_MARKET_ID)
         self._subscription_callbacks = {
             'order_fills': [],
             'order_updates': [],
@@ -123,13 +508,101 @@ class LighterClient:
         """異步初始化客戶端 - 重構版本"""
         if not self._initialized:
             await self._init_clients()
+            self._load_market_meta()
             self._initialized = True
             logger.info(f"Lighter 客戶端初始化完成 - 帳戶索引: {self.account_index}")
+            
+            # 預先建立下單用的持久 WebSocket，失敗時下單會回退到 REST
+            if self.use_ws_orders:
+                try:
+                    await self._ensure_websocket_connection(max_retries=0)
+                except Exception as e:
+                    logger.warning(f"下單 WebSocket 預連接失敗，將使用 REST 下單: {e}")
+            
+            if self.tob_market_ids:
+                self.start_top_of_book(self.tob_market_ids)
     
-    def _ensure_initialized(self):
-        """確保客戶端已初始化"""
-        if not self._initialized:
-            raise RuntimeError("客戶端尚未初始化，請先調用 await client.initialize()")
+    def next_client_order_index(self) -> int:
+        """生成下一個客戶端訂單索引 (單調遞增；適配器下單時也從這裡取號)"""
+        return next(self._coi_counter) % 1000000
+    
+    async def _allocate_nonces(self, count: int = 1) -> List[int]:
+        """分配 count 個遞增的 nonce，避免每筆訂單都請求一次 next_nonce
+        
+        SignerClient 自帶 nonce 管理器時與其共用同一序列 (REST 下單也從中取號)，
+        否則在本地計數，首次使用或失效後才向 API 同步一次。
+        """
+        async with self._nonce_lock:
+            nonce_manager = self._sdk_nonce_manager
+            if nonce_manager is not None:
+                if self._sdk_nonce_stale:
+                    await self._resync_sdk_nonce(nonce_manager)
+                return [nonce_manager.next_nonce()[1] for _ in range(count)]
+            
+            if self._next_nonce is None:
+                next_nonce_response = await self.transaction_api.next_nonce(
+                    account_index=self.account_index,
+                    api_key_index=self.api_key_index
+                )
+                self._next_nonce = next_nonce_response.nonce
+            start = self._next_nonce
+            self._next_nonce = start + count
+            return list(range(start, start + count))
+    
+    async def _allocate_nonce(self) -> int:
+        """分配一個 nonce"""
+        return (await self._allocate_nonces(1))[0]
+    
+    async def _sign(self, sign_fn: Callable, **kwargs):
+        """在簽名線程中執行 SignerClient 的 sign_* 方法
+        
+        必須在分配 nonce 後立即調用 (中間不能有 await)，以保持提交順序與 nonce 順序一致。
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            self._sign_executor, functools.partial(sign_fn, **kwargs)
+        )
+    
+    async def _allocate_and_sign(self, sign_fn: Callable, **kwargs):
+        """分配一個 nonce 並立即簽名，返回 (tx_info, error)
+        
+        簽名返回錯誤或拋出異常時該 nonce 不會上鏈，需使其失效，否則之後的交易都會因 nonce 斷檔被拒。
+        """
+        nonce = await self._allocate_nonce()
+        try:
+            tx_info, error = await self._sign(sign_fn, nonce=nonce, **kwargs)
+        except BaseException:
+            self._invalidate_nonce()
+            raise
+        if error is not None:
+            self._invalidate_nonce()
+        return tx_info, error
+    
+    def _invalidate_nonce(self):
+        """交易失敗後使 nonce 失效，下次分配時重新向 API 同步
+        
+        本地計數與 SDK nonce 管理器兩條路徑都需處理：後者的樂觀計數不讀取 _next_nonce，
+        不重新同步的話之後每筆交易都會因 nonce 斷檔而失敗。
+        """
+        self._next_nonce = None
+        if self._sdk_nonce_manager is not None:
+            self._sdk_nonce_stale = True
+    
+    async def _resync_sdk_nonce(self, nonce_manager):
+        """將 SDK nonce 管理器重新對齊鏈上 nonce (需在 _nonce_lock 內調用)
+        
+        優先 hard_refresh_nonce (同步 HTTP 請求，放到線程執行)；
+        不支持或失敗時回退到 acknowledge_failure 回退一個 nonce。
+        """
+        if hasattr(nonce_manager, 'hard_refresh_nonce'):
+            try:
+                await asyncio.to_thread(nonce_manager.hard_refresh_nonce, self.api_key_index)
+                self._sdk_nonce_stale = False
+                return
+            except Exception as e:
+                logger.warning("重新同步 nonce 失敗，回退樂觀計數: %s", e)
+        if hasattr(nonce_manager, 'acknowledge_failure'):
+            nonce_manager.acknowledge_failure(self.api_key_index)
+        self._sdk_nonce_stale = False
     
     async def _init_clients(self):
         """初始化各種客戶端 - 重構版本，簡化邏輯"""
@@ -146,18 +619,79 @@ class LighterClient:
                 api_private_keys={self.api_key_index: self.api_private_key},    # positional private_key  
             )
                         
+            # 帳戶信息在初始化時同步一次，下單路徑不再逐筆檢查
+            self._sync_signer_account()
+            
+            nonce_manager = getattr(self.signer_client, 'nonce_manager', None)
+            if callable(getattr(nonce_manager, 'next_nonce', None)):
+                self._sdk_nonce_manager = nonce_manager
+                        
             # 初始化 API 客戶端（用於查詢功能）
             api_client = ApiClient(configuration=self.configuration)
             self.account_api = AccountApi(api_client=api_client)
             self.order_api = OrderApi(api_client=api_client)
             self.transaction_api = TransactionApi(api_client=api_client)
             
+            # 所有 REST 請求共用同一個 keep-alive 連接池，避免每個客戶端各自握手
+            self._http_session = self._create_http_session()
+            self._attach_http_session(api_client)
+            self._attach_http_session(getattr(self.signer_client, 'api_client', None))
+            
             logger.info("客戶端初始化成功")
             
         except Exception as e:
             logger.error(f"初始化客戶端失敗: {e}")
             raise
     
+    def _sync_signer_account(self):
+        """確保 SignerClient 使用正確的帳戶索引與 API 密鑰索引"""
+        if self.signer_client.account_index != self.account_index:
+            logger.warning(f"SignerClient account_index ({self.signer_client.account_index}) 與當前 account_index ({self.account_index}) 不匹配，正在修正...")
+            self.signer_client.account_index = self.account_index
+        
+        if self.signer_client.api_key_index != self.api_key_index:
+            logger.warning(f"SignerClient api_key_index ({self.signer_client.api_key_index}) 與當前 api_key_index ({self.api_key_index}) 不匹配，正在修正...")
+            self.signer_client.api_key_index = self.api_key_index
+    
+    def set_account(self, account_index: int, api_key_index: Optional[int] = None):
+        """切換帳戶 - 同時更新客戶端與 SignerClient 的帳戶信息
+        
+        Args:
+            account_index: 新的帳戶索引
+            api_key_index: 新的 API 密鑰索引 (可選，默認保持不變)
+        """
+        self.account_index = account_index
+        if api_key_index is not None:
+            self.api_key_index = api_key_index
+        # 認證令牌與帳戶綁定，切換後需要重新生成
+        self._auth_token_cache = None
+        if self.signer_client is not None:
+            self._sync_signer_account()
+        logger.info(f"已切換帳戶 - 帳戶索引: {self.account_index}, API 密鑰索引: {self.api_key_index}")
+    
+    @staticmethod
+    def _create_http_session() -> aiohttp.ClientSession:
+        """創建共享的 keep-alive HTTP 會話"""
+        connector = aiohttp.TCPConnector(
+            limit=64,
+            ttl_dns_cache=300,
+            keepalive_timeout=300,
+            enable_cleanup_closed=True
+        )
+        return aiohttp.ClientSession(connector=connector, trust_env=True)
+    
+    def _attach_http_session(self, api_client):
+        """將共享 HTTP 會話注入 SDK ApiClient 的 REST 客戶端
+        
+        SDK 的 RESTClientObject 在 pool_manager 為空時才會自行創建會話，
+        預先設置後所有請求都會重用同一個連接池。
+        """
+        rest_client = getattr(api_client, 'rest_client', None)
+        if rest_client is None or not hasattr(rest_client, 'pool_manager'):
+            logger.debug("ApiClient 不支持注入 HTTP 會話，保留 SDK 預設行為")
+            return
+        rest_client.pool_manager = self._http_session
+    
     async def _ensure_websocket_connection(self, max_retries: int = 3, retry_delay: float = 1.0):
         """確保 WebSocket 連接可用，如果連接不存在或已關閉則創建新連接
         
@@ -168,7 +702,13 @@ class LighterClient:
         Returns:
             websocket connection: 可用的 WebSocket 連接
         """
+        # 無鎖快速路徑：連接健康時直接返回，只有需要重建時才取鎖
+        conn = self._ws_connection
+        if conn is not None and self._ws_connection_closed(conn) is False:
+            return conn
+        
         async with self._ws_lock:
+            # 取得鎖後重新檢查 (雙重檢查)，避免與其他協程的重連競爭
             # 如果連接不存在或已關閉，創建新連接
             connection_needs_reset = False
             
@@ -189,22 +729,20 @@ class LighterClient:
                             if hasattr(self._ws_connection, 'ping'):
                                 await asyncio.wait_for(self._ws_connection.ping(), timeout=1.0)
                             connection_needs_reset = False
-                        except:
+                        except asyncio.CancelledError:
+                            raise
+                        except (websockets.exceptions.WebSocketException, OSError, asyncio.TimeoutError):
                             connection_needs_reset = True
                 except Exception as e:
-                    logger.debug(f"檢查 WebSocket 連接狀態時出錯: {e}")
+                    logger.debug("檢查 WebSocket 連接狀態時出錯: %s", e)
                     connection_needs_reset = True
             
             if connection_needs_reset:
                 # 檢查是否需要等待冷卻時間
-                current_time = time.time()
+                current_time = time.monotonic()
                 if current_time - self._last_ws_error_time < 2.0:  # 2秒冷卻時間
                     await asyncio.sleep(0.5)  # 短暂等待
                 
-                # 構建 WebSocket URL
-                if self._ws_url is None:
-                    self._ws_url = f"{self.base_url.replace('https', 'wss')}/stream"
-                
                 last_error = None
                 for attempt in range(max_retries + 1):
                     try:
@@ -212,7 +750,7 @@ class LighterClient:
                             logger.info(f"WebSocket 連接重試 {attempt}/{max_retries}")
                             await asyncio.sleep(retry_delay * attempt)  # 指數退避
                         
-                        logger.debug(f"創建新的 WebSocket 連接: {self._ws_url}")
+                        logger.debug("創建新的 WebSocket 連接: %s", self._ws_url)
                         self._ws_connection = await websockets.connect(
                             self._ws_url,
                             ping_interval=30,  # 30秒心跳
@@ -225,7 +763,7 @@ class LighterClient:
                             self._ws_connection.recv(), 
                             timeout=10.0
                         )
-                        logger.debug(f"WebSocket 初始消息: {initial_msg}")
+                        logger.debug("WebSocket 初始消息: %s", initial_msg)
                         
                         logger.info(f"WebSocket 持久連接已建立 (嘗試 {attempt + 1}/{max_retries + 1})")
                         break
@@ -241,8 +779,10 @@ class LighterClient:
                         if self._ws_connection:
                             try:
                                 await self._ws_connection.close()
-                            except:
-                                pass
+                            except asyncio.CancelledError:
+                                raise
+                            except (websockets.exceptions.WebSocketException, OSError, asyncio.TimeoutError) as close_error:
+                                logger.debug("清理失敗的 WebSocket 連接時出錯: %s", close_error)
                             self._ws_connection = None
                         
                         if attempt == max_retries:
@@ -258,6 +798,19 @@ class LighterClient:
             
             return self._ws_connection
     
+    @staticmethod
+    def _ws_connection_closed(conn) -> Optional[bool]:
+        """同步檢查 WebSocket 連接是否已關閉
+        
+        Returns:
+            Optional[bool]: True=已關閉, False=開啟中, None=無法判斷
+        """
+        if hasattr(conn, 'closed'):
+            return bool(conn.closed)
+        if hasattr(conn, 'close_code'):
+            return conn.close_code is not None
+        return None
+    
     async def _is_websocket_connected(self) -> bool:
         """檢查 WebSocket 連接是否有效
         
@@ -277,11 +830,15 @@ class LighterClient:
                 # 如果無法檢查狀態，假設連接有效
                 return True
         except Exception as e:
-            logger.debug(f"檢查 WebSocket 連接狀態時出錯: {e}")
+            logger.debug("檢查 WebSocket 連接狀態時出錯: %s", e)
             return False
     
     async def _close_websocket_connection(self):
         """安全關閉 WebSocket 連接"""
+        # 無連接時無需取鎖
+        if self._ws_connection is None:
+            return
+        
         async with self._ws_lock:
             if self._ws_connection:
                 try:
@@ -302,6 +859,47 @@ class LighterClient:
                     logger.warning(f"關閉 WebSocket 連接時出錯: {e}")
                 finally:
                     self._ws_connection = None
+                    reader = self._ws_reader
+                    if reader is not None:
+                        reader[1].cancel()
+                        self._ws_reader = None
+    
+    def _ws_pending_queue(self, ws) -> deque:
+        """返回連接對應的待回應隊列，必要時為該連接啟動讀取任務"""
+        reader = self._ws_reader
+        if reader is not None and reader[0] is ws and not reader[1].done():
+            return reader[2]
+        
+        pending = deque()
+        task = asyncio.create_task(self._ws_reader_loop(ws, pending))
+        self._ws_reader = (ws, task, pending)
+        return pending
+    
+    async def _ws_reader_loop(self, ws, pending: deque):
+        """持續接收交易回應，按 FIFO 順序交給最早的等待請求
+        
+        同一連接上的回應順序與發送順序一致，因此多筆交易可以併發在途，
+        不必逐筆等待往返。連接中斷時讓所有等待中的請求失敗。
+        """
+        error: Exception = ConnectionError("WebSocket 連接已中斷")
+        try:
+            while True:
+                response_msg = await ws.recv()
+                if not pending:
+                    logger.debug("收到無對應請求的 WebSocket 回應: %s", response_msg)
+                    continue
+                future = pending.popleft()
+                if not future.done():
+                    future.set_result(response_msg)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            error = e
+        finally:
+            while pending:
+                future = pending.popleft()
+                if not future.done():
+                    future.set_exception(error)
     
     # ==================== WebSocket 會話管理 (重構版本) ====================
     
@@ -323,11 +921,9 @@ class LighterClient:
             
             # 初始化訂閱 WebSocket 客戶端
             # 注意: WsClient 要求至少有一個訂閱，所以預設訂閱當前帳戶
-            host = self.base_url.replace("https://", "").replace("http://", "")
-            
             try:
                 self._subscription_ws_client = WsClient(
-                    host=host,
+                    host=self._ws_host,
                     path="/stream",
                     account_ids=[self.account_index],  # 預設訂閱當前帳戶
                     order_book_ids=[],  # 開始時空的，稍後動態添加
@@ -385,8 +981,11 @@ class LighterClient:
             self._subscription_active = False
             self._subscribed_accounts.clear()
             self._subscribed_orderbooks.clear()
+            self._pending_account_adds.clear()
+            self._pending_ob_adds.clear()
             
-            # 清理回調
+            # 清理回調 (停止所有分發通道的工作任務)
+            self._close_dispatch_channels()
             self._subscription_callbacks = {
                 'order_fills': [],
                 'order_updates': [],
@@ -405,76 +1004,92 @@ class LighterClient:
         except Exception as e:
             return self._handle_api_error("停止 WebSocket 會話", e)
     
+    def _close_dispatch_channels(self):
+        """停止所有訂閱回調的分發通道"""
+        callbacks = self._subscription_callbacks
+        for key in ('order_fills', 'order_updates', 'funding_rates'):
+            for channel in callbacks[key]:
+                channel.close()
+        for channels in callbacks['orderbook_updates'].values():
+            for channel in channels:
+                channel.close()
+    
     def _handle_account_update(self, account_id, update_data):
-        """帳戶更新的統一處理函數"""
+        """帳戶更新的統一處理函數
+        
+        只把數據放入各回調的分發通道，不在 WebSocket 接收路徑上執行用戶回調
+        """
         try:
-            logger.debug(f"收到帳戶更新 - 帳戶ID: {account_id}")
+            # 每個事件只取一次時間戳，所有回調共用
+            ts = time.time()
+            
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("收到帳戶更新 - 帳戶ID: %s", account_id)
+            
+            # 帳戶推送包含訂單時，直接刷新本地掛單緩存
+            if int(account_id) == self.account_index and isinstance(update_data, dict):
+                orders_by_market = update_data.get("orders")
+                if isinstance(orders_by_market, dict):
+                    self._update_open_orders_cache(orders_by_market)
             
             # 處理掉單成交通知
-            for callback in self._subscription_callbacks['order_fills']:
-                try:
-                    processed_data = {
-                        "type": "order_fill",
-                        "account_id": account_id,
-                        "account_index": self.account_index,
-                        "timestamp": time.time(),
-                        "data": update_data
-                    }
-                    callback(processed_data)
-                except Exception as cb_error:
-                    logger.error(f"處理掉單成交回調時出錯: {cb_error}")
+            for channel in self._subscription_callbacks['order_fills']:
+                channel.put_nowait({
+                    "type": "order_fill",
+                    "account_id": account_id,
+                    "account_index": self.account_index,
+                    "timestamp": ts,
+                    "data": update_data
+                })
             
             # 處理訂單更新通知
-            for callback in self._subscription_callbacks['order_updates']:
-                try:
-                    processed_data = {
-                        "type": "order_update",
-                        "account_id": account_id,
-                        "account_index": self.account_index,
-                        "timestamp": time.time(),
-                        "data": update_data
-                    }
-                    callback(processed_data)
-                except Exception as cb_error:
-                    logger.error(f"處理訂單更新回調時出錯: {cb_error}")
+            for channel in self._subscription_callbacks['order_updates']:
+                channel.put_nowait({
+                    "type": "order_update",
+                    "account_id": account_id,
+                    "account_index": self.account_index,
+                    "timestamp": ts,
+                    "data": update_data
+                })
             
         except Exception as e:
             logger.error(f"處理帳戶更新時出錯: {e}")
     
     def _handle_orderbook_update(self, order_book_id, update_data):
-        """訂單簿更新的統一處理函數"""
+        """訂單簿更新的統一處理函數
+        
+        只把數據放入各回調的分發通道，不在 WebSocket 接收路徑上執行用戶回調
+        """
         try:
-            logger.debug(f"收到訂單簿更新 - 訂單簿ID: {order_book_id}")
+            # 每個事件只取一次時間戳，所有回調共用
+            ts = time.time()
+            
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("收到訂單簿更新 - 訂單簿ID: %s", order_book_id)
+            
+            market_id = int(order_book_id)
             
             # 處理資金費率更新
-            for callback in self._subscription_callbacks['funding_rates']:
-                try:
-                    processed_data = {
-                        "type": "funding_rate_update",
-                        "market_id": int(order_book_id),
-                        "order_book_id": order_book_id,
-                        "timestamp": time.time(),
-                        "data": update_data
-                    }
-                    callback(processed_data)
-                except Exception as cb_error:
-                    logger.error(f"處理資金費率更新回調時出錯: {cb_error}")
+            for channel in self._subscription_callbacks['funding_rates']:
+                channel.put_nowait({
+                    "type": "funding_rate_update",
+                    "market_id": market_id,
+                    "order_book_id": order_book_id,
+                    "timestamp": ts,
+                    "data": update_data
+                })
             
             # 處理特定市場的訂單簿更新
-            market_id = int(order_book_id)
-            if market_id in self._subscription_callbacks['orderbook_updates']:
-                for callback in self._subscription_callbacks['orderbook_updates'][market_id]:
-                    try:
-                        processed_data = {
-                            "type": "orderbook_update",
-                            "market_id": market_id,
-                            "order_book_id": order_book_id,
-                            "timestamp": time.time(),
-                            "data": update_data
-                        }
-                        callback(processed_data)
-                    except Exception as cb_error:
-                        logger.error(f"處理訂單簿更新回調時出錯: {cb_error}")
+            channels = self._subscription_callbacks['orderbook_updates'].get(market_id)
+            if channels:
+                for channel in channels:
+                    channel.put_nowait({
+                        "type": "orderbook_update",
+                        "market_id": market_id,
+                        "order_book_id": order_book_id,
+                        "timestamp": ts,
+                        "data": update_data
+                    })
             
         except Exception as e:
             logger.error(f"處理訂單簿更新時出錯: {e}")
@@ -486,29 +1101,93 @@ class LighterClient:
                 "WebSocket 會話未啟動。請先調用 start_websocket_session() 啟動會話。"
             )
     
+    async def _flush_subscriptions(self) -> bool:
+        """將待套用的帳戶/訂單簿訂閱一次性寫入 WsClient 的訂閱清單
+        
+        集合 (_subscribed_accounts / _subscribed_orderbooks) 仍是成員判斷的唯一依據，
+        這裡只負責以單次 extend 批量更新 WsClient.subscriptions。
+        
+        Returns:
+            bool: 是否已套用 (WsClient 尚未建立時保留待套用項目並返回 False)
+        """
+        if not self._subscription_ws_client:
+            return False
+        
+        subscriptions = self._subscription_ws_client.subscriptions
+        
+        if self._pending_account_adds:
+            new_ids = self._pending_account_adds
+            self._pending_account_adds = []
+            subscriptions["accounts"].extend(new_ids)
+            self._subscribed_accounts.update(new_ids)
+            logger.debug("添加帳戶訂閱: %s", new_ids)
+        
+        if self._pending_ob_adds:
+            new_ids = self._pending_ob_adds
+            self._pending_ob_adds = []
+            subscriptions["order_books"].extend(new_ids)
+            self._subscribed_orderbooks.update(new_ids)
+            logger.debug("添加訂單簿訂閱: %s", new_ids)
+        
+        return True
+    
+    async def _add_account_subscriptions(self, account_indices: List[int]) -> bool:
+        """批量添加帳戶訂閱
+        
+        Args:
+            account_indices: 帳戶索引列表
+            
+        Returns:
+            bool: 是否成功添加
+        """
+        try:
+            pending = self._pending_account_adds
+            for account_index in account_indices:
+                if account_index not in self._subscribed_accounts and account_index not in pending:
+                    pending.append(account_index)
+            
+            if pending:
+                await self._flush_subscriptions()
+            return True
+        except Exception as e:
+            logger.error(f"添加帳戶訂閱時出錯: {e}")
+            return False
+    
     async def _add_account_subscription(self, account_index: int) -> bool:
         """動態添加帳戶訂閱
         
         Args:
             account_index: 帳戶索引
             
+        Returns:
+            bool: 是否成功添加
+        """
+        if account_index in self._subscribed_accounts:
+            # 帳戶已經訂閱，直接返回成功
+            logger.debug("帳戶 %s 已經訂閱", account_index)
+            return True
+        return await self._add_account_subscriptions([account_index])
+    
+    async def _add_orderbook_subscriptions(self, market_ids: List[int]) -> bool:
+        """批量添加訂單簿訂閱
+        
+        Args:
+            market_ids: 市場ID列表
+            
         Returns:
             bool: 是否成功添加
         """
         try:
-            if account_index not in self._subscribed_accounts:
-                # 更新 WsClient 的訂閱清單
-                if self._subscription_ws_client:
-                    self._subscription_ws_client.subscriptions["accounts"].append(account_index)
-                    self._subscribed_accounts.add(account_index)
-                    logger.debug(f"添加帳戶訂閱: {account_index}")
-                    return True
-            else:
-                # 帳戶已經訂閱，直接返回成功
-                logger.debug(f"帳戶 {account_index} 已經訂閱")
+            pending = self._pending_ob_adds
+            for market_id in market_ids:
+                if market_id not in self._subscribed_orderbooks and market_id not in pending:
+                    pending.append(market_id)
+            
+            if pending:
+                await self._flush_subscriptions()
             return True
         except Exception as e:
-            logger.error(f"添加帳戶訂閱時出錯: {e}")
+            logger.error(f"添加訂單簿訂閱時出錯: {e}")
             return False
     
     async def _add_orderbook_subscription(self, market_id: int) -> bool:
@@ -520,40 +1199,112 @@ class LighterClient:
         Returns:
             bool: 是否成功添加
         """
-        try:
-            if market_id not in self._subscribed_orderbooks:
-                # 更新 WsClient 的訂閱清單
-                if self._subscription_ws_client:
-                    self._subscription_ws_client.subscriptions["order_books"].append(market_id)
-                    self._subscribed_orderbooks.add(market_id)
-                    logger.debug(f"添加訂單簿訂閱: {market_id}")
-                    return True
+        if market_id in self._subscribed_orderbooks:
             return True
-        except Exception as e:
-            logger.error(f"添加訂單簿訂閱時出錯: {e}")
-            return False
+        return await self._add_orderbook_subscriptions([market_id])
     
-    async def _detect_account_index(self) -> int:
-        """自動檢測有效的帳戶索引"""
-        import aiohttp
+    def start_top_of_book(self, market_ids: List[int]):
+        """在背景訂閱訂單簿並維護最優買賣價，供市價單計算滑點保護價格
         
-        # 嘗試不同的帳戶索引
-        async with aiohttp.ClientSession() as session:
-            for account_idx in range(10):  # 嘗試 0-9
-                try:
-                    url = f"{self.base_url}/api/v1/nextNonce"
-                    params = {
-                        "account_index": account_idx,
-                        "api_key_index": self.api_key_index
-                    }
-                    async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=5)) as response:
-                        if response.status == 200:
-                            logger.info(f"找到有效的帳戶索引: {account_idx}")
-                            return account_idx
-                        # 忽略錯誤日誌，除非是預期之外的錯誤
-                        elif response.status != 400:
-                            pass
-                                
+        Args:
+            market_ids: 市場ID列表
+        """
+        if self._tob_task is not None and not self._tob_task.done():
+            logger.warning("最優買賣價訂閱已經啟動")
+            return
+        self._tob_task = asyncio.create_task(self._orderbook_loop(list(market_ids)))
+        logger.info(f"啟動最優買賣價訂閱 - 市場: {market_ids}")
+    
+    async def _orderbook_loop(self, market_ids: List[int], reconnect_delay: float = 5.0):
+        """訂單簿 WebSocket 監聽循環，斷線後自動重連"""
+        while True:
+            try:
+                async with websockets.connect(self._ws_url, ping_interval=20, ping_timeout=10) as ws:
+                    for market_id in market_ids:
+                        await ws.send(_json_dumps({"type": "subscribe", "channel": f"order_book/{market_id}"}))
+                    logger.info(f"訂單簿 WebSocket 已連接 - 市場: {market_ids}")
+                    
+                    async for message in ws:
+                        self._handle_orderbook_message(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"訂單簿 WebSocket 斷線: {e}，{reconnect_delay} 秒後重連")
+            
+            # 斷線期間的報價不可信
+            self._tob.clear()
+            self._orderbooks.clear()
+            await asyncio.sleep(reconnect_delay)
+    
+    def _handle_orderbook_message(self, message):
+        """處理訂單簿消息：快照替換本地訂單簿，增量更新合併 (數量為 0 表示刪除價位)"""
+        try:
+            data = _json_loads(message)
+            msg_type = data.get("type", "")
+            if msg_type not in ("subscribed/order_book", "update/order_book"):
+                return
+            
+            # channel 格式為 "order_book:{market_id}"
+            market_id = int(data.get("channel", "").split(":")[-1])
+            book_data = data.get("order_book", {})
+            
+            if msg_type == "subscribed/order_book" or market_id not in self._orderbooks:
+                self._orderbooks[market_id] = ({}, {})
+            bids, asks = self._orderbooks[market_id]
+            
+            for side, levels in ((bids, book_data.get("bids", ())), (asks, book_data.get("asks", ()))):
+                for level in levels:
+                    price = float(level["price"])
+                    size = float(level["size"])
+                    if size > 0:
+                        side[price] = size
+                    else:
+                        side.pop(price, None)
+            
+            if bids and asks:
+                self._tob[market_id] = (max(bids), min(asks), time.monotonic())
+            else:
+                self._tob.pop(market_id, None)
+        except Exception as e:
+            logger.debug("處理訂單簿消息時出錯: %s", e)
+    
+    def get_top_of_book(self, market_index: int) -> Optional[Tuple[float, float]]:
+        """獲取緩存的最優買賣價
+        
+        Args:
+            market_index: 市場索引
+            
+        Returns:
+            Optional[Tuple[float, float]]: (best_bid, best_ask)，無數據或已過期時返回 None
+        """
+        tob = self._tob.get(market_index)
+        if tob is None or time.monotonic() - tob[2] > self.TOB_MAX_AGE:
+            return None
+        return tob[0], tob[1]
+    
+    async def _detect_account_index(self) -> int:
+        """自動檢測有效的帳戶索引"""
+        # URL、查詢參數與超時在每次探測間都相同，只需構建一次
+        url = f"{self.base_url}/api/v1/nextNonce"
+        params = {
+            "account_index": 0,
+            "api_key_index": self.api_key_index
+        }
+        timeout = aiohttp.ClientTimeout(total=5)
+        
+        # 嘗試不同的帳戶索引
+        async with aiohttp.ClientSession() as session:
+            for account_idx in range(10):  # 嘗試 0-9
+                try:
+                    params["account_index"] = account_idx
+                    async with session.get(url, params=params, timeout=timeout) as response:
+                        if response.status == 200:
+                            logger.info(f"找到有效的帳戶索引: {account_idx}")
+                            return account_idx
+                        # 忽略錯誤日誌，除非是預期之外的錯誤
+                        elif response.status != 400:
+                            pass
+                                
                 except Exception as e:
                     # 忽略連接錯誤
                     continue
@@ -587,34 +1338,28 @@ class LighterClient:
         if tx_hash is None:
             return self._handle_api_error(operation, Exception("API回應無效：tx_hash為空"))
         
-        # 安全地提取 tx_hash 值 - tx_hash 是 RespSendTx 對象
-        tx_hash_value = None
-        if tx_hash:
-            if hasattr(tx_hash, 'tx_hash'):
-                tx_hash_value = tx_hash.tx_hash
-            elif hasattr(tx_hash, 'hash'):
-                tx_hash_value = tx_hash.hash  
-            else:
-                tx_hash_value = str(tx_hash)
-        
         result = {
             "success": True,
-            "tx_hash": tx_hash_value,
+            "tx_hash": _tx_hash_value(tx_hash),
             **extra_info
         }
         
+        self._invalidate_open_orders_cache()
         logger.info(f"{operation}成功 - TX Hash: {result['tx_hash']}")
         return result
     
-    def _format_price(self, price: float) -> int:
+    def _format_price(self, price: float, market_index: int = None) -> int:
         """格式化價格 - 轉換為 Lighter API 要求的整數格式
         
         根據 Lighter API 規範和範例：
-        - 價格需要乘以 100000 轉換為整數
+        - 提供 market_index 時按市場的 price_decimals 換算 (10^price_decimals)
+        - 未提供時價格乘以 100000 轉換為整數 (向後兼容)
         - 例如：$40.50 -> 4050000
         - 例如：$0.004 -> 400
         - 使用 round() 避免浮點數精度問題
         """
+        if market_index is not None:
+            return round(price * self._get_price_multiplier(market_index))
         return round(price * 100000)
     
     def _format_amount(self, amount: float, market_index: int = None) -> int:
@@ -640,6 +1385,36 @@ class LighterClient:
             # 默認使用 10000 倍數 (向後兼容)
             return round(amount * 10000)
     
+    def _load_market_meta(self) -> Dict[int, tuple]:
+        """從 market.json 一次性載入市場精度信息 (size_decimals, price_decimals)
+        
+        Returns:
+            Dict[int, tuple]: 市場索引 -> (size_decimals, price_decimals)
+        """
+        market_meta = {}
+        try:
+            # 讀取市場數據
+            with open('market.json', 'rb') as f:
+                markets = _json_loads(f.read())
+            
+            for key, market_data in markets.items():
+                try:
+                    market_meta[int(key)] = (
+                        int(market_data.get('size_decimals', 4)),  # 默認 4 位小數
+                        int(market_data.get('price_decimals', 5))
+                    )
+                except (TypeError, ValueError, AttributeError):
+                    continue
+            logger.debug("已載入 %s 個市場的精度信息", len(market_meta))
+            
+        except Exception as e:
+            logger.warning(f"載入市場精度信息失敗: {e}，將使用默認乘數 10000")
+        
+        self._market_meta = market_meta
+        self._amount_multipliers.clear()
+        self._price_multipliers.clear()
+        return market_meta
+    
     def _get_amount_multiplier(self, market_index: int) -> int:
         """根據市場索引獲取數量乘數
         
@@ -649,24 +1424,50 @@ class LighterClient:
         Returns:
             int: 數量乘數 (10^size_decimals)
         """
-        try:
-            # 讀取市場數據
-            with open('market.json', 'r') as f:
-                import json
-                markets = json.load(f)
-            
-            market_data = markets.get(str(market_index), {})
-            size_decimals = market_data.get('size_decimals', 4)  # 默認 4 位小數
-            
-            # 計算乘數: 10^size_decimals
-            multiplier = 10 ** size_decimals
-            logger.debug(f"市場 {market_index} 數量乘數: {multiplier} (size_decimals: {size_decimals})")
-            
+        multiplier = self._amount_multipliers.get(market_index)
+        if multiplier is not None:
             return multiplier
+        
+        market_meta = self._market_meta
+        if market_meta is None:
+            market_meta = self._load_market_meta()
+        
+        meta = market_meta.get(market_index)
+        if meta is None:
+            multiplier = 10000  # 默認乘數
+        else:
+            size_decimals = meta[0]
+            multiplier = _TENS[size_decimals] if size_decimals < len(_TENS) else 10 ** size_decimals
+        
+        self._amount_multipliers[market_index] = multiplier
+        return multiplier
+    
+    def _get_price_multiplier(self, market_index: int) -> int:
+        """根據市場索引獲取價格乘數
+        
+        Args:
+            market_index: 市場索引
             
-        except Exception as e:
-            logger.warning(f"獲取市場 {market_index} 精度信息失敗: {e}，使用默認乘數 10000")
-            return 10000  # 默認乘數
+        Returns:
+            int: 價格乘數 (10^price_decimals，無精度信息時為 100000)
+        """
+        multiplier = self._price_multipliers.get(market_index)
+        if multiplier is not None:
+            return multiplier
+        
+        market_meta = self._market_meta
+        if market_meta is None:
+            market_meta = self._load_market_meta()
+        
+        meta = market_meta.get(market_index)
+        if meta is None:
+            multiplier = 100000  # 默認乘數
+        else:
+            price_decimals = meta[1]
+            multiplier = _TENS[price_decimals] if price_decimals < len(_TENS) else 10 ** price_decimals
+        
+        self._price_multipliers[market_index] = multiplier
+        return multiplier
     
     def _symbol_to_market_index(self, symbol: str) -> int:
         """將交易對符號轉換為市場索引
@@ -681,22 +1482,12 @@ class LighterClient:
         - Ticker符號: 'ETH' -> 0, 'PUMP' -> 45, 'BTC' -> 1
         - 數字字符串: '0' -> 0, '45' -> 45 (向後兼容)
         """
-        # 完整的Ticker到Market ID映射 (從API獲取)
-        TICKER_TO_MARKET_ID = {
-            "1000BONK": 18, "1000FLOKI": 19, "1000PEPE": 4, "1000SHIB": 17,
-            "AAVE": 27, "ADA": 39, "AERO": 65, "AI16Z": 22, "APT": 31, "ARB": 50,
-            "AVAX": 9, "BCH": 58, "BERA": 20, "BNB": 25, "BTC": 1, "CRO": 73,
-            "CRV": 36, "DOGE": 3, "DOLO": 75, "DOT": 11, "DYDX": 62, "EIGEN": 49,
-            "ENA": 29, "ETH": 0, "ETHFI": 64, "FARTCOIN": 21, "GMX": 61, "GRASS": 52,
-            "HBAR": 59, "HYPE": 24, "IP": 34, "JUP": 26, "KAITO": 33, "LAUNCHCOIN": 54,
-            "LDO": 46, "LINEA": 76, "LINK": 8, "LTC": 35, "MKR": 28, "MNT": 63,
-            "MORPHO": 68, "NEAR": 10, "NMR": 74, "ONDO": 38, "OP": 55, "PAXG": 48,
-            "PENDLE": 37, "PENGU": 47, "POL": 14, "POPCAT": 23, "PROVE": 57, "PUMP": 45,
-            "RESOLV": 51, "S": 40, "SEI": 32, "SOL": 2, "SPX": 42, "SUI": 16,
-            "SYRUP": 44, "TAO": 13, "TIA": 67, "TON": 12, "TRUMP": 15, "TRX": 43,
-            "UNI": 30, "USELESS": 66, "VIRTUAL": 41, "VVV": 69, "WIF": 5, "WLD": 6,
-            "WLFI": 72, "XPL": 71, "XRP": 7, "YZY": 70, "ZK": 56, "ZORA": 53, "ZRO": 60,
-        }
+        # 已解析過的符號直接返回 (純函數，結果可按輸入字符串緩存)
+        cached = self._symbol_cache.get(symbol)
+        if cached is not None:
+            return cached
+        
+        TICKER_TO_MARKET_ID = self.TICKER_TO_MARKET_ID
         
         # 轉換為大寫以確保匹配
         symbol_upper = symbol.upper()
@@ -704,13 +1495,15 @@ class LighterClient:
         # 首先檢查是否為已知的ticker符號
         if symbol_upper in TICKER_TO_MARKET_ID:
             market_id = TICKER_TO_MARKET_ID[symbol_upper]
-            logger.debug(f"Ticker映射: {symbol} -> Market ID {market_id}")
+            logger.debug("Ticker映射: %s -> Market ID %s", symbol, market_id)
+            self._symbol_cache[symbol] = market_id
             return market_id
         
         # 如果不是ticker符號，嘗試解析為數字 (向後兼容)
         try:
             market_id = int(symbol)
-            logger.debug(f"數字映射: {symbol} -> Market ID {market_id}")
+            logger.debug("數字映射: %s -> Market ID %s", symbol, market_id)
+            self._symbol_cache[symbol] = market_id
             return market_id
         except ValueError:
             # 提供有用的錯誤信息，包含可用的ticker列表
@@ -730,37 +1523,27 @@ class LighterClient:
         Returns:
             str: Ticker符號 (例如: 'ETH', 'PUMP', 'BTC')
         """
-        # 反向映射字典
-        MARKET_ID_TO_TICKER = {
-            0: "ETH", 1: "BTC", 2: "SOL", 3: "DOGE", 4: "1000PEPE", 5: "WIF",
-            6: "WLD", 7: "XRP", 8: "LINK", 9: "AVAX", 10: "NEAR", 11: "DOT",
-            12: "TON", 13: "TAO", 14: "POL", 15: "TRUMP", 16: "SUI", 17: "1000SHIB",
-            18: "1000BONK", 19: "1000FLOKI", 20: "BERA", 21: "FARTCOIN", 22: "AI16Z",
-            23: "POPCAT", 24: "HYPE", 25: "BNB", 26: "JUP", 27: "AAVE", 28: "MKR",
-            29: "ENA", 30: "UNI", 31: "APT", 32: "SEI", 33: "KAITO", 34: "IP",
-            35: "LTC", 36: "CRV", 37: "PENDLE", 38: "ONDO", 39: "ADA", 40: "S",
-            41: "VIRTUAL", 42: "SPX", 43: "TRX", 44: "SYRUP", 45: "PUMP", 46: "LDO",
-            47: "PENGU", 48: "PAXG", 49: "EIGEN", 50: "ARB", 51: "RESOLV", 52: "GRASS",
-            53: "ZORA", 54: "LAUNCHCOIN", 55: "OP", 56: "ZK", 57: "PROVE", 58: "BCH",
-            59: "HBAR", 60: "ZRO", 61: "GMX", 62: "DYDX", 63: "MNT", 64: "ETHFI",
-            65: "AERO", 66: "USELESS", 67: "TIA", 68: "MORPHO", 69: "VVV", 70: "YZY",
-            71: "XPL", 72: "WLFI", 73: "CRO", 74: "NMR", 75: "DOLO", 76: "LINEA",
-        }
+        MARKET_ID_TO_TICKER = self.MARKET_ID_TO_TICKER
         
         if market_index in MARKET_ID_TO_TICKER:
             ticker = MARKET_ID_TO_TICKER[market_index]
-            logger.debug(f"反向映射: Market ID {market_index} -> {ticker}")
+            logger.debug("反向映射: Market ID %s -> %s", market_index, ticker)
             return ticker
         else:
             logger.warning(f"未知的Market ID: {market_index}")
             return f"UNKNOWN_{market_index}"
     
     def _ensure_initialized(self):
-        """確保客戶端已初始化"""
+        """確保客戶端已初始化
+        
+        檢查通過後以空操作覆蓋實例上的此方法，之後的調用不再重複檢查
+        (客戶端初始化後不會回到未初始化狀態)
+        """
         if not self._initialized:
             raise Exception("客戶端尚未初始化，請先調用 initialize() 方法")
         if not self.signer_client:
             raise Exception("SignerClient 未初始化")
+        self._ensure_initialized = _noop
     
     # ==================== 訂單功能 - 重構版本 ====================
     
@@ -793,7 +1576,7 @@ class LighterClient:
             
             # 轉換參數
             market_index = self._symbol_to_market_index(symbol)
-            client_order_index = int(time.time() * 1000) % 1000000  # 生成唯一訂單索引
+            client_order_index = self.next_client_order_index()  # 生成唯一訂單索引
             is_ask = (side == 'sell')
             
             logger.info(f"執行訂單 - 交易對: {symbol}, 數量: {quantity}, 價格: {price}, 方向: {side}, 類型: {order_type}")
@@ -821,6 +1604,53 @@ class LighterClient:
         except Exception as e:
             return self._handle_api_error("執行訂單", e)
     
+    def _ws_order_channel_ready(self) -> bool:
+        """下單 WebSocket 是否可用 (不可用時下單回退到 REST)"""
+        if not self.use_ws_orders:
+            return False
+        conn = self._ws_connection
+        return conn is not None and self._ws_connection_closed(conn) is False
+    
+    async def _ws_sign_and_send_order(self,
+                                      operation_name: str,
+                                      market_index: int,
+                                      client_order_index: int,
+                                      base_amount: int,
+                                      price: int,
+                                      is_ask: bool,
+                                      order_type: int,
+                                      time_in_force: int,
+                                      reduce_only: bool,
+                                      trigger_price: int,
+                                      order_expiry: int) -> Dict:
+        """簽署建單交易並通過持久 WebSocket 發送
+        
+        簽署與傳輸分離：signer_client 只負責簽名，交易幀由 _ws_send_transaction 發送。
+        base_amount / price / trigger_price 需為已格式化的整數。
+        """
+        tx_info, error = await self._allocate_and_sign(
+            self.signer_client.sign_create_order,
+            market_index=market_index,
+            client_order_index=client_order_index,
+            base_amount=base_amount,
+            price=price,
+            is_ask=is_ask,
+            order_type=order_type,
+            time_in_force=time_in_force,
+            reduce_only=int(reduce_only),
+            trigger_price=trigger_price,
+            order_expiry=order_expiry
+        )
+        
+        if error is not None:
+            return self._handle_api_error(f"{operation_name} - 簽署", Exception(f"簽署訂單失敗: {error}"))
+        
+        return await self._ws_send_transaction(
+            tx_type=_TX_CREATE_ORDER,
+            tx_info=tx_info,
+            operation_name=operation_name
+        )
+    
     async def create_limit_order(self,
                                market_index: int,
                                client_order_index: int,
@@ -828,7 +1658,7 @@ class LighterClient:
                                price: float,
                                is_ask: bool,
                                reduce_only: bool = False,
-                               time_in_force: int = None,
+                               time_in_force: int = _TIME_IN_FORCE_GTT,
                                order_expiry: int = -1) -> Dict:
         """
         創建限價訂單 - 重構版本，直接使用 signer_client
@@ -849,18 +1679,36 @@ class LighterClient:
         try:
             self._ensure_initialized()
             
-            # 設置默認時效
-            if time_in_force is None:
-                time_in_force = self.TIME_IN_FORCE_GTT
-            
             logger.info(f"創建限價訂單 - 市場: {market_index}, 數量: {base_amount}, 價格: {price}, 方向: {'賣' if is_ask else '買'}")
             
             # 格式化參數
             base_amount_formatted = self._format_amount(base_amount, market_index)
             price_formatted = self._format_price(price)
+            logger.debug("限價訂單參數 - 數量: %s, 價格: %s", base_amount_formatted, price_formatted)
             
-            # 直接調用 signer_client 的 create_order 方法
-            logger.debug(f"限價訂單參數 - 數量: {base_amount_formatted}, 價格: {price_formatted}")
+            # 優先通過持久 WebSocket 提交
+            if self._ws_order_channel_ready():
+                result = await self._ws_sign_and_send_order(
+                    "創建限價訂單",
+                    market_index=market_index,
+                    client_order_index=client_order_index,
+                    base_amount=base_amount_formatted,
+                    price=price_formatted,
+                    is_ask=is_ask,
+                    order_type=self.ORDER_TYPE_LIMIT,
+                    time_in_force=time_in_force,
+                    reduce_only=reduce_only,
+                    trigger_price=0,
+                    order_expiry=order_expiry
+                )
+                if result.get("success"):
+                    result["order_info"] = _limit_order_info(
+                        market_index=market_index, client_order_index=client_order_index, base_amount=base_amount,
+                        price=price, is_ask=is_ask, reduce_only=reduce_only
+                    )
+                return result
+            
+            # WebSocket 不可用，通過 REST 調用 signer_client 的 create_order 方法
             created_tx, tx_hash, error = await self.signer_client.create_order(
                 market_index=market_index,
                 client_order_index=client_order_index,
@@ -873,21 +1721,12 @@ class LighterClient:
                 order_expiry=order_expiry
             )
             
-            logger.debug(f"限價訂單回應 - created_tx: {created_tx}, tx_hash: {tx_hash}, error: {error}")
+            logger.debug("限價訂單回應 - created_tx: %s, tx_hash: %s, error: %s", created_tx, tx_hash, error)
             
-            # 使用統一的回應格式化
-            return self._format_response(
-                "創建限價訂單",
+            return self._format_limit_order_response(
                 created_tx, tx_hash, error,
-                order_info={
-                    "market_index": market_index,
-                    "client_order_index": client_order_index,
-                    "base_amount": base_amount,
-                    "price": price,
-                    "is_ask": is_ask,
-                    "order_type": "limit",
-                    "reduce_only": reduce_only
-                }
+                market_index=market_index, client_order_index=client_order_index, base_amount=base_amount,
+                price=price, is_ask=is_ask, reduce_only=reduce_only
             )
             
         except Exception as e:
@@ -923,6 +1762,40 @@ class LighterClient:
             # 格式化參數
             base_amount_formatted = self._format_amount(base_amount, market_index)
             
+            # 未提供當前價格時，使用緩存的對手方最優價 (買單取賣一，賣單取買一)
+            if not current_price:
+                top_of_book = self.get_top_of_book(market_index)
+                if top_of_book is not None:
+                    current_price = top_of_book[0] if is_ask else top_of_book[1]
+            
+            # 有當前價格時可直接計算滑點保護價格，優先通過持久 WebSocket 提交
+            if current_price is not None and current_price > 0 and self._ws_order_channel_ready():
+                slippage = max_slippage if max_slippage else 0.1
+                if is_ask:
+                    worst_price = int(current_price * (1 - slippage) * 100000)
+                else:
+                    worst_price = int(current_price * (1 + slippage) * 100000)
+                
+                result = await self._ws_sign_and_send_order(
+                    "創建市價訂單",
+                    market_index=market_index,
+                    client_order_index=client_order_index,
+                    base_amount=base_amount_formatted,
+                    price=worst_price,
+                    is_ask=is_ask,
+                    order_type=_ORDER_TYPE_MARKET,
+                    time_in_force=_TIME_IN_FORCE_IOC,
+                    reduce_only=reduce_only,
+                    trigger_price=0,
+                    order_expiry=_IOC_EXPIRY
+                )
+                if result.get("success"):
+                    result["order_info"] = _market_order_info(
+                        market_index=market_index, client_order_index=client_order_index, base_amount=base_amount,
+                        is_ask=is_ask, reduce_only=reduce_only, max_slippage=max_slippage
+                    )
+                return result
+            
             if max_slippage is not None:
                 # Check if signer_client has the method create_market_order_limited_slippage
                 if hasattr(self.signer_client, 'create_market_order_limited_slippage'):
@@ -951,24 +1824,10 @@ class LighterClient:
                             worst_price = int(current_price * (1 + slippage) * 100000)
                     else:
                         # 沒有提供當前價格，使用極端保守值
-                        if is_ask:
-                            # 賣單：使用 $0.01 作為最低價格保護
-                            worst_price = 1000  # 0.01 * 100000
-                        else:
-                            # 買單：使用 $10,000,000 作為最高價格保護
-                            worst_price = 1000000000000  # 10,000,000 * 100000
+                        worst_price = self._WORST_PRICES[is_ask]
 
                     logger.info(f"Falling back to regular create_market_order with worst_price: {worst_price / 100000:.2f}")
                     
-                    # 確保 SignerClient 使用正確的私鑰和帳戶信息
-                    if self.signer_client.account_index != self.account_index:
-                        logger.warning(f"SignerClient account_index ({self.signer_client.account_index}) 與當前 account_index ({self.account_index}) 不匹配，正在修正...")
-                        self.signer_client.account_index = self.account_index
-                        
-                    if self.signer_client.api_key_index != self.api_key_index:
-                        logger.warning(f"SignerClient api_key_index ({self.signer_client.api_key_index}) 與當前 api_key_index ({self.api_key_index}) 不匹配，正在修正...")
-                        self.signer_client.api_key_index = self.api_key_index
-                    
                     created_tx, tx_hash, error = await self.signer_client.create_market_order(
                         market_index=market_index,
                         client_order_index=client_order_index,
@@ -991,21 +1850,7 @@ class LighterClient:
                         avg_execution_price = int(current_price * (1 + default_slippage) * 100000)
                 else:
                     # 沒有提供當前價格，使用極端保守值
-                    if is_ask:
-                        # 賣單：使用 $0.01 作為最低價格保護
-                        avg_execution_price = 1000  # 0.01 * 100000
-                    else:
-                        # 買單：使用 $10,000,000 作為最高價格保護
-                        avg_execution_price = 1000000000000  # 10,000,000 * 100000
-                
-                # 確保 SignerClient 使用正確的私鑰和帳戶信息
-                if self.signer_client.account_index != self.account_index:
-                    logger.warning(f"SignerClient account_index ({self.signer_client.account_index}) 與當前 account_index ({self.account_index}) 不匹配，正在修正...")
-                    self.signer_client.account_index = self.account_index
-                    
-                if self.signer_client.api_key_index != self.api_key_index:
-                    logger.warning(f"SignerClient api_key_index ({self.signer_client.api_key_index}) 與當前 api_key_index ({self.api_key_index}) 不匹配，正在修正...")
-                    self.signer_client.api_key_index = self.api_key_index
+                    avg_execution_price = self._WORST_PRICES[is_ask]
                 
                 created_tx, tx_hash, error = await self.signer_client.create_market_order(
                     market_index=market_index,
@@ -1018,23 +1863,260 @@ class LighterClient:
 
 
             
-            # 使用統一的回應格式化
-            return self._format_response(
-                "創建市價訂單",
+            return self._format_market_order_response(
                 created_tx, tx_hash, error,
-                order_info={
+                market_index=market_index, client_order_index=client_order_index, base_amount=base_amount,
+                is_ask=is_ask, reduce_only=reduce_only, max_slippage=max_slippage
+            )
+            
+        except Exception as e:
+            return self._handle_api_error("創建市價訂單", e)
+    
+    async def create_orders_batch(self, orders: List[Dict]) -> List[Dict]:
+        """
+        批量創建訂單 - 一次獲取 nonce，逐筆簽署後以單次 sendTxBatch 請求提交
+        
+        Args:
+            orders: 訂單列表，每筆包含以下字段：
+                - market_index: 市場索引
+                - base_amount: 基礎數量
+                - is_ask: 是否為賣單 (True=賣, False=買)
+                - order_type: 'limit' 或 'market' (可選，默認 'limit')
+                - price: 價格 (限價單必需；市價單作為最差可接受價格，可選)
+                - reduce_only: 是否僅減倉 (可選，默認 False)
+                - client_order_index: 客戶端訂單索引 (可選，自動生成)
+                - time_in_force: 訂單時效 (可選，僅限價單)
+                - order_expiry: 訂單過期時間 (可選，僅限價單)
+                
+        Returns:
+            List[Dict]: 每筆訂單的結果，順序與輸入一致
+        """
+        results = []
+        try:
+            self._ensure_initialized()
+        except Exception as e:
+            return [self._handle_api_error("批量創建訂單", e) for _ in orders]
+        
+        order_type_limit = LighterClient.ORDER_TYPE_LIMIT
+        order_type_market = LighterClient.ORDER_TYPE_MARKET
+        tif_gtt = LighterClient.TIME_IN_FORCE_GTT
+        tif_ioc = LighterClient.TIME_IN_FORCE_IOC
+        ioc_expiry = _IOC_EXPIRY
+        worst_prices = self._WORST_PRICES
+        next_client_order_index = self.next_client_order_index
+        
+        for start in range(0, len(orders), self.MAX_BATCH_ORDERS):
+            chunk = orders[start:start + self.MAX_BATCH_ORDERS]
+            try:
+                logger.info(f"批量創建訂單 - 本批 {len(chunk)} 筆 (第 {start // self.MAX_BATCH_ORDERS + 1} 批)")
+                
+                # 整批一次分配連續的 nonce
+                nonces = await self._allocate_nonces(len(chunk))
+                
+                tx_infos = []
+                order_infos = []
+                for offset, order in enumerate(chunk):
+                    market_index = order['market_index']
+                    base_amount = order['base_amount']
+                    is_ask = order['is_ask']
+                    reduce_only = order.get('reduce_only', False)
+                    order_type = order.get('order_type', 'limit').lower()
+                    price = order.get('price')
+                    client_order_index = order.get('client_order_index')
+                    if client_order_index is None:
+                        client_order_index = next_client_order_index()
+                    
+                    if order_type == 'limit':
+                        if price is None:
+                            raise ValueError(f"限價單必須提供價格 (client_order_index={client_order_index})")
+                        price_formatted = self._format_price(price)
+                        sign_type = order_type_limit
+                        time_in_force = order.get('time_in_force')
+                        if time_in_force is None:
+                            time_in_force = tif_gtt
+                        order_expiry = order.get('order_expiry', -1)
+                    elif order_type == 'market':
+                        if price is not None and price > 0:
+                            price_formatted = self._format_price(price)
+                        else:
+                            # 沒有提供價格，使用與 create_market_order 相同的極端保守值
+                            price_formatted = worst_prices[is_ask]
+                        sign_type = order_type_market
+                        time_in_force = tif_ioc
+                        order_expiry = ioc_expiry
+                    else:
+                        raise ValueError(f"不支持的訂單類型: {order_type}")
+                    
+                    tx_info, error = self.signer_client.sign_create_order(
+                        market_index=market_index,
+                        client_order_index=client_order_index,
+                        base_amount=self._format_amount(base_amount, market_index),
+                        price=price_formatted,
+                        is_ask=is_ask,
+                        order_type=sign_type,
+                        time_in_force=time_in_force,
+                        reduce_only=int(reduce_only),
+                        trigger_price=0,
+                        order_expiry=order_expiry,
+                        nonce=nonces[offset]
+                    )
+                    if error is not None:
+                        raise Exception(f"簽署訂單失敗: {error}")
+                    
+                    tx_infos.append(tx_info)
+                    order_infos.append({
+                        "market_index": market_index,
+                        "client_order_index": client_order_index,
+                        "base_amount": base_amount,
+                        "price": price,
+                        "is_ask": is_ask,
+                        "order_type": order_type,
+                        "reduce_only": reduce_only
+                    })
+                
+                # 單次 HTTP 請求提交整批已簽署交易
+                results.extend(await self._send_signed_orders(tx_infos, order_infos))
+                
+            except Exception as e:
+                self._invalidate_nonce()
+                error_result = self._handle_api_error("批量創建訂單", e)
+                results.extend(dict(error_result) for _ in chunk)
+        
+        return results
+    
+    async def _send_signed_orders(self, tx_infos: List[str], order_infos: List[Dict]) -> List[Dict]:
+        """以單次 sendTxBatch 請求提交已簽署的建單交易
+        
+        Returns:
+            List[Dict]: 每筆訂單的結果，順序與輸入一致
+        """
+        tx_hashes = await self.transaction_api.send_tx_batch(
+            tx_types=_json_dumps([_TX_CREATE_ORDER] * len(tx_infos)),
+            tx_infos=_json_dumps(tx_infos)
+        )
+        self._invalidate_open_orders_cache()
+        
+        results = []
+        hash_list = getattr(tx_hashes, 'tx_hash', None)
+        for i, order_info in enumerate(order_infos):
+            tx_hash = hash_list[i] if isinstance(hash_list, list) and i < len(hash_list) else hash_list
+            results.append({
+                "success": True,
+                "tx_hash": tx_hash,
+                "order_info": order_info
+            })
+        
+        logger.info(f"批量創建訂單成功 - 本批 {len(order_infos)} 筆")
+        return results
+    
+    def prepare_order_template(self,
+                               market_index: int,
+                               is_ask: bool,
+                               reduce_only: bool = False,
+                               time_in_force: Optional[int] = None,
+                               order_expiry: int = -1) -> Dict:
+        """
+        準備限價單模板 - 網格等只改變價格/數量的下單場景使用
+        
+        簽名在 SDK 原生簽名庫中完成，無法預先計算部分哈希；
+        模板預先綁定所有不變的簽名參數與數量精度，下單時只需換算價格、數量並簽名。
+        
+        Args:
+            market_index: 市場索引
+            is_ask: 是否為賣單 (True=賣, False=買)
+            reduce_only: 是否僅減倉
+            time_in_force: 訂單時效 (可選，默認 GTT)
+            order_expiry: 訂單過期時間
+            
+        Returns:
+            Dict: 訂單模板 (同樣的參數會返回同一個緩存模板)
+        """
+        if time_in_force is None:
+            time_in_force = self.TIME_IN_FORCE_GTT
+        key = (market_index, is_ask, reduce_only, time_in_force, order_expiry)
+        template = self._order_templates.get(key)
+        if template is None:
+            template = {
+                "market_index": market_index,
+                "is_ask": is_ask,
+                "reduce_only": reduce_only,
+                "amount_multiplier": self._get_amount_multiplier(market_index),
+                "sign_kwargs": {
                     "market_index": market_index,
-                    "client_order_index": client_order_index,
-                    "base_amount": base_amount,
                     "is_ask": is_ask,
-                    "order_type": "market",
-                    "reduce_only": reduce_only,
-                    "max_slippage": max_slippage
+                    "order_type": self.ORDER_TYPE_LIMIT,
+                    "time_in_force": time_in_force,
+                    "reduce_only": int(reduce_only),
+                    "trigger_price": 0,
+                    "order_expiry": order_expiry,
                 }
-            )
+            }
+            self._order_templates[key] = template
+        return template
+    
+    async def create_orders_from_template(self,
+                                          template: Dict,
+                                          levels: List[Tuple[float, float]]) -> List[Dict]:
+        """
+        按模板批量創建限價單
+        
+        Args:
+            template: prepare_order_template() 返回的模板
+            levels: (price, base_amount) 列表
             
+        Returns:
+            List[Dict]: 每筆訂單的結果，順序與輸入一致
+        """
+        results = []
+        try:
+            self._ensure_initialized()
         except Exception as e:
-            return self._handle_api_error("創建市價訂單", e)
+            return [self._handle_api_error("模板批量創建訂單", e) for _ in levels]
+        
+        sign_create_order = self.signer_client.sign_create_order
+        sign_kwargs = template["sign_kwargs"]
+        amount_multiplier = template["amount_multiplier"]
+        market_index = template["market_index"]
+        is_ask = template["is_ask"]
+        reduce_only = template["reduce_only"]
+        next_client_order_index = self.next_client_order_index
+        format_price = self._format_price
+        
+        for start in range(0, len(levels), self.MAX_BATCH_ORDERS):
+            chunk = levels[start:start + self.MAX_BATCH_ORDERS]
+            try:
+                logger.info(f"模板批量創建訂單 - 市場: {market_index}, 本批 {len(chunk)} 筆")
+                
+                nonces = await self._allocate_nonces(len(chunk))
+                
+                tx_infos = []
+                order_infos = []
+                for offset, (price, base_amount) in enumerate(chunk):
+                    client_order_index = next_client_order_index()
+                    tx_info, error = sign_create_order(
+                        client_order_index=client_order_index,
+                        base_amount=round(base_amount * amount_multiplier),
+                        price=format_price(price, market_index),
+                        nonce=nonces[offset],
+                        **sign_kwargs
+                    )
+                    if error is not None:
+                        raise Exception(f"簽署訂單失敗: {error}")
+                    
+                    tx_infos.append(tx_info)
+                    order_infos.append(_limit_order_info(
+                        market_index=market_index, client_order_index=client_order_index, base_amount=base_amount,
+                        price=price, is_ask=is_ask, reduce_only=reduce_only
+                    ))
+                
+                results.extend(await self._send_signed_orders(tx_infos, order_infos))
+                
+            except Exception as e:
+                self._invalidate_nonce()
+                error_result = self._handle_api_error("模板批量創建訂單", e)
+                results.extend(dict(error_result) for _ in chunk)
+        
+        return results
     
     async def cancel_order(self, symbol: str, order_id: str) -> Dict:
         """
@@ -1078,20 +2160,15 @@ class LighterClient:
                 order_index=order_index
             )
             
-            # 使用統一的回應格式化
-            return self._format_response(
-                "取消訂單",
+            return self._format_cancel_order_response(
                 cancel_tx, tx_hash, error,
-                cancelled_order={
-                    "market_index": market_index,
-                    "order_index": order_index
-                }
+                market_index=market_index, order_index=order_index
             )
             
         except Exception as e:
             return self._handle_api_error("取消訂單", e)
     
-    async def cancel_all_orders(self, time_in_force: int = None, time: int = 0) -> Dict:
+    async def cancel_all_orders(self, time_in_force: int = _CANCEL_ALL_TIF_IMMEDIATE, time: int = 0) -> Dict:
         """
         取消所有訂單 - 重構版本，直接使用 signer_client
         
@@ -1105,10 +2182,6 @@ class LighterClient:
         try:
             self._ensure_initialized()
             
-            # 設置默認時效
-            if time_in_force is None:
-                time_in_force = self.CANCEL_ALL_TIF_IMMEDIATE
-            
             logger.info("取消所有訂單")
             
             cancel_tx, tx_hash, error = await self.signer_client.cancel_all_orders(
@@ -1152,7 +2225,7 @@ class LighterClient:
             
             # 自動生成客戶端訂單索引
             if client_order_index is None:
-                client_order_index = int(time.time() * 1000) % 1000000
+                client_order_index = self.next_client_order_index()
             
             # 如果未指定持倉方向，默認為多頭持倉
             if is_long_position is None:
@@ -1200,6 +2273,53 @@ class LighterClient:
             client_order_index=client_order_index
         )
     
+    async def _gather_results(self, operation: str, coros) -> List[Dict]:
+        """併發執行多個獨立的訂單請求，異常轉換為統一的錯誤格式"""
+        results = await asyncio.gather(*coros, return_exceptions=True)
+        return [
+            self._handle_api_error(operation, r) if isinstance(r, BaseException) else r
+            for r in results
+        ]
+    
+    async def cancel_orders_bulk(self, ids: List[Tuple[int, int]]) -> List[Dict]:
+        """
+        併發取消多筆訂單
+        
+        Args:
+            ids: (market_index, order_index) 列表
+            
+        Returns:
+            List[Dict]: 每筆訂單的取消結果，順序與輸入一致
+        """
+        logger.info(f"批量取消訂單 - 共 {len(ids)} 筆")
+        return await self._gather_results(
+            "批量取消訂單",
+            [self.cancel_order_by_market_index(m, o) for m, o in ids]
+        )
+    
+    async def close_positions(self, positions: List[Tuple[int, float, bool]]) -> List[Dict]:
+        """
+        併發市價平倉多個持倉
+        
+        Args:
+            positions: (market_index, position_size, is_long_position) 列表
+            
+        Returns:
+            List[Dict]: 每個持倉的平倉結果，順序與輸入一致
+        """
+        logger.info(f"批量市價平倉 - 共 {len(positions)} 個持倉")
+        return await self._gather_results(
+            "批量市價平倉",
+            [
+                self.close_position_market(
+                    market_index=market_index,
+                    position_size=position_size,
+                    is_long_position=is_long_position
+                )
+                for market_index, position_size, is_long_position in positions
+            ]
+        )
+    
     # ==================== 查詢功能 ====================
     
     async def get_account_balance(self) -> Dict:
@@ -1245,6 +2365,65 @@ class LighterClient:
         """get_account_balance的別名，用於測試腳本兼容性"""
         return await self.get_account_balance()
     
+    def _get_auth_token(self) -> str:
+        """獲取認證令牌，過期前重用緩存，避免每次查詢都重新簽名
+        
+        Returns:
+            str: 認證令牌
+        """
+        cached = self._auth_token_cache
+        now = time.monotonic()
+        if cached is not None and now < cached[1] - self.AUTH_TOKEN_REFRESH_MARGIN:
+            return cached[0]
+        
+        auth_token, auth_error = self.signer_client.create_auth_token_with_expiry()
+        if auth_error:
+            raise Exception(f"認證令牌生成失敗: {auth_error}")
+        if not auth_token:
+            raise Exception("認證令牌為空")
+        
+        self._auth_token_cache = (auth_token, now + self.AUTH_TOKEN_TTL)
+        return auth_token
+    
+    @staticmethod
+    def _format_open_order(order) -> Dict:
+        """將 SDK 訂單對象或 WebSocket 推送的訂單字典格式化為掛單記錄"""
+        d = order if isinstance(order, dict) else (getattr(order, '__dict__', None) or {})
+        get = d.get
+        base_amount = get('base_amount')
+        price = get('price')
+        order_type = get('order_type', get('type'))
+        return {
+            "order_index": get('order_index'),
+            "market_index": get('market_index'),
+            "client_order_index": get('client_order_index'),
+            "base_amount": float(base_amount) if base_amount else 0.0,
+            "price": float(price) if price else 0.0,
+            "is_ask": get('is_ask'),
+            "order_type": "limit" if order_type == 0 or order_type == "limit" else "market",
+            "reduce_only": get('reduce_only', False),
+            "created_at": get('created_at'),
+            "status": get('status', "unknown")
+        }
+    
+    def _update_open_orders_cache(self, orders_by_market: Dict):
+        """以帳戶推送的訂單數據刷新掛單緩存 (只保留仍在掛單中的訂單)"""
+        ts = time.monotonic()
+        format_open_order = self._format_open_order
+        for market_key, orders in orders_by_market.items():
+            market_id = int(market_key)
+            self._orders_by_market[market_id] = [
+                format_open_order(order) for order in orders or ()
+                if (order.get('status') if isinstance(order, dict) else getattr(order, 'status', None)) in (None, 'open', 'pending')
+            ]
+            self._orders_cache_ts[market_id] = ts
+    
+    def _invalidate_open_orders_cache(self):
+        """提交或取消訂單後使掛單及持倉緩存失效"""
+        self._orders_cache_ts.clear()
+        self._positions_cache = None
+        self._positions_cache_gen += 1
+    
     async def get_open_orders(self, symbol: str = None) -> Dict:
         """
         查詢當前掛單狀態 - 匹配 backpack 接口
@@ -1266,53 +2445,46 @@ class LighterClient:
             
             logger.info(f"查詢掛單狀態 - 帳戶索引: {self.account_index}, 交易對: {symbol or '全部'}, 市場ID: {market_id or '全部'}")
             
-            # 生成認證令牌
-            auth_token, auth_error = self.signer_client.create_auth_token_with_expiry()
-            if auth_error:
-                raise Exception(f"認證令牌生成失敗: {auth_error}")
-            if not auth_token:
-                raise Exception("認證令牌為空")
+            # 緩存新鮮時直接返回，省去一次網絡往返
+            cache_key = market_id or 0
+            cached_ts = self._orders_cache_ts.get(cache_key)
+            if cached_ts is not None and time.monotonic() - cached_ts < self.OPEN_ORDERS_CACHE_TTL:
+                open_orders = list(self._orders_by_market.get(cache_key, ()))
+                logger.info("掛單狀態查詢成功 (緩存) - 找到 %s 個掛單", len(open_orders))
+                return {
+                    "success": True,
+                    "account_index": self.account_index,
+                    "symbol": symbol,
+                    "market_id": market_id,
+                    "open_orders": open_orders,
+                    "total_orders": len(open_orders)
+                }
+            
+            # 獲取認證令牌 (有效期內重用緩存)
+            auth_token = self._get_auth_token()
             
             # 使用 order_api 查詢掛單，傳入認證信息
             orders_info = await self.order_api.account_active_orders(
                 account_index=self.account_index,
-                market_id=market_id or 0,
+                market_id=cache_key,
                 auth=auth_token
             )
             
             if not orders_info or not hasattr(orders_info, 'orders'):
-                logger.info(f"掛單狀態查詢成功 - 找到 0 個掛單")
-                return {
-                    "success": True,
-                    "account_index": self.account_index,
-                    "symbol": symbol,
-                    "market_id": market_id,
-                    "open_orders": [],
-                    "total_orders": 0
-                }
+                open_orders = []
+            else:
+                format_open_order = self._format_open_order
+                open_orders = [format_open_order(order) for order in orders_info.orders]
             
-            open_orders = []
-            for order in orders_info.orders:
-                order_data = {
-                    "order_index": order.order_index if hasattr(order, 'order_index') else None,
-                    "market_index": order.market_index if hasattr(order, 'market_index') else None,
-                    "client_order_index": order.client_order_index if hasattr(order, 'client_order_index') else None,
-                    "base_amount": float(order.base_amount) if hasattr(order, 'base_amount') and order.base_amount else 0.0,
-                    "price": float(order.price) if hasattr(order, 'price') and order.price else 0.0,
-                    "is_ask": order.is_ask if hasattr(order, 'is_ask') else None,
-                    "order_type": "limit" if hasattr(order, 'order_type') and order.order_type == 0 else "market",
-                    "reduce_only": order.reduce_only if hasattr(order, 'reduce_only') else False,
-                    "created_at": order.created_at if hasattr(order, 'created_at') else None,
-                    "status": order.status if hasattr(order, 'status') else "unknown"
-                }
-                open_orders.append(order_data)
+            self._orders_by_market[cache_key] = open_orders
+            self._orders_cache_ts[cache_key] = time.monotonic()
             
             result = {
                 "success": True,
                 "account_index": self.account_index,
                 "symbol": symbol,
                 "market_id": market_id,
-                "open_orders": open_orders,
+                "open_orders": list(open_orders),
                 "total_orders": len(open_orders)
             }
             
@@ -1326,6 +2498,139 @@ class LighterClient:
         """get_open_orders的別名，用於測試腳本兼容性"""
         return await self.get_open_orders(market_id)
     
+    @staticmethod
+    def _position_snapshot(position) -> Dict:
+        """一次取得持倉對象的欄位快照 (vars)，之後全部使用 dict.get，避免逐欄位的 getattr"""
+        d = getattr(position, '__dict__', None)
+        if not d:
+            return {k: getattr(position, k, None) for k in _POS_FIELDS}
+        # pydantic 模型的額外欄位不在 __dict__ 中
+        extra = getattr(position, '__pydantic_extra__', None)
+        if extra:
+            return {**d, **extra}
+        return d
+    
+    @staticmethod
+    def _parse_position(position) -> Dict:
+        """將 SDK 持倉對象解析為字典"""
+        get = LighterClient._position_snapshot(position).get
+        
+        # 根據官方文檔，正確的欄位名稱為 market_id；兼容 market_index（向後相容）
+        market_id = get('market_id')
+        if market_id is None:
+            market_id = get('market_index')
+        market_index = _optional_int(market_id)
+        
+        # 根據官方文檔，持倉數量欄位名稱為 "position"（字符串類型），兼容其他可能的欄位名稱
+        position_str = None
+        for key in _POSITION_AMOUNT_KEYS:
+            position_str = get(key)
+            if position_str is not None:
+                break
+        position_amount = _safe_float(position_str)
+        
+        # 根據官方文檔解析各個欄位
+        sign = _safe_int(get('sign'))  # 1=多頭, -1=空頭, 0=無持倉
+        
+        # 官方文檔：avg_entry_price 而非 average_entry_price
+        avg_entry_price = _safe_float(get('avg_entry_price'))
+        if avg_entry_price == 0.0:
+            avg_entry_price = _safe_float(get('average_entry_price'))
+        
+        # 判斷多空方向；sign 為 0 但 position_amount 不為 0 時根據數量判斷
+        if sign == 0 and position_amount != 0.0:
+            is_long = position_amount > 0
+            is_short = position_amount < 0
+        else:
+            is_long = sign > 0
+            is_short = sign < 0
+        
+        return {
+            # 保持向後兼容的欄位名稱
+            "market_index": market_index,
+            "position_amount": position_amount,
+            "average_entry_price": avg_entry_price,  # 映射到兼容名稱
+            "position_value": _safe_float(get('position_value')),
+            "unrealized_pnl": _safe_float(get('unrealized_pnl')),
+            "realized_pnl": _safe_float(get('realized_pnl')),
+            "open_order_count": _safe_int(get('open_order_count')),
+            "sign": sign,
+            "is_long": is_long,
+            "is_short": is_short,
+            
+            # 額外的官方欄位
+            "market_id": market_index,  # 官方欄位名稱
+            "symbol": _safe_str(get('symbol', '')),
+            "initial_margin_fraction": _safe_str(get('initial_margin_fraction', '0')),
+            "pending_order_count": _safe_int(get('pending_order_count')),
+            "position_tied_order_count": _safe_int(get('position_tied_order_count')),
+            "avg_entry_price": avg_entry_price,  # 官方欄位名稱
+            "liquidation_price": _safe_float(get('liquidation_price')),
+            "total_funding_paid_out": _safe_str(get('total_funding_paid_out', '0')),
+            "margin_mode": _safe_int(get('margin_mode')),
+            "allocated_margin": _safe_str(get('allocated_margin', '0')),
+        }
+    
+    @staticmethod
+    def _parse_positions_frame(raw_positions) -> List[Dict]:
+        """批量解析持倉 - 按欄位批量處理版本
+        
+        各欄位使用與 _parse_position 相同的轉換函數 (_safe_float / _safe_int / _optional_int)，
+        多空方向等衍生欄位用 NumPy 一次計算，結果與逐條解析一致。
+        """
+        snapshots = [LighterClient._position_snapshot(p) for p in raw_positions]
+        
+        def col(convert, key, default=None):
+            return [convert(d.get(key, default)) for d in snapshots]
+        
+        def first_present(d, keys):
+            for key in keys:
+                value = d.get(key)
+                if value is not None:
+                    return value
+            return None
+        
+        # market_id 缺失時回退到 market_index
+        market_index = [_optional_int(first_present(d, ('market_id', 'market_index'))) for d in snapshots]
+        position_amount = [_safe_float(first_present(d, _POSITION_AMOUNT_KEYS)) for d in snapshots]
+        sign = col(_safe_int, 'sign')
+        avg_entry_price = [
+            avg if avg != 0.0 else fallback
+            for avg, fallback in zip(col(_safe_float, 'avg_entry_price'), col(_safe_float, 'average_entry_price'))
+        ]
+        
+        # sign 為 0 但 position_amount 不為 0 時根據數量判斷方向
+        amounts = np.asarray(position_amount, dtype=np.float64)
+        signs = np.asarray(sign, dtype=np.int64)
+        by_amount = (signs == 0) & (amounts != 0.0)
+        is_long = np.where(by_amount, amounts > 0, signs > 0).tolist()
+        is_short = np.where(by_amount, amounts < 0, signs < 0).tolist()
+        
+        columns = {
+            "market_index": market_index,
+            "position_amount": position_amount,
+            "average_entry_price": avg_entry_price,
+            "position_value": col(_safe_float, 'position_value'),
+            "unrealized_pnl": col(_safe_float, 'unrealized_pnl'),
+            "realized_pnl": col(_safe_float, 'realized_pnl'),
+            "open_order_count": col(_safe_int, 'open_order_count'),
+            "sign": sign,
+            "is_long": is_long,
+            "is_short": is_short,
+            "market_id": market_index,
+            "symbol": col(_safe_str, 'symbol', ''),
+            "initial_margin_fraction": col(_safe_str, 'initial_margin_fraction', '0'),
+            "pending_order_count": col(_safe_int, 'pending_order_count'),
+            "position_tied_order_count": col(_safe_int, 'position_tied_order_count'),
+            "avg_entry_price": avg_entry_price,
+            "liquidation_price": col(_safe_float, 'liquidation_price'),
+            "total_funding_paid_out": col(_safe_str, 'total_funding_paid_out', '0'),
+            "margin_mode": col(_safe_int, 'margin_mode'),
+            "allocated_margin": col(_safe_str, 'allocated_margin', '0'),
+        }
+        keys = tuple(columns)
+        return [dict(zip(keys, row)) for row in zip(*columns.values())]
+    
     async def get_positions(self) -> Dict:
         """
         查詢當前持倉狀況 - 根據官方 Lighter API 文檔修正
@@ -1337,6 +2642,7 @@ class LighterClient:
         try:
             logger.info(f"查詢持倉狀況 - 帳戶索引: {self.account_index}")
             
+            cache_gen = self._positions_cache_gen
             account_info = await self.account_api.account(
                 by="index",
                 value=str(self.account_index)
@@ -1347,158 +2653,82 @@ class LighterClient:
             
             account = account_info.accounts[0]
             positions = []
+            debug_enabled = logger.isEnabledFor(logging.DEBUG)
             
             # 記錄原始持倉數量便於排查
             raw_positions_count = len(getattr(account, 'positions', []) or [])
-            logger.debug(f"原始持倉條目數: {raw_positions_count}")
+            logger.debug("原始持倉條目數: %s", raw_positions_count)
             
             # 記錄完整的帳戶信息，以便排查
-            logger.debug(f"帳戶信息: {account}")
+            logger.debug("帳戶信息: %s", account)
             
             if hasattr(account, 'positions') and account.positions:
-                for position in account.positions:
-                    # 根據官方文檔，正確的欄位名稱
-                    market_id = getattr(position, 'market_id', None)  # 官方文檔使用 market_id
-                    
-                    # 兼容處理：如果 market_id 不存在，嘗試 market_index（向後相容）
-                    if market_id is None:
-                        market_id = getattr(position, 'market_index', None)
-                    
-                    # 安全轉換為整數
-                    try:
-                        market_index = int(market_id) if market_id is not None else None
-                    except Exception:
-                        market_index = None
-                    
-                    # 根據官方文檔，持倉數量欄位名稱為 "position"（字符串類型）
-                    position_str = getattr(position, 'position', None)
-                    
-                    # 兼容處理：如果 position 不存在，嘗試其他可能的欄位名稱
-                    if position_str is None:
-                        position_candidates = [
-                            getattr(position, 'position_amount', None),
-                            getattr(position, 'base_amount', None),
-                            getattr(position, 'size', None),
-                            getattr(position, 'amount', None),
-                        ]
-                        for cand in position_candidates:
-                            if cand is not None:
-                                position_str = cand
-                                break
-                    
-                    # 轉換持倉數量為浮點數
-                    position_amount = 0.0
-                    if position_str is not None:
-                        try:
-                            position_amount = float(position_str)
-                        except Exception:
-                            position_amount = 0.0
-                    
-                    # 安全轉換其他欄位
-                    def safe_float(val):
-                        if val is None:
-                            return 0.0
-                        try:
-                            return float(val)
-                        except Exception:
-                            return 0.0
-                    
-                    def safe_int(val):
-                        if val is None:
-                            return 0
-                        try:
-                            return int(val)
-                        except Exception:
-                            return 0
-                    
-                    def safe_str(val):
-                        return str(val) if val is not None else ""
-                    
-                    # 根據官方文檔解析各個欄位
-                    symbol = safe_str(getattr(position, 'symbol', ''))
-                    initial_margin_fraction = safe_str(getattr(position, 'initial_margin_fraction', '0'))
-                    open_order_count = safe_int(getattr(position, 'open_order_count', 0))
-                    pending_order_count = safe_int(getattr(position, 'pending_order_count', 0))
-                    position_tied_order_count = safe_int(getattr(position, 'position_tied_order_count', 0))
-                    sign = safe_int(getattr(position, 'sign', 0))  # 1=多頭, -1=空頭, 0=無持倉
-                    
-                    # 官方文檔：avg_entry_price 而非 average_entry_price
-                    avg_entry_price = safe_float(getattr(position, 'avg_entry_price', None))
-                    # 兼容處理
-                    if avg_entry_price == 0.0:
-                        avg_entry_price = safe_float(getattr(position, 'average_entry_price', None))
-                    
-                    position_value = safe_float(getattr(position, 'position_value', None))
-                    unrealized_pnl = safe_float(getattr(position, 'unrealized_pnl', None))
-                    realized_pnl = safe_float(getattr(position, 'realized_pnl', None))
-                    liquidation_price = safe_float(getattr(position, 'liquidation_price', None))
-                    total_funding_paid_out = safe_str(getattr(position, 'total_funding_paid_out', '0'))
-                    margin_mode = safe_int(getattr(position, 'margin_mode', 0))
-                    allocated_margin = safe_str(getattr(position, 'allocated_margin', '0'))
-                    
-                    # 判斷多空方向
-                    is_long = sign > 0
-                    is_short = sign < 0
-                    
-                    # 如果 sign 為 0 但 position_amount 不為 0，根據數量判斷方向
-                    if sign == 0 and position_amount != 0.0:
-                        is_long = position_amount > 0
-                        is_short = position_amount < 0
-                    
-                    position_data = {
-                        # 保持向後兼容的欄位名稱
-                        "market_index": market_index,
-                        "position_amount": position_amount,
-                        "average_entry_price": avg_entry_price,  # 映射到兼容名稱
-                        "position_value": position_value,
-                        "unrealized_pnl": unrealized_pnl,
-                        "realized_pnl": realized_pnl,
-                        "open_order_count": open_order_count,
-                        "sign": sign,
-                        "is_long": is_long,
-                        "is_short": is_short,
-                        
-                        # 額外的官方欄位
-                        "market_id": market_index,  # 官方欄位名稱
-                        "symbol": symbol,
-                        "initial_margin_fraction": initial_margin_fraction,
-                        "pending_order_count": pending_order_count,
-                        "position_tied_order_count": position_tied_order_count,
-                        "avg_entry_price": avg_entry_price,  # 官方欄位名稱
-                        "liquidation_price": liquidation_price,
-                        "total_funding_paid_out": total_funding_paid_out,
-                        "margin_mode": margin_mode,
-                        "allocated_margin": allocated_margin,
-                    }
-                    
-                    # 重要：不過濾任何持倉，即使數量為 0
-                    # 因為 API 可能會返回處於特殊狀態的持倉
-                    # 讓調用者決定如何處理
-                    positions.append(position_data)
-                    
-                    # 為調試目的記錄持倉信息
-                    if abs(position_amount) > 1e-9:
-                        logger.debug(f"找到活躍持倉 - 市場: {market_index}, 數量: {position_amount}, 方向: {sign}")
-                    else:
-                        logger.debug(f"找到零持倉 - 市場: {market_index}, 數量: {position_amount}, 方向: {sign}")
+                # 重要：不過濾任何持倉，即使數量為 0
+                # 因為 API 可能會返回處於特殊狀態的持倉
+                # 讓調用者決定如何處理
+                if raw_positions_count >= self.POSITIONS_FRAME_THRESHOLD:
+                    positions = self._parse_positions_frame(account.positions)
+                else:
+                    parse_position = self._parse_position
+                    positions = [parse_position(position) for position in account.positions]
+                
+                # 為調試目的記錄持倉信息
+                if debug_enabled:
+                    for position_data in positions:
+                        position_amount = position_data["position_amount"]
+                        if abs(position_amount) > 1e-9:
+                            logger.debug("找到活躍持倉 - 市場: %s, 數量: %s, 方向: %s", position_data["market_index"], position_amount, position_data["sign"])
+                        else:
+                            logger.debug("找到零持倉 - 市場: %s, 數量: %s, 方向: %s", position_data["market_index"], position_amount, position_data["sign"])
             
             # 統計活躍持倉數量
-            active_positions = [p for p in positions if abs(p.get('position_amount', 0)) > 1e-9]
+            # 持倉較多時用 NumPy 向量化計數，只需要數量不需要中間列表
+            positions_count = len(positions)
+            if positions_count >= self.POSITIONS_FRAME_THRESHOLD:
+                amounts = np.fromiter((p['position_amount'] for p in positions), dtype=np.float64, count=positions_count)
+                active_positions = int(np.count_nonzero(np.abs(amounts) > 1e-9))
+            else:
+                active_positions = sum(1 for p in positions if abs(p['position_amount']) > 1e-9)
+            
+            # 查詢期間緩存已失效 (如有成交) 時，本次結果可能已過時，不寫入緩存
+            if cache_gen == self._positions_cache_gen:
+                self._positions_cache = (
+                    time.monotonic() + self.POSITIONS_CACHE_TTL,
+                    {p["market_index"]: p for p in positions},
+                    positions
+                )
             
             result = {
                 "success": True,
                 "account_index": self.account_index,
                 "positions": positions,  # 返回所有持倉，包括零持倉
                 "total_positions": len(positions),
-                "active_positions": len(active_positions)
+                "active_positions": active_positions
             }
             
-            logger.info(f"持倉狀況查詢成功 - 總共 {len(positions)} 個持倉, 活躍 {len(active_positions)} 個 (原始 {raw_positions_count} 條)")
+            logger.info(f"持倉狀況查詢成功 - 總共 {len(positions)} 個持倉, 活躍 {active_positions} 個 (原始 {raw_positions_count} 條)")
             return result
             
         except Exception as e:
             return self._handle_api_error("查詢持倉狀況", e)
     
+    async def _positions_by_market(self) -> Optional[Dict[int, Dict]]:
+        """返回 market_index -> 持倉 索引，緩存未過期時不再查詢帳戶"""
+        cache = self._positions_cache
+        if cache is not None and time.monotonic() < cache[0]:
+            return cache[1]
+        
+        positions_result = await self.get_positions()
+        if not positions_result.get("success") or "error" in positions_result:
+            logger.error(f"獲取持倉失敗: {positions_result.get('error', '未知錯誤')}")
+            return None
+        
+        cache = self._positions_cache
+        if cache is not None:
+            return cache[1]
+        # 結果未寫入緩存 (查詢期間緩存被失效)，僅供本次使用
+        return {p["market_index"]: p for p in positions_result["positions"]}
+    
     async def get_position_by_symbol(self, symbol: str) -> Optional[Dict]:
         """
         獲取特定交易對的持倉
@@ -1513,95 +2743,217 @@ class LighterClient:
             # 將 symbol 轉換為 market_index
             market_index = self._symbol_to_market_index(symbol)
             
-            positions_result = await self.get_positions()
-            
-            if not positions_result.get("success") or "error" in positions_result:
-                logger.error(f"獲取持倉失敗: {positions_result.get('error', '未知錯誤')}")
+            positions_by_market = await self._positions_by_market()
+            if positions_by_market is None:
                 return None
             
-            for position in positions_result.get("positions", []):
-                if position.get("market_index") == market_index:
-                    return position
-            
-            return None
+            return positions_by_market.get(market_index)
             
         except Exception as e:
             logger.error(f"獲取特定交易對持倉時出錯: {e}")
             return None
     
-    async def get_funding_rate(self, symbol: str) -> Optional[float]:
+    async def get_positions_for_symbols(self, symbols: List[str]) -> Dict[str, Optional[Dict]]:
         """
-        獲取資金費率
+        獲取多個交易對的持倉 - 只查詢一次帳戶持倉
         
         Args:
-            symbol: 交易對符號，如 "BTC-USDC" 或市場索引字符串
+            symbols: 交易對符號列表
             
         Returns:
-            Optional[float]: 資金費率，如果獲取失敗則返回 None
+            Dict[str, Optional[Dict]]: 交易對 -> 持倉信息 (沒有持倉或獲取失敗為 None)
         """
+        result = dict.fromkeys(symbols)
         try:
-            # 將 symbol 轉換為 market_index
-            market_index = self._symbol_to_market_index(symbol)
-            logger.info(f"獲取資金費率 - 交易對: {symbol} (市場索引: {market_index})")
-            
-            # 通過市場信息獲取資金費率
-            market_info_result = await self.get_market_info(market_index)
-            
-            if not market_info_result.get("success"):
-                logger.error(f"獲取市場信息失敗: {market_info_result.get('error', '未知錯誤')}")
-                return None
+            by_market = await self._positions_by_market()
+            if by_market is None:
+                return result
             
-            market_data = market_info_result.get("market_info", {})
+            for symbol in symbols:
+                try:
+                    result[symbol] = by_market.get(self._symbol_to_market_index(symbol))
+                except ValueError:
+                    logger.warning(f"無法解析交易對符號: {symbol}")
+            return result
             
-            # 嘗試從市場數據中提取資金費率
-            if isinstance(market_data, dict):
-                funding_rate = market_data.get("funding_rate") or market_data.get("fundingRate")
-                if funding_rate is not None:
-                    return float(funding_rate)
+        except Exception as e:
+            logger.error(f"獲取多個交易對持倉時出錯: {e}")
+            return result
+    
+    async def _gather_per_symbol(self, getter, symbols: List[str], max_concurrency: int) -> Dict[str, Any]:
+        """以有限併發對每個交易對調用 getter，返回 交易對 -> 結果"""
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def bounded(symbol):
+            async with semaphore:
+                return await getter(symbol)
+        
+        values = await asyncio.gather(*(bounded(symbol) for symbol in symbols))
+        return dict(zip(symbols, values))
+    
+    async def get_mark_prices(self, symbols: List[str], max_concurrency: int = 10) -> Dict[str, Optional[float]]:
+        """
+        併發獲取多個交易對的標記價格
+        
+        Args:
+            symbols: 交易對符號列表
+            max_concurrency: 最大併發請求數
             
-            logger.warning(f"未找到交易對 {symbol} 的資金費率信息")
-            return 0.0
+        Returns:
+            Dict[str, Optional[float]]: 交易對 -> 標記價格
+        """
+        return await self._gather_per_symbol(self.get_mark_price, symbols, max_concurrency)
+    
+    async def get_funding_rates(self, symbols: List[str], max_concurrency: int = 10) -> Dict[str, Optional[float]]:
+        """
+        併發獲取多個交易對的資金費率
+        
+        Args:
+            symbols: 交易對符號列表
+            max_concurrency: 最大併發請求數
             
-        except Exception as e:
-            logger.error(f"獲取資金費率時出錯: {e}")
+        Returns:
+            Dict[str, Optional[float]]: 交易對 -> 資金費率
+        """
+        return await self._gather_per_symbol(self.get_funding_rate, symbols, max_concurrency)
+    
+    async def _load_market_fields(self, market_index: int) -> Optional[Dict[str, Optional[float]]]:
+        """請求一次市場信息並提取所有數值欄位，同時刷新欄位緩存
+        
+        Returns:
+            Optional[Dict[str, Optional[float]]]: 欄位值 (缺失為 None)，請求失敗時返回 None
+        """
+        market_info_result = await self.get_market_info(market_index, fields=self._MARKET_FIELDS)
+        
+        if not market_info_result.get("success"):
+            logger.error(f"獲取市場信息失敗: {market_info_result.get('error', '未知錯誤')}")
             return None
+        
+        market_data = market_info_result.get("market_info", {})
+        if not isinstance(market_data, dict):
+            market_data = {}
+        
+        now = time.monotonic()
+        cache = self._market_field_cache
+        ttls = self.MARKET_FIELD_TTLS
+        fields = {}
+        for field in self._MARKET_FIELDS:
+            value = market_data.get(field)
+            if value is not None:
+                value = float(value)
+                cache[(market_index, field)] = (value, now + ttls[field])
+            fields[field] = value
+        return fields
     
-    async def get_mark_price(self, symbol: str) -> Optional[float]:
+    async def get_all_market_data(self, symbol: str) -> Dict[str, Optional[float]]:
         """
-        獲取標記價格
+        一次請求獲取資金費率、標記價格、指數價格與未平倉合約數量
         
         Args:
             symbol: 交易對符號，如 "BTC-USDC" 或市場索引字符串
             
         Returns:
-            Optional[float]: 標記價格，如果獲取失敗則返回 None
+            Dict[str, Optional[float]]: funding_rate / mark_price / index_price / open_interest，
+            獲取失敗時返回空字典
         """
         try:
-            # 將 symbol 轉換為 market_index
             market_index = self._symbol_to_market_index(symbol)
-            logger.info(f"獲取標記價格 - 交易對: {symbol} (市場索引: {market_index})")
-            
-            # 通過市場信息獲取標記價格
-            market_info_result = await self.get_market_info(market_index)
-            
-            if not market_info_result.get("success"):
-                logger.error(f"獲取市場信息失敗: {market_info_result.get('error', '未知錯誤')}")
-                return None
-            
-            market_data = market_info_result.get("market_info", {})
-            
-            # 嘗試從市場數據中提取標記價格
-            if isinstance(market_data, dict):
-                mark_price = market_data.get("mark_price") or market_data.get("markPrice")
-                if mark_price is not None:
-                    return float(mark_price)
+        except ValueError as e:
+            logger.error(f"獲取市場數據時出錯: {e}")
+            return {}
+        
+        # 所有欄位緩存都未過期時直接返回
+        now = time.monotonic()
+        cache = self._market_field_cache
+        cached = {}
+        for field in self._MARKET_FIELDS:
+            entry = cache.get((market_index, field))
+            if entry is None or now >= entry[1]:
+                break
+            cached[field] = entry[0]
+        else:
+            return cached
+        
+        logger.info("獲取市場數據 - 交易對: %s (市場索引: %s)", symbol, market_index)
+        try:
+            fields = await self._load_market_fields(market_index)
+        except (ValueError, TypeError) as e:
+            logger.error(f"獲取市場數據時出錯: {e}")
+            return {}
+        return fields if fields is not None else {}
+    
+    async def _get_market_field(self,
+                                symbol: str,
+                                field: str,
+                                label: str,
+                                default: Optional[float] = None) -> Optional[float]:
+        """
+        獲取單個市場數值欄位，結果按 MARKET_FIELD_TTLS 緩存
+        
+        緩存過期時通過 _load_market_fields 一次刷新所有欄位。
+        
+        Args:
+            symbol: 交易對符號
+            field: 欄位名稱
+            label: 欄位的中文名稱 (用於日誌)
+            default: 市場信息中沒有該欄位時的返回值
             
-            logger.warning(f"未找到交易對 {symbol} 的標記價格信息")
+        Returns:
+            Optional[float]: 欄位值，如果獲取失敗則返回 None
+        """
+        # 將 symbol 轉換為 market_index
+        try:
+            market_index = self._symbol_to_market_index(symbol)
+        except ValueError as e:
+            logger.error(f"獲取{label}時出錯: {e}")
             return None
-            
-        except Exception as e:
-            logger.error(f"獲取標記價格時出錯: {e}")
+        
+        # 緩存未過期時直接返回，不發起網絡請求
+        cached = self._market_field_cache.get((market_index, field))
+        if cached is not None and time.monotonic() < cached[1]:
+            return cached[0]
+        
+        logger.info("獲取%s - 交易對: %s (市場索引: %s)", label, symbol, market_index)
+        
+        # get_market_info 已將網絡錯誤轉為錯誤結果，這裡只需處理欄位值的轉換錯誤
+        try:
+            fields = await self._load_market_fields(market_index)
+        except (ValueError, TypeError) as e:
+            logger.error(f"獲取{label}時出錯: {e}")
+            return None
+        if fields is None:
             return None
+        
+        value = fields.get(field)
+        if value is not None:
+            return value
+        
+        logger.warning(f"未找到交易對 {symbol} 的{label}信息")
+        return default
+    
+    async def get_funding_rate(self, symbol: str) -> Optional[float]:
+        """
+        獲取資金費率
+        
+        Args:
+            symbol: 交易對符號，如 "BTC-USDC" 或市場索引字符串
+            
+        Returns:
+            Optional[float]: 資金費率，如果獲取失敗則返回 None
+        """
+        return await self._get_market_field(symbol, "funding_rate", "資金費率", default=0.0)
+    
+    async def get_mark_price(self, symbol: str) -> Optional[float]:
+        """
+        獲取標記價格
+        
+        Args:
+            symbol: 交易對符號，如 "BTC-USDC" 或市場索引字符串
+            
+        Returns:
+            Optional[float]: 標記價格，如果獲取失敗則返回 None
+        """
+        return await self._get_market_field(symbol, "mark_price", "標記價格")
     
     async def get_index_price(self, symbol: str) -> Optional[float]:
         """
@@ -1613,32 +2965,7 @@ class LighterClient:
         Returns:
             Optional[float]: 指數價格，如果獲取失敗則返回 None
         """
-        try:
-            # 將 symbol 轉換為 market_index
-            market_index = self._symbol_to_market_index(symbol)
-            logger.info(f"獲取指數價格 - 交易對: {symbol} (市場索引: {market_index})")
-            
-            # 通過市場信息獲取指數價格
-            market_info_result = await self.get_market_info(market_index)
-            
-            if not market_info_result.get("success"):
-                logger.error(f"獲取市場信息失敗: {market_info_result.get('error', '未知錯誤')}")
-                return None
-            
-            market_data = market_info_result.get("market_info", {})
-            
-            # 嘗試從市場數據中提取指數價格
-            if isinstance(market_data, dict):
-                index_price = market_data.get("index_price") or market_data.get("indexPrice")
-                if index_price is not None:
-                    return float(index_price)
-            
-            logger.warning(f"未找到交易對 {symbol} 的指數價格信息")
-            return None
-            
-        except Exception as e:
-            logger.error(f"獲取指數價格時出錯: {e}")
-            return None
+        return await self._get_market_field(symbol, "index_price", "指數價格")
     
     async def get_funding_payments(self, symbol: str = None, limit: int = 100) -> List[Dict]:
         """
@@ -1651,24 +2978,10 @@ class LighterClient:
         Returns:
             List[Dict]: 資金費用支付記錄列表
         """
-        try:
-            # 如果提供了 symbol，轉換為 market_index  
-            market_index = None
-            if symbol:
-                try:
-                    market_index = self._symbol_to_market_index(symbol)
-                except ValueError:
-                    logger.warning(f"無法解析交易對符號: {symbol}")
-            
-            logger.info(f"獲取資金費用支付記錄 - 交易對: {symbol}, 市場索引: {market_index}, 限制: {limit}")
-            
-            # 由於 Lighter API 可能沒有直接的資金費用支付記錄接口
-            # 這裡返回空列表，實際實現需要根據 API 文檔調整
-            return []
-            
-        except Exception as e:
-            logger.error(f"獲取資金費用支付記錄時出錯: {e}")
-            return []
+        # 由於 Lighter API 可能沒有直接的資金費用支付記錄接口
+        # 這裡返回空列表，實際實現需要根據 API 文檔調整；不解析 symbol，結果不依賴它
+        logger.debug("獲取資金費用支付記錄 - 交易對: %s, 限制: %s", symbol, limit)
+        return []
     
     async def get_open_interest(self, symbol: str) -> Optional[float]:
         """
@@ -1680,32 +2993,7 @@ class LighterClient:
         Returns:
             Optional[float]: 未平倉合約數量，如果獲取失敗則返回 None
         """
-        try:
-            # 將 symbol 轉換為 market_index
-            market_index = self._symbol_to_market_index(symbol)
-            logger.info(f"獲取未平倉合約數量 - 交易對: {symbol} (市場索引: {market_index})")
-            
-            # 通過市場信息獲取未平倉合約數量
-            market_info_result = await self.get_market_info(market_index)
-            
-            if not market_info_result.get("success"):
-                logger.error(f"獲取市場信息失敗: {market_info_result.get('error', '未知錯誤')}")
-                return None
-            
-            market_data = market_info_result.get("market_info", {})
-            
-            # 嘗試從市場數據中提取未平倉合約數量
-            if isinstance(market_data, dict):
-                open_interest = market_data.get("open_interest") or market_data.get("openInterest")
-                if open_interest is not None:
-                    return float(open_interest)
-            
-            logger.warning(f"未找到交易對 {symbol} 的未平倉合約數量信息")
-            return None
-            
-        except Exception as e:
-            logger.error(f"獲取未平倉合約數量時出錯: {e}")
-            return None
+        return await self._get_market_field(symbol, "open_interest", "未平倉合約數量")
     
     async def get_order_history(self, symbol: str = None, limit: int = 100) -> List[Dict]:
         """
@@ -1718,24 +3006,10 @@ class LighterClient:
         Returns:
             List[Dict]: 訂單歷史記錄列表
         """
-        try:
-            # 如果提供了 symbol，轉換為 market_index  
-            market_index = None
-            if symbol:
-                try:
-                    market_index = self._symbol_to_market_index(symbol)
-                except ValueError:
-                    logger.warning(f"無法解析交易對符號: {symbol}")
-            
-            logger.info(f"獲取訂單歷史記錄 - 交易對: {symbol}, 市場索引: {market_index}, 限制: {limit}")
-            
-            # 由於 Lighter API 可能沒有直接的訂單歷史記錄接口
-            # 這裡返回空列表，實際實現需要根據 API 文檔調整
-            return []
-            
-        except Exception as e:
-            logger.error(f"獲取訂單歷史記錄時出錯: {e}")
-            return []
+        # 由於 Lighter API 可能沒有直接的訂單歷史記錄接口
+        # 這裡返回空列表，實際實現需要根據 API 文檔調整；不解析 symbol，結果不依賴它
+        logger.debug("獲取訂單歷史記錄 - 交易對: %s, 限制: %s", symbol, limit)
+        return []
     
     async def get_fill_history(self, symbol: str = None, limit: int = 100) -> List[Dict]:
         """
@@ -1748,24 +3022,10 @@ class LighterClient:
         Returns:
             List[Dict]: 成交歷史記錄列表
         """
-        try:
-            # 如果提供了 symbol，轉換為 market_index  
-            market_index = None
-            if symbol:
-                try:
-                    market_index = self._symbol_to_market_index(symbol)
-                except ValueError:
-                    logger.warning(f"無法解析交易對符號: {symbol}")
-            
-            logger.info(f"獲取成交歷史記錄 - 交易對: {symbol}, 市場索引: {market_index}, 限制: {limit}")
-            
-            # 由於 Lighter API 可能沒有直接的成交歷史記錄接口
-            # 這裡返回空列表，實際實現需要根據 API 文檔調整
-            return []
-            
-        except Exception as e:
-            logger.error(f"獲取成交歷史記錄時出錯: {e}")
-            return []
+        # 由於 Lighter API 可能沒有直接的成交歷史記錄接口
+        # 這裡返回空列表，實際實現需要根據 API 文檔調整；不解析 symbol，結果不依賴它
+        logger.debug("獲取成交歷史記錄 - 交易對: %s, 限制: %s", symbol, limit)
+        return []
     
     async def execute_order(self, order_type: str, market_index: int, amount: float, 
                            price: Optional[float] = None, **kwargs) -> Dict:
@@ -1790,9 +3050,10 @@ class LighterClient:
             base_amount = abs(amount)  # 使用絕對值作為數量
             
             # 生成客戶端訂單索引
-            client_order_index = int(time.time() * 1000) % 1000000
+            client_order_index = self.next_client_order_index()
             
-            if order_type.lower() == 'limit':
+            order_type = order_type.lower()
+            if order_type == 'limit':
                 if price is None:
                     return {
                         "success": False,
@@ -1807,7 +3068,7 @@ class LighterClient:
                     **kwargs
                 )
             
-            elif order_type.lower() == 'market':
+            elif order_type == 'market':
                 return await self.create_market_order(
                     market_index=market_index,
                     client_order_index=client_order_index,
@@ -1872,7 +3133,7 @@ class LighterClient:
     
     def _default_account_handler(self, message):
         """默認帳戶更新處理函數"""
-        logger.debug(f"收到帳戶更新: {message}")
+        logger.debug("收到帳戶更新: %s", message)
     
     async def subscribe_order_fills(self, callback: Callable[[Dict], None]) -> Dict:
         """訂閱掛單成交通知 - 重構版本，使用會話式持久連接模式
@@ -1895,7 +3156,9 @@ class LighterClient:
                 return self._handle_api_error("訂閱掛單成交", Exception("添加帳戶訂閱失敗"))
             
             # 添加回調函數
-            self._subscription_callbacks['order_fills'].append(callback)
+            self._subscription_callbacks['order_fills'].append(
+                _DispatchChannel(callback, "掛單成交")
+            )
             
             result = {
                 "success": True,
@@ -1956,21 +3219,18 @@ class LighterClient:
     
     def _default_orderbook_handler(self, message):
         """默認訂單簿更新處理函數"""
-        logger.debug(f"收到訂單簿更新: {message}")
+        logger.debug("收到訂單簿更新: %s", message)
     
     def _init_websocket(self, order_book_ids=None):
         """初始化 WebSocket 客戶端"""
         if self.ws_client is None:
             try:
-                # 從 base_url 提取 host
-                host = self.base_url.replace("https://", "").replace("http://", "")
-                
                 # 設置訂閱的訂單簿ID
                 if order_book_ids is None:
                     order_book_ids = []
                 
                 self.ws_client = WsClient(
-                    host=host,
+                    host=self._ws_host,
                     path="/stream",
                     account_ids=[self.account_index],  # 訂閱帳戶更新
                     order_book_ids=order_book_ids,  # 根據需求訂閱訂單簿
@@ -2024,7 +3284,9 @@ class LighterClient:
                 return self._handle_api_error("訂閱訂單更新", Exception("添加帳戶訂閱失敗"))
             
             # 添加回調函數
-            self._subscription_callbacks['order_updates'].append(callback)
+            self._subscription_callbacks['order_updates'].append(
+                _DispatchChannel(callback, "訂單更新")
+            )
             
             result = {
                 "success": True,
@@ -2108,9 +3370,12 @@ class LighterClient:
                 return self._handle_api_error("訂閱訂單簿深度", Exception("添加訂單簿訂閱失敗"))
             
             # 添加回調函數到對應的市場
-            if market_id not in self._subscription_callbacks['orderbook_updates']:
-                self._subscription_callbacks['orderbook_updates'][market_id] = []
-            self._subscription_callbacks['orderbook_updates'][market_id].append(callback)
+            # 以不可變元組保存，分發時直接遍歷快照；訂閱變化很少，重建的代價可忽略
+            orderbook_callbacks = self._subscription_callbacks['orderbook_updates']
+            orderbook_callbacks[market_id] = (
+                *orderbook_callbacks.get(market_id, ()),
+                _DispatchChannel(callback, "訂單簿更新")
+            )
             
             result = {
                 "success": True,
@@ -2152,31 +3417,83 @@ class LighterClient:
     
     # ==================== 輔助功能 ====================
     
-    async def get_market_info(self, market_id: Optional[int] = None) -> Dict:
+    async def get_market_info(self,
+                              market_id: Optional[int] = None,
+                              fields: Optional[Iterable[str]] = None) -> Dict:
         """
         獲取市場信息
         
         Args:
             market_id: 市場ID (可選，不指定則獲取所有市場)
+            fields: 只需要的欄位 (可選)；指定時直接讀取屬性，不做完整的 model_dump
             
         Returns:
             Dict: 市場信息
         """
+        if fields is not None:
+            fields = tuple(fields)
+        
+        # 同一市場 (及欄位) 已有請求在途時共用其結果 (single-flight)
+        key = (market_id, fields)
+        inflight = self._market_info_inflight.get(key)
+        if inflight is not None:
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # 發起請求的協程被取消，自行重新請求
+                return await self._fetch_market_info(market_id, fields)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._market_info_inflight[key] = future
+        result = None
+        try:
+            result = await self._fetch_market_info(market_id, fields)
+            return result
+        finally:
+            del self._market_info_inflight[key]
+            if result is None:
+                # 請求被取消時通知等待者自行處理
+                future.cancel()
+            else:
+                future.set_result(result)
+    
+    @classmethod
+    def _normalize_market_dict(cls, market_data: Dict) -> Dict:
+        """將駝峰命名的市場欄位統一為蛇形命名，下游只需查一次鍵"""
+        for camel_key, snake_key in cls._MARKET_KEY_ALIASES.items():
+            if camel_key in market_data:
+                value = market_data.pop(camel_key)
+                if market_data.get(snake_key) is None:
+                    market_data[snake_key] = value
+        return market_data
+    
+    async def _fetch_market_info(self, market_id: Optional[int], fields: Optional[tuple] = None) -> Dict:
+        """實際請求市場信息"""
         try:
-            logger.info(f"獲取市場信息 - 市場ID: {market_id or '全部'}")
+            logger.info("獲取市場信息 - 市場ID: %s", market_id or '全部')
             
-            if market_id:
+            if market_id is not None:
                 market_info = await self.order_api.order_book_details(market_id=market_id)
             else:
                 market_info = await self.order_api.order_books()
             
+            if fields is not None and hasattr(market_info, 'model_dump'):
+                # 只讀取需要的屬性 (模型屬性本身即為蛇形命名)
+                market_data = {field: getattr(market_info, field, None) for field in fields}
+            else:
+                market_data = market_info.model_dump() if hasattr(market_info, 'model_dump') else str(market_info)
+            if isinstance(market_data, dict):
+                market_data = self._normalize_market_dict(market_data)
+            
             result = {
                 "success": True,
                 "market_id": market_id,
-                "market_info": market_info.model_dump() if hasattr(market_info, 'model_dump') else str(market_info)
+                "market_info": market_data
             }
             
-            logger.info(f"市場信息獲取成功 - 市場ID: {market_id or '全部'}")
+            logger.info("市場信息獲取成功 - 市場ID: %s", market_id or '全部')
             return result
             
         except Exception as e:
@@ -2197,7 +3514,7 @@ class LighterClient:
             Dict: 交易發送結果
         """
         try:
-            logger.info(f"通過 WebSocket 發送交易 - 操作: {operation_name}, TX類型: {tx_type}")
+            logger.info("通過 WebSocket 發送交易 - 操作: %s, TX類型: %s", operation_name, tx_type)
             
             # 確保 WebSocket 連接可用
             ws = await self._ensure_websocket_connection()
@@ -2207,20 +3524,49 @@ class LighterClient:
                 "type": "jsonapi/sendtx",
                 "data": {
                     "tx_type": tx_type,
-                    "tx_info": json.loads(tx_info),
+                    "tx_info": _json_loads(tx_info),
                 },
             }
             
-            logger.debug(f"發送交易消息: {json.dumps(tx_message, indent=2)}")
-            await ws.send(json.dumps(tx_message))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("發送交易消息: %s", json.dumps(tx_message, indent=2))
             
-            # 接收回應
-            response_msg = await ws.recv()
-            logger.debug(f"收到回應: {response_msg}")
+            # 登記等待回應後再發送；發送與入隊在同一把鎖內，保證兩者順序一致
+            pending = self._ws_pending_queue(ws)
+            response_future = asyncio.get_running_loop().create_future()
+            async with self._ws_send_lock:
+                pending.append(response_future)
+                try:
+                    await ws.send(_json_dumps(tx_message))
+                except BaseException:
+                    if response_future in pending:
+                        pending.remove(response_future)
+                    raise
+            
+            # 交易已發出，掛單狀態即將變化
+            self._invalidate_open_orders_cache()
+            
+            # 等待讀取任務分派回應
+            response_msg = await response_future
+            logger.debug("收到回應: %s", response_msg)
+            
+            # 快速路徑：短的成功回執只需取出 tx_hash，不構造完整字典
+            if isinstance(response_msg, str) and len(response_msg) <= _SHORT_ACK_MAX_LEN and '"error"' not in response_msg:
+                tx_hash_match = _TX_HASH_RE.search(response_msg)
+                if tx_hash_match is not None:
+                    result = {
+                        "success": True,
+                        "tx_hash": tx_hash_match.group(1),
+                        "response": response_msg,
+                        "method": "websocket_persistent",
+                        "operation": operation_name
+                    }
+                    logger.info("%s 通過持久 WebSocket 成功 - TX Hash: %s", operation_name, result['tx_hash'])
+                    return result
             
             # 解析回應
             try:
-                response_data = json.loads(response_msg)
+                response_data = _json_loads(response_msg)
                 
                 # 檢查是否成功
                 if "success" in response_data or "tx_hash" in response_data:
@@ -2231,9 +3577,10 @@ class LighterClient:
                         "method": "websocket_persistent",
                         "operation": operation_name
                     }
-                    logger.info(f"{operation_name} 通過持久 WebSocket 成功 - TX Hash: {result['tx_hash']}")
+                    logger.info("%s 通過持久 WebSocket 成功 - TX Hash: %s", operation_name, result['tx_hash'])
                     return result
                 else:
+                    self._invalidate_nonce()
                     error_msg = response_data.get("error", response_msg)
                     return self._handle_api_error(f"{operation_name} (WebSocket)", Exception(f"WebSocket 回應錯誤: {error_msg}"))
                     
@@ -2246,10 +3593,11 @@ class LighterClient:
                     "method": "websocket_persistent",
                     "operation": operation_name
                 }
-                logger.info(f"{operation_name} 通過持久 WebSocket 完成 - 回應: {response_msg}")
+                logger.info("%s 通過持久 WebSocket 完成 - 回應: %s", operation_name, response_msg)
                 return result
                 
         except Exception as e:
+            self._invalidate_nonce()
             # 如果連接出錯，嘗試關閉並重置連接
             error_str = str(e).lower()
             if ("connection" in error_str or 
@@ -2257,19 +3605,28 @@ class LighterClient:
                 "closed" in error_str or
                 "attribute" in error_str):
                 logger.warning(f"WebSocket 連接異常，將重置連接: {e}")
-                self._last_ws_error_time = time.time()  # 記錄錯誤時間
+                self._last_ws_error_time = time.monotonic()  # 記錄錯誤時間
                 try:
                     await self._close_websocket_connection()
                 except Exception as close_error:
-                    logger.debug(f"重置 WebSocket 連接時出錯: {close_error}")
+                    logger.debug("重置 WebSocket 連接時出錯: %s", close_error)
             return self._handle_api_error(f"{operation_name} (WebSocket)", e)
     
+    async def _reference_price(self, market_index: int, is_ask: bool) -> Optional[float]:
+        """市價單的參考價格：優先使用對手方最優價，其次使用 (緩存的) 標記價格"""
+        top_of_book = self.get_top_of_book(market_index)
+        if top_of_book is not None:
+            return top_of_book[0] if is_ask else top_of_book[1]
+        return await self.get_mark_price(str(market_index))
+    
+    @_ws_api_handler("WS 創建市價訂單")
     async def ws_create_market_order(self,
                                    market_index: int,
                                    client_order_index: int,
                                    base_amount: float,
                                    is_ask: bool,
-                                   reduce_only: bool = False) -> Dict:
+                                   reduce_only: bool = False,
+                                   max_slippage: float = 0.1) -> Dict:
         """
         通過 WebSocket 創建市價訂單
         
@@ -2279,88 +3636,100 @@ class LighterClient:
             base_amount: 基礎數量
             is_ask: 是否為賣單 (True=賣, False=買)
             reduce_only: 是否僅減倉
+            max_slippage: 相對參考價格的最大滑點 (默認 0.1 即 10%)
             
         Returns:
             Dict: 訂單創建結果
         """
-        try:
-            self._ensure_initialized()
-            logger.info(f"WS 創建市價訂單 - 市場: {market_index}, 數量: {base_amount}, 方向: {'賣' if is_ask else '買'}")
-            
-            # 格式化參數
-            base_amount_formatted = self._format_amount(base_amount, market_index)
-            
-            # 獲取當前價格作為執行價格
-            if is_ask:
-                # 賣單：使用較低的價格作為最差可接受價格
-                avg_execution_price = int(1000 * 100)  # $10.00 作為最低價格
-            else:
-                # 買單：使用較高的價格作為最差可接受價格  
-                avg_execution_price = int(100000 * 100)  # $1000.00 作為最高價格
-            
-            # 獲取下一個 nonce
-            # 重要: 這裡必須使用與 sign_create_order 相同的 nonce
-            # 並且要確保在多線程/異步環境下不會有競爭條件
-            # Lighter API 要求 nonce 嚴格遞增
-            
-            # 暫時修改: 直接調用 self.transaction_api.next_nonce 來獲取
-            next_nonce_response = await self.transaction_api.next_nonce(
-                account_index=self.account_index, 
-                api_key_index=self.api_key_index
-            )
-            nonce_value = next_nonce_response.nonce
-            
-            # 確保 SignerClient 使用正確的私鑰和帳戶信息
-            # 有時候初始化可能會有問題，這裡再次確認
-            if self.signer_client.account_index != self.account_index:
-                logger.warning(f"SignerClient account_index ({self.signer_client.account_index}) 與當前 account_index ({self.account_index}) 不匹配，正在修正...")
-                self.signer_client.account_index = self.account_index
-                
-            if self.signer_client.api_key_index != self.api_key_index:
-                logger.warning(f"SignerClient api_key_index ({self.signer_client.api_key_index}) 與當前 api_key_index ({self.api_key_index}) 不匹配，正在修正...")
-                self.signer_client.api_key_index = self.api_key_index
-            
-            # 簽署市價訂單
-
-            tx_info, error = self.signer_client.sign_create_order(
-                market_index=market_index,
-                client_order_index=client_order_index,
-                base_amount=base_amount_formatted,
-                price=avg_execution_price,
-                is_ask=is_ask,
-                order_type=self.ORDER_TYPE_MARKET,
-                time_in_force=self.TIME_IN_FORCE_IOC,
-                reduce_only=int(reduce_only),
-                trigger_price=0,
-                order_expiry=SignerClient.DEFAULT_IOC_EXPIRY,
-                nonce=nonce_value
-            )
-            
-            if error is not None:
-                return self._handle_api_error("WS 創建市價訂單 - 簽署", Exception(f"簽署訂單失敗: {error}"))
-            
-            # 通過 WebSocket 發送交易
-            result = await self._ws_send_transaction(
-                tx_type=SignerClient.TX_TYPE_CREATE_ORDER,
-                tx_info=tx_info,
-                operation_name="WS 創建市價訂單"
-            )
-            
-            if result.get("success"):
-                result["order_info"] = {
-                    "market_index": market_index,
-                    "client_order_index": client_order_index,
-                    "base_amount": base_amount,
-                    "is_ask": is_ask,
-                    "order_type": "market",
-                    "reduce_only": reduce_only
-                }
-            
-            return result
-            
-        except Exception as e:
-            return self._handle_api_error("WS 創建市價訂單", e)
+        logger.info("WS 創建市價訂單 - 市場: %s, 數量: %s, 方向: %s", market_index, base_amount, '賣' if is_ask else '買')
+        
+        # 格式化參數
+        base_amount_formatted = self._format_amount(base_amount, market_index)
+        
+        # 最差可接受價格：有參考價格時按滑點計算，否則使用固定邊界
+        reference_price = await self._reference_price(market_index, is_ask)
+        if reference_price:
+            avg_execution_price = self._format_price(reference_price * ((1 - max_slippage) if is_ask else (1 + max_slippage)))
+        else:
+            avg_execution_price = self._WS_AVG_EXEC_PRICES[is_ask]
+        
+        # 簽署並通過 WebSocket 發送
+        result = await self._ws_sign_and_send_order(
+            "WS 創建市價訂單",
+            market_index=market_index,
+            client_order_index=client_order_index,
+            base_amount=base_amount_formatted,
+            price=avg_execution_price,
+            is_ask=is_ask,
+            order_type=_ORDER_TYPE_MARKET,
+            time_in_force=_TIME_IN_FORCE_IOC,
+            reduce_only=reduce_only,
+            trigger_price=0,
+            order_expiry=_IOC_EXPIRY
+        )
+        
+        if result.get("success"):
+            result["order_info"] = {
+                "market_index": market_index,
+                "client_order_index": client_order_index,
+                "base_amount": base_amount,
+                "is_ask": is_ask,
+                "order_type": "market",
+                "reduce_only": reduce_only
+            }
+        
+        return result
+    
+    def _trigger_execution_price(self, trigger_price: float, is_ask: bool, max_slippage: float = 0.01) -> int:
+        """止損/止盈 (市價觸發) 單觸發後的最差可接受價格 (已格式化)
+        
+        使用觸發價格加上合理的滑點 (默認 1%)：賣單最多下跌、買單最多上漲。
+        """
+        if is_ask:
+            return self._format_price(max(trigger_price * (1 - max_slippage), 1.0))  # 確保至少 $1
+        return self._format_price(trigger_price * (1 + max_slippage))
+    
+    async def _ws_create_trigger_order(self,
+                                       operation_name: str,
+                                       order_type: int,
+                                       order_type_name: str,
+                                       market_index: int,
+                                       client_order_index: int,
+                                       base_amount: float,
+                                       trigger_price: float,
+                                       is_ask: bool,
+                                       reduce_only: bool) -> Dict:
+        """止損/止盈 (市價觸發) 訂單的共用建單路徑，有效期 30 天"""
+        logger.info("%s - 市場: %s, 數量: %s, 觸發價: %s, 方向: %s", operation_name, market_index, base_amount, trigger_price, '賣' if is_ask else '買')
+        
+        result = await self._ws_sign_and_send_order(
+            operation_name,
+            market_index=market_index,
+            client_order_index=client_order_index,
+            base_amount=self._format_amount(base_amount, market_index),
+            price=self._trigger_execution_price(trigger_price, is_ask),
+            is_ask=is_ask,
+            order_type=order_type,
+            time_in_force=self.TIME_IN_FORCE_GTT,
+            reduce_only=reduce_only,
+            trigger_price=self._format_price(trigger_price),
+            order_expiry=time.time_ns() // 1_000_000 + _THIRTY_DAYS_MS
+        )
+        
+        if result.get("success"):
+            result["order_info"] = {
+                "market_index": market_index,
+                "client_order_index": client_order_index,
+                "base_amount": base_amount,
+                "trigger_price": trigger_price,
+                "is_ask": is_ask,
+                "order_type": order_type_name,
+                "reduce_only": reduce_only
+            }
+        
+        return result
     
+    @_ws_api_handler("WS 創建止損訂單")
     async def ws_create_stop_loss_order(self,
                                       market_index: int,
                                       client_order_index: int,
@@ -2371,74 +3740,12 @@ class LighterClient:
         """
         通過 WebSocket 創建止損訂單 (Stop Market)
         """
-        try:
-            self._ensure_initialized()
-            logger.info(f"WS 創建止損訂單 - 市場: {market_index}, 數量: {base_amount}, 觸發價: {trigger_price}, 方向: {'賣' if is_ask else '買'}")
-            
-            base_amount_formatted = self._format_amount(base_amount, market_index)
-            trigger_price_formatted = self._format_price(trigger_price)
-
-            # 止損單 (Stop Market) 觸發後的執行價格
-            # 使用觸發價格加上合理的滑點（1%）作為最差可接受價格
-            max_slippage = 0.01  # 1% 滑點
-
-            if is_ask:
-                # 賣單：觸發後最多下跌 1%
-                execution_price = trigger_price * (1 - max_slippage)
-                price_formatted = self._format_price(max(execution_price, 1.0))  # 確保至少 $1
-            else:
-                # 買單：觸發後最多上漲 1%
-                execution_price = trigger_price * (1 + max_slippage)
-                price_formatted = self._format_price(execution_price)
-            
-            # 獲取下一個 nonce
-            next_nonce_response = await self.transaction_api.next_nonce(
-                account_index=self.account_index, 
-                api_key_index=self.api_key_index
-            )
-            nonce_value = next_nonce_response.nonce
-            
-            # 簽署訂單
-            tx_info, error = self.signer_client.sign_create_order(
-                market_index=market_index,
-                client_order_index=client_order_index,
-                base_amount=base_amount_formatted,
-                price=price_formatted,
-                is_ask=is_ask,
-                order_type=self.ORDER_TYPE_STOP_LOSS,
-                time_in_force=self.TIME_IN_FORCE_GTT,
-                reduce_only=int(reduce_only),
-                trigger_price=trigger_price_formatted,
-                order_expiry=int(time.time() * 1000) + 30 * 24 * 3600 * 1000, # 30 days
-                nonce=nonce_value
-            )
-            
-            if error is not None:
-                return self._handle_api_error("WS 創建止損訂單 - 簽署", Exception(f"簽署訂單失敗: {error}"))
-            
-            # 通過 WebSocket 發送交易
-            result = await self._ws_send_transaction(
-                tx_type=SignerClient.TX_TYPE_CREATE_ORDER,
-                tx_info=tx_info,
-                operation_name="WS 創建止損訂單"
-            )
-            
-            if result.get("success"):
-                result["order_info"] = {
-                    "market_index": market_index,
-                    "client_order_index": client_order_index,
-                    "base_amount": base_amount,
-                    "trigger_price": trigger_price,
-                    "is_ask": is_ask,
-                    "order_type": "stop_loss",
-                    "reduce_only": reduce_only
-                }
-            
-            return result
-            
-        except Exception as e:
-            return self._handle_api_error("WS 創建止損訂單", e)
+        return await self._ws_create_trigger_order(
+            "WS 創建止損訂單", self.ORDER_TYPE_STOP_LOSS, "stop_loss",
+            market_index, client_order_index, base_amount, trigger_price, is_ask, reduce_only
+        )
 
+    @_ws_api_handler("WS 創建止盈訂單")
     async def ws_create_take_profit_order(self,
                                         market_index: int,
                                         client_order_index: int,
@@ -2449,73 +3756,10 @@ class LighterClient:
         """
         通過 WebSocket 創建止盈訂單 (Take Profit Market)
         """
-        try:
-            self._ensure_initialized()
-            logger.info(f"WS 創建止盈訂單 - 市場: {market_index}, 數量: {base_amount}, 觸發價: {trigger_price}, 方向: {'賣' if is_ask else '買'}")
-            
-            base_amount_formatted = self._format_amount(base_amount, market_index)
-            trigger_price_formatted = self._format_price(trigger_price)
-
-            # 止盈單 (Take Profit Market) 觸發後的執行價格
-            # 使用觸發價格加上合理的滑點（1%）作為最差可接受價格
-            max_slippage = 0.01  # 1% 滑點
-
-            if is_ask:
-                # 賣單：觸發後最多下跌 1%
-                execution_price = trigger_price * (1 - max_slippage)
-                price_formatted = self._format_price(max(execution_price, 1.0))  # 確保至少 $1
-            else:
-                # 買單：觸發後最多上漲 1%
-                execution_price = trigger_price * (1 + max_slippage)
-                price_formatted = self._format_price(execution_price)
-            
-            # 獲取下一個 nonce
-            next_nonce_response = await self.transaction_api.next_nonce(
-                account_index=self.account_index, 
-                api_key_index=self.api_key_index
-            )
-            nonce_value = next_nonce_response.nonce
-            
-            # 簽署訂單
-            tx_info, error = self.signer_client.sign_create_order(
-                market_index=market_index,
-                client_order_index=client_order_index,
-                base_amount=base_amount_formatted,
-                price=price_formatted,
-                is_ask=is_ask,
-                order_type=self.ORDER_TYPE_TAKE_PROFIT,
-                time_in_force=self.TIME_IN_FORCE_GTT,
-                reduce_only=int(reduce_only),
-                trigger_price=trigger_price_formatted,
-                order_expiry=int(time.time() * 1000) + 30 * 24 * 3600 * 1000, # 30 days
-                nonce=nonce_value
-            )
-            
-            if error is not None:
-                return self._handle_api_error("WS 創建止盈訂單 - 簽署", Exception(f"簽署訂單失敗: {error}"))
-            
-            # 通過 WebSocket 發送交易
-            result = await self._ws_send_transaction(
-                tx_type=SignerClient.TX_TYPE_CREATE_ORDER,
-                tx_info=tx_info,
-                operation_name="WS 創建止盈訂單"
-            )
-            
-            if result.get("success"):
-                result["order_info"] = {
-                    "market_index": market_index,
-                    "client_order_index": client_order_index,
-                    "base_amount": base_amount,
-                    "trigger_price": trigger_price,
-                    "is_ask": is_ask,
-                    "order_type": "take_profit",
-                    "reduce_only": reduce_only
-                }
-            
-            return result
-            
-        except Exception as e:
-            return self._handle_api_error("WS 創建止盈訂單", e)
+        return await self._ws_create_trigger_order(
+            "WS 創建止盈訂單", self.ORDER_TYPE_TAKE_PROFIT, "take_profit",
+            market_index, client_order_index, base_amount, trigger_price, is_ask, reduce_only
+        )
 
     async def update_leverage(
         self,
@@ -2540,13 +3784,17 @@ class LighterClient:
         try:
             self._ensure_initialized()
 
+            # 常數綁定為局部變數，避免重複的類屬性查找
+            cross_margin_mode = LighterClient.CROSS_MARGIN_MODE
+
             # 默認使用全倉模式
             if margin_mode is None:
-                margin_mode = self.CROSS_MARGIN_MODE
+                margin_mode = cross_margin_mode
+            is_cross = margin_mode == cross_margin_mode
 
             logger.info(
                 f"更新槓桿 - 市場: {market_index}, 槓桿: {leverage}x, "
-                f"保證金模式: {'全倉' if margin_mode == self.CROSS_MARGIN_MODE else '逐倉'}"
+                f"保證金模式: {'全倉' if is_cross else '逐倉'}"
             )
 
             # 調用 SDK 的 update_leverage 方法
@@ -2581,7 +3829,7 @@ class LighterClient:
                     "market_index": market_index,
                     "leverage": leverage,
                     "margin_mode": margin_mode,
-                    "margin_mode_name": "cross" if margin_mode == self.CROSS_MARGIN_MODE else "isolated"
+                    "margin_mode_name": "cross" if is_cross else "isolated"
                 }
             }
 
@@ -2638,34 +3886,39 @@ class LighterClient:
             is_ask = is_long_position
 
             # 生成唯一的客戶端訂單索引
-            base_client_order_index = int(time.time() * 1000) % 1000000
+            sl_client_order_index = self.next_client_order_index()
+            tp_client_order_index = self.next_client_order_index()
+
+            # 常數綁定為局部變數，兩張訂單共用
+            time_in_force = LighterClient.TIME_IN_FORCE_IOC
+            order_expiry = LighterClient.DEFAULT_28_DAY_ORDER_EXPIRY
 
             # 創建止損訂單請求
             stop_loss_order = CreateOrderTxReq(
                 MarketIndex=market_index,
-                ClientOrderIndex=base_client_order_index,
+                ClientOrderIndex=sl_client_order_index,
                 BaseAmount=base_amount_formatted,
                 Price=0,  # 市價單價格設為 0
                 IsAsk=is_ask,
                 Type=self.ORDER_TYPE_STOP_LOSS,
-                TimeInForce=self.TIME_IN_FORCE_IOC,
+                TimeInForce=time_in_force,
                 ReduceOnly=int(reduce_only),
                 TriggerPrice=sl_trigger_formatted,
-                OrderExpiry=self.DEFAULT_28_DAY_ORDER_EXPIRY
+                OrderExpiry=order_expiry
             )
 
             # 創建止盈訂單請求
             take_profit_order = CreateOrderTxReq(
                 MarketIndex=market_index,
-                ClientOrderIndex=base_client_order_index + 1,
+                ClientOrderIndex=tp_client_order_index,
                 BaseAmount=base_amount_formatted,
                 Price=0,  # 市價單價格設為 0
                 IsAsk=is_ask,
                 Type=self.ORDER_TYPE_TAKE_PROFIT,
-                TimeInForce=self.TIME_IN_FORCE_IOC,
+                TimeInForce=time_in_force,
                 ReduceOnly=int(reduce_only),
                 TriggerPrice=tp_trigger_formatted,
-                OrderExpiry=self.DEFAULT_28_DAY_ORDER_EXPIRY
+                OrderExpiry=order_expiry
             )
 
             # 使用 SDK 的 create_grouped_orders 方法創建 OCO 組合訂單
@@ -2710,6 +3963,7 @@ class LighterClient:
             logger.error(f"創建止盈止損 OCO 訂單異常: {e}")
             return self._handle_api_error("創建止盈止損 OCO 訂單", e)
 
+    @_ws_api_handler("WS 創建限價訂單")
     async def ws_create_limit_order(self,
                                   market_index: int,
                                   client_order_index: int,
@@ -2717,7 +3971,7 @@ class LighterClient:
                                   price: float,
                                   is_ask: bool,
                                   reduce_only: bool = False,
-                                  time_in_force: int = None,
+                                  time_in_force: int = _TIME_IN_FORCE_GTT,
                                   order_expiry: int = -1) -> Dict:
         """
         通過 WebSocket 創建限價訂單
@@ -2735,67 +3989,36 @@ class LighterClient:
         Returns:
             Dict: 訂單創建結果
         """
-        try:
-            self._ensure_initialized()
-            
-            # 設置默認時效
-            if time_in_force is None:
-                time_in_force = self.TIME_IN_FORCE_GTT
-            
-            logger.info(f"WS 創建限價訂單 - 市場: {market_index}, 數量: {base_amount}, 價格: {price}, 方向: {'賣' if is_ask else '買'}")
-            
-            # 格式化參數
-            base_amount_formatted = self._format_amount(base_amount, market_index)
-            price_formatted = self._format_price(price)
-            
-            # 獲取下一個 nonce
-            next_nonce_response = await self.transaction_api.next_nonce(
-                account_index=self.account_index, 
-                api_key_index=self.api_key_index
-            )
-            nonce_value = next_nonce_response.nonce
-            
-            # 簽署限價訂單
-            tx_info, error = self.signer_client.sign_create_order(
-                market_index=market_index,
-                client_order_index=client_order_index,
-                base_amount=base_amount_formatted,
-                price=price_formatted,
-                is_ask=is_ask,
-                order_type=self.ORDER_TYPE_LIMIT,
-                time_in_force=time_in_force,
-                reduce_only=int(reduce_only),
-                trigger_price=0,
-                order_expiry=order_expiry,
-                nonce=nonce_value
-            )
-            
-            if error is not None:
-                return self._handle_api_error("WS 創建限價訂單 - 簽署", Exception(f"簽署訂單失敗: {error}"))
-            
-            # 通過 WebSocket 發送交易
-            result = await self._ws_send_transaction(
-                tx_type=SignerClient.TX_TYPE_CREATE_ORDER,
-                tx_info=tx_info,
-                operation_name="WS 創建限價訂單"
+        logger.info("WS 創建限價訂單 - 市場: %s, 數量: %s, 價格: %s, 方向: %s", market_index, base_amount, price, '賣' if is_ask else '買')
+        
+        # 格式化參數
+        base_amount_formatted = self._format_amount(base_amount, market_index)
+        price_formatted = self._format_price(price)
+        
+        # 簽署並通過 WebSocket 發送
+        result = await self._ws_sign_and_send_order(
+            "WS 創建限價訂單",
+            market_index=market_index,
+            client_order_index=client_order_index,
+            base_amount=base_amount_formatted,
+            price=price_formatted,
+            is_ask=is_ask,
+            order_type=self.ORDER_TYPE_LIMIT,
+            time_in_force=time_in_force,
+            reduce_only=reduce_only,
+            trigger_price=0,
+            order_expiry=order_expiry
+        )
+        
+        if result.get("success"):
+            result["order_info"] = _limit_order_info(
+                market_index=market_index, client_order_index=client_order_index, base_amount=base_amount,
+                price=price, is_ask=is_ask, reduce_only=reduce_only
             )
-            
-            if result.get("success"):
-                result["order_info"] = {
-                    "market_index": market_index,
-                    "client_order_index": client_order_index,
-                    "base_amount": base_amount,
-                    "price": price,
-                    "is_ask": is_ask,
-                    "order_type": "limit",
-                    "reduce_only": reduce_only
-                }
-            
-            return result
-            
-        except Exception as e:
-            return self._handle_api_error("WS 創建限價訂單", e)
+        
+        return result
     
+    @_ws_api_handler("WS 市價平倉")
     async def ws_close_market_order(self,
                                   market_index: int,
                                   position_size: float,
@@ -2813,36 +4036,31 @@ class LighterClient:
         Returns:
             Dict: 平倉結果
         """
-        try:
-            self._ensure_initialized()
-            
-            # 自動生成客戶端訂單索引
-            if client_order_index is None:
-                client_order_index = int(time.time() * 1000) % 1000000
-            
-            # 平倉需要反向操作：多頭持倉需要賣出，空頭持倉需要買入
-            is_ask = is_long_position  # 多頭平倉=賣出, 空頭平倉=買入
-            
-            logger.info(f"WS 市價平倉 - 市場: {market_index}, 持倉大小: {position_size}, 持倉方向: {'多頭' if is_long_position else '空頭'}")
-            
-            return await self.ws_create_market_order(
-                market_index=market_index,
-                client_order_index=client_order_index,
-                base_amount=position_size,
-                is_ask=is_ask,
-                reduce_only=True  # 設置為僅減倉
-            )
-            
-        except Exception as e:
-            return self._handle_api_error("WS 市價平倉", e)
+        # 自動生成客戶端訂單索引
+        if client_order_index is None:
+            client_order_index = self.next_client_order_index()
+        
+        # 平倉需要反向操作：多頭持倉需要賣出，空頭持倉需要買入
+        is_ask = is_long_position  # 多頭平倉=賣出, 空頭平倉=買入
+        
+        logger.info("WS 市價平倉 - 市場: %s, 持倉大小: %s, 持倉方向: %s", market_index, position_size, '多頭' if is_long_position else '空頭')
+        
+        return await self.ws_create_market_order(
+            market_index=market_index,
+            client_order_index=client_order_index,
+            base_amount=position_size,
+            is_ask=is_ask,
+            reduce_only=True  # 設置為僅減倉
+        )
     
+    @_ws_api_handler("WS 限價平倉")
     async def ws_close_limit_order(self,
                                  market_index: int,
                                  position_size: float,
                                  price: float,
                                  is_long_position: bool,
                                  client_order_index: Optional[int] = None,
-                                 time_in_force: int = None,
+                                 time_in_force: int = _TIME_IN_FORCE_GTT,
                                  order_expiry: int = -1) -> Dict:
         """
         通過 WebSocket 限價平倉
@@ -2859,32 +4077,27 @@ class LighterClient:
         Returns:
             Dict: 平倉結果
         """
-        try:
-            self._ensure_initialized()
-            
-            # 自動生成客戶端訂單索引
-            if client_order_index is None:
-                client_order_index = int(time.time() * 1000) % 1000000
-            
-            # 平倉需要反向操作：多頭持倉需要賣出，空頭持倉需要買入
-            is_ask = is_long_position  # 多頭平倉=賣出, 空頭平倉=買入
-            
-            logger.info(f"WS 限價平倉 - 市場: {market_index}, 持倉大小: {position_size}, 價格: {price}, 持倉方向: {'多頭' if is_long_position else '空頭'}")
-            
-            return await self.ws_create_limit_order(
-                market_index=market_index,
-                client_order_index=client_order_index,
-                base_amount=position_size,
-                price=price,
-                is_ask=is_ask,
-                reduce_only=True,  # 設置為僅減倉
-                time_in_force=time_in_force,
-                order_expiry=order_expiry
-            )
-            
-        except Exception as e:
-            return self._handle_api_error("WS 限價平倉", e)
+        # 自動生成客戶端訂單索引
+        if client_order_index is None:
+            client_order_index = self.next_client_order_index()
+        
+        # 平倉需要反向操作：多頭持倉需要賣出，空頭持倉需要買入
+        is_ask = is_long_position  # 多頭平倉=賣出, 空頭平倉=買入
+        
+        logger.info("WS 限價平倉 - 市場: %s, 持倉大小: %s, 價格: %s, 持倉方向: %s", market_index, position_size, price, '多頭' if is_long_position else '空頭')
+        
+        return await self.ws_create_limit_order(
+            market_index=market_index,
+            client_order_index=client_order_index,
+            base_amount=position_size,
+            price=price,
+            is_ask=is_ask,
+            reduce_only=True,  # 設置為僅減倉
+            time_in_force=time_in_force,
+            order_expiry=order_expiry
+        )
     
+    @_ws_api_handler("WS 取消訂單")
     async def ws_cancel_order(self, market_index: int, order_index: int) -> Dict:
         """
         通過 WebSocket 取消訂單
@@ -2896,46 +4109,32 @@ class LighterClient:
         Returns:
             Dict: 取消結果
         """
-        try:
-            self._ensure_initialized()
-            logger.info(f"WS 取消訂單 - 市場: {market_index}, 訂單索引: {order_index}")
-            
-            # 獲取下一個 nonce
-            next_nonce_response = await self.transaction_api.next_nonce(
-                account_index=self.account_index, 
-                api_key_index=self.api_key_index
-            )
-            nonce_value = next_nonce_response.nonce
-            
-            # 簽署取消訂單
-            tx_info, error = self.signer_client.sign_cancel_order(
-                market_index=market_index,
-                order_index=order_index,
-                nonce=nonce_value
-            )
-            
-            if error is not None:
-                return self._handle_api_error("WS 取消訂單 - 簽署", Exception(f"簽署取消訂單失敗: {error}"))
-            
-            # 通過 WebSocket 發送交易
-            result = await self._ws_send_transaction(
-                tx_type=SignerClient.TX_TYPE_CANCEL_ORDER,
-                tx_info=tx_info,
-                operation_name="WS 取消訂單"
-            )
-            
-            if result.get("success"):
-                result["cancelled_order"] = {
-                    "market_index": market_index,
-                    "order_index": order_index
-                }
-            
-            return result
-            
-        except Exception as e:
-            return self._handle_api_error("WS 取消訂單", e)
+        logger.info("WS 取消訂單 - 市場: %s, 訂單索引: %s", market_index, order_index)
+        
+        # 分配 nonce 並簽署取消訂單
+        tx_info, error = await self._allocate_and_sign(
+            self.signer_client.sign_cancel_order,
+            market_index=market_index,
+            order_index=order_index
+        )
+        
+        if error is not None:
+            return self._handle_api_error("WS 取消訂單 - 簽署", Exception(f"簽署取消訂單失敗: {error}"))
+        
+        # 通過 WebSocket 發送交易
+        result = await self._ws_send_transaction(
+            tx_type=_TX_CANCEL_ORDER,
+            tx_info=tx_info,
+            operation_name="WS 取消訂單"
+        )
+        
+        if result.get("success"):
+            result["cancelled_order"] = _cancel_order_info(market_index=market_index, order_index=order_index)
+        
+        return result
     
-    async def ws_cancel_all_orders(self, time_in_force: int = None, time: int = 0) -> Dict:
+    @_ws_api_handler("WS 取消所有訂單")
+    async def ws_cancel_all_orders(self, time_in_force: int = _CANCEL_ALL_TIF_IMMEDIATE, time: int = 0) -> Dict:
         """
         通過 WebSocket 取消所有訂單
         
@@ -2946,50 +4145,34 @@ class LighterClient:
         Returns:
             Dict: 取消結果
         """
-        try:
-            self._ensure_initialized()
-            
-            # 設置默認時效
-            if time_in_force is None:
-                time_in_force = self.CANCEL_ALL_TIF_IMMEDIATE
-            
-            logger.info("WS 取消所有訂單")
-            
-            # 獲取下一個 nonce
-            next_nonce_response = await self.transaction_api.next_nonce(
-                account_index=self.account_index, 
-                api_key_index=self.api_key_index
-            )
-            nonce_value = next_nonce_response.nonce
-            
-            # 簽署取消所有訂單
-            tx_info, error = self.signer_client.sign_cancel_all_orders(
-                time_in_force=time_in_force,
-                time=time,
-                nonce=nonce_value
-            )
-            
-            if error is not None:
-                return self._handle_api_error("WS 取消所有訂單 - 簽署", Exception(f"簽署取消所有訂單失敗: {error}"))
-            
-            # 通過 WebSocket 發送交易
-            result = await self._ws_send_transaction(
-                tx_type=SignerClient.TX_TYPE_CANCEL_ALL_ORDERS,
-                tx_info=tx_info,
-                operation_name="WS 取消所有訂單"
-            )
-            
-            if result.get("success"):
-                result["cancel_info"] = {
-                    "time_in_force": time_in_force,
-                    "time": time
-                }
-            
-            return result
-            
-        except Exception as e:
-            return self._handle_api_error("WS 取消所有訂單", e)
+        logger.info("WS 取消所有訂單")
+        
+        # 分配 nonce 並簽署取消所有訂單
+        tx_info, error = await self._allocate_and_sign(
+            self.signer_client.sign_cancel_all_orders,
+            time_in_force=time_in_force,
+            time=time
+        )
+        
+        if error is not None:
+            return self._handle_api_error("WS 取消所有訂單 - 簽署", Exception(f"簽署取消所有訂單失敗: {error}"))
+        
+        # 通過 WebSocket 發送交易
+        result = await self._ws_send_transaction(
+            tx_type=_TX_CANCEL_ALL_ORDERS,
+            tx_info=tx_info,
+            operation_name="WS 取消所有訂單"
+        )
+        
+        if result.get("success"):
+            result["cancel_info"] = {
+                "time_in_force": time_in_force,
+                "time": time
+            }
+        
+        return result
     
+    @_ws_api_handler("WS 平倉所有持倉")
     async def ws_cancel_all_position(self) -> Dict:
         """
         通過 WebSocket 平倉所有持倉
@@ -3002,111 +4185,107 @@ class LighterClient:
         Returns:
             Dict: 平倉結果，包含每個市場的平倉狀況
         """
-        try:
-            self._ensure_initialized()
-            logger.info("WS 開始平倉所有持倉")
-            
-            # 先獲取當前所有持倉
-            positions_result = await self.get_positions()
-            if not positions_result.get("success"):
-                return self._handle_api_error("WS 平倉所有持倉 - 獲取持倉", Exception(f"無法獲取持倉信息: {positions_result.get('error', '未知錯誤')}"))
-            
-            positions = positions_result.get("positions", [])
-            if not positions:
-                logger.info("WS 平倉所有持倉 - 沒有發現任何持倉")
-                return {
-                    "success": True,
-                    "message": "沒有需要平倉的持倉",
-                    "total_positions": 0,
-                    "closed_positions": []
-                }
-            
-            logger.info(f"WS 平倉所有持倉 - 發現 {len(positions)} 個持倉需要平倉")
-            
-            # 存储平倉結果
-            close_results = []
-            success_count = 0
-            
-            for position in positions:
-                try:
-                    market_index = position.get("market_index")
-                    position_amount = position.get("position_amount", 0.0)
-                    is_long = position.get("is_long", False)
-                    
-                    # 跳過沒有持倉的市場
-                    if abs(position_amount) == 0.0:
-                        logger.debug(f"跳過市場 {market_index} - 無持倉")
-                        continue
-                    
-                    market_symbol = self._market_index_to_symbol(market_index)
-                    logger.info(f"WS 平倉持倉 - 市場: {market_symbol} ({market_index}), 持倉: {position_amount}, 方向: {'多頭' if is_long else '空頭'}")
-                    
-                    # 執行市價平倉
+        logger.info("WS 開始平倉所有持倉")
+        
+        # 先獲取當前所有持倉
+        positions_result = await self.get_positions()
+        if not positions_result.get("success"):
+            return self._handle_api_error("WS 平倉所有持倉 - 獲取持倉", Exception(f"無法獲取持倉信息: {positions_result.get('error', '未知錯誤')}"))
+        
+        positions = positions_result.get("positions", [])
+        if not positions:
+            logger.info("WS 平倉所有持倉 - 沒有發現任何持倉")
+            return {
+                "success": True,
+                "message": "沒有需要平倉的持倉",
+                "total_positions": 0,
+                "closed_positions": []
+            }
+        
+        # 調度前先跳過沒有持倉的市場，每個持倉只讀取一次欄位
+        open_positions = [
+            (position.get("market_index"), position_amount, position.get("is_long", False))
+            for position in positions
+            if (position_amount := position.get("position_amount", 0.0)) != 0.0
+        ]
+        
+        logger.info(f"WS 平倉所有持倉 - 發現 {len(positions)} 個持倉，其中 {len(open_positions)} 個需要平倉")
+        
+        # 併發平倉，以信號量限制同時在途的訂單數，代替逐筆等待與固定間隔
+        semaphore = asyncio.Semaphore(self.CLOSE_ALL_CONCURRENCY)
+        market_index_to_symbol = self._market_index_to_symbol
+        
+        async def close_one(market_index, position_amount, is_long) -> Dict:
+            # 先給出默認值，異常分支可直接使用，無需再次查找
+            market_symbol = "unknown"
+            try:
+                market_symbol = market_index_to_symbol(market_index)
+                logger.info("WS 平倉持倉 - 市場: %s (%s), 持倉: %s, 方向: %s", market_symbol, market_index, position_amount, '多頭' if is_long else '空頭')
+                
+                # 執行市價平倉
+                async with semaphore:
                     close_result = await self.ws_close_market_order(
                         market_index=market_index,
                         position_size=abs(position_amount),
                         is_long_position=is_long
                     )
-                    
-                    close_results.append({
-                        "market_index": market_index,
-                        "market_symbol": market_symbol,
-                        "position_amount": position_amount,
-                        "is_long": is_long,
-                        "close_result": close_result,
-                        "success": close_result.get("success", False),
-                        "tx_hash": close_result.get("tx_hash", None),
-                        "error": close_result.get("error", None)
-                    })
-                    
-                    if close_result.get("success"):
-                        success_count += 1
-                        logger.info(f"✅ 市場 {market_symbol} ({market_index}) 平倉成功 - TX: {close_result.get('tx_hash')}")
-                    else:
-                        logger.error(f"❌ 市場 {market_symbol} ({market_index}) 平倉失敗 - {close_result.get('error', '未知錯誤')}")
-                    
-                    # 每次平倉後等待1秒，避免請求過於頻繁
-                    await asyncio.sleep(0.1)
-                    
-                except Exception as e:
-                    logger.error(f"處理市場 {market_index} 持倉時出錯: {e}")
-                    close_results.append({
-                        "market_index": market_index,
-                        "market_symbol": self._market_index_to_symbol(market_index) if market_index else "unknown",
-                        "position_amount": position.get("position_amount", 0.0),
-                        "is_long": position.get("is_long", False),
-                        "close_result": {"success": False, "error": str(e)},
-                        "success": False,
-                        "tx_hash": None,
-                        "error": str(e)
-                    })
-            
-            # 整理最終結果
-            result = {
-                "success": success_count > 0,  # 只要有一個成功就算成功
-                "total_positions": len(positions),
-                "attempted_positions": len(close_results),
-                "successful_closes": success_count,
-                "failed_closes": len(close_results) - success_count,
-                "close_results": close_results,
-                "method": "websocket",
-                "operation": "WS 平倉所有持倉"
-            }
-            
-            if success_count == len(close_results):
-                result["message"] = f"所有 {success_count} 個持倉均成功平倉"
-                logger.info(f"✅ WS 平倉所有持倉完成 - 全部成功 ({success_count}/{len(close_results)})")
-            elif success_count > 0:
-                result["message"] = f"部分持倉平倉成功 ({success_count}/{len(close_results)})"
-                logger.warning(f"⚠️ WS 平倉所有持倉完成 - 部分成功 ({success_count}/{len(close_results)})")
-            else:
-                result["message"] = f"所有持倉平倉均失敗 (0/{len(close_results)})"
-                logger.error(f"❌ WS 平倉所有持倉完成 - 全部失敗 (0/{len(close_results)})")
-            
-            return result
-            
-        except Exception as e:
-            return self._handle_api_error("WS 平倉所有持倉", e)
+                
+                if close_result.get("success"):
+                    logger.info("✅ 市場 %s (%s) 平倉成功 - TX: %s", market_symbol, market_index, close_result.get('tx_hash'))
+                else:
+                    logger.error(f"❌ 市場 {market_symbol} ({market_index}) 平倉失敗 - {close_result.get('error', '未知錯誤')}")
+                
+                return {
+                    "market_index": market_index,
+                    "market_symbol": market_symbol,
+                    "position_amount": position_amount,
+                    "is_long": is_long,
+                    "close_result": close_result,
+                    "success": close_result.get("success", False),
+                    "tx_hash": close_result.get("tx_hash", None),
+                    "error": close_result.get("error", None)
+                }
+                
+            except Exception as e:
+                logger.error(f"處理市場 {market_index} 持倉時出錯: {e}")
+                return {
+                    "market_index": market_index,
+                    "market_symbol": market_symbol,
+                    "position_amount": position_amount,
+                    "is_long": is_long,
+                    "close_result": {"success": False, "error": str(e)},
+                    "success": False,
+                    "tx_hash": None,
+                    "error": str(e)
+                }
+        
+        close_results = await asyncio.gather(*(close_one(*position) for position in open_positions))
+        success_count = sum(1 for r in close_results if r["success"])
+        
+        # 整理最終結果
+        result = {
+            "success": success_count > 0,  # 只要有一個成功就算成功
+            "total_positions": len(positions),
+            "active_positions": len(open_positions),
+            "attempted_positions": len(close_results),
+            "successful_closes": success_count,
+            "failed_closes": len(close_results) - success_count,
+            "close_results": close_results,
+            "method": "websocket",
+            "operation": "WS 平倉所有持倉"
+        }
+        
+        if success_count == len(close_results):
+            result["message"] = f"所有 {success_count} 個持倉均成功平倉"
+            logger.info(f"✅ WS 平倉所有持倉完成 - 全部成功 ({success_count}/{len(close_results)})")
+        elif success_count > 0:
+            result["message"] = f"部分持倉平倉成功 ({success_count}/{len(close_results)})"
+            logger.warning(f"⚠️ WS 平倉所有持倉完成 - 部分成功 ({success_count}/{len(close_results)})")
+        else:
+            result["message"] = f"所有持倉平倉均失敗 (0/{len(close_results)})"
+            logger.error(f"❌ WS 平倉所有持倉完成 - 全部失敗 (0/{len(close_results)})")
+        
+        return result
 
     
     
@@ -3117,6 +4296,11 @@ class LighterClient:
         try:
             logger.info("開始關閉 Lighter 客戶端...")
             
+            # 停止最優買賣價訂閱
+            if self._tob_task is not None:
+                self._tob_task.cancel()
+                self._tob_task = None
+            
             # 停止 WebSocket 會話 (新增)
             try:
                 if self._subscription_active:
@@ -3125,14 +4309,6 @@ class LighterClient:
             except Exception as e:
                 logger.warning(f"停止 WebSocket 會話時出錯: {e}")
             
-            # 安全關閉 WebSocket 持久連接
-            try:
-                if hasattr(self, '_ws_connection') and self._ws_connection:
-                    await self._close_websocket_connection()
-                    logger.debug("WebSocket 持久連接已關閉")
-            except Exception as e:
-                logger.warning(f"關閉 WebSocket 持久連接時出錯: {e}")
-            
             # 安全關閉 WebSocket 客戶端 (舊版本兼容)
             try:
                 if hasattr(self, 'ws_client') and self.ws_client:
@@ -3142,49 +4318,47 @@ class LighterClient:
             except Exception as e:
                 logger.warning(f"關閉 WebSocket 客戶端時出錯: {e}")
             
-            # 安全關閉 signer_client 的會話
-            try:
-                if hasattr(self, 'signer_client') and self.signer_client:
-                    # SignerClient 有 close() 方法來關閉內部的 aiohttp session
-                    if hasattr(self.signer_client, 'close'):
-                        try:
-                            await self.signer_client.close()
-                            logger.debug("SignerClient 會話已關閉")
-                        except Exception as close_error:
-                            logger.warning(f"SignerClient.close() 失敗: {close_error}")
-                    # 額外嘗試關閉可能存在的內部 session
-                    if hasattr(self.signer_client, 'session') and self.signer_client.session:
-                        try:
-                            await self.signer_client.session.close()
-                            logger.debug("SignerClient 內部 session 已關閉")
-                        except Exception as session_error:
-                            logger.warning(f"關閉 SignerClient.session 失敗: {session_error}")
-            except Exception as e:
-                logger.warning(f"關閉 SignerClient 會話時出錯: {e}")
-            
-            # 安全關閉 account_api 的 session
-            try:
-                if hasattr(self, 'account_api') and self.account_api and hasattr(self.account_api, 'api_client'):
-                    api_client = self.account_api.api_client
-                    if hasattr(api_client, 'rest_client') and api_client.rest_client:
-                        await api_client.rest_client.close()
-                    if hasattr(api_client, '_session') and api_client._session:
-                        await api_client._session.close()
-                    logger.debug("AccountAPI 會話已關閉")
-            except Exception as e:
-                logger.warning(f"關閉 AccountAPI 會話時出錯: {e}")
-            
-            # 安全關閉 order_api 的 session
+            # 各連接互相獨立，併發關閉，總耗時取決於最慢的一個而非總和
+            closers = []
+            
+            # WebSocket 持久連接
+            if getattr(self, '_ws_connection', None):
+                closers.append(self._safe_close("WebSocket 持久連接", self._close_websocket_connection()))
+            
+            # signer_client 的會話
+            signer_client = getattr(self, 'signer_client', None)
+            if signer_client:
+                # SignerClient 有 close() 方法來關閉內部的 aiohttp session
+                if hasattr(signer_client, 'close'):
+                    closers.append(self._safe_close("SignerClient 會話", signer_client.close()))
+                # 額外嘗試關閉可能存在的內部 session
+                if getattr(signer_client, 'session', None):
+                    closers.append(self._safe_close("SignerClient 內部 session", signer_client.session.close()))
+            
+            # 查詢 API 的 session (account/order/transaction API 共用同一個 ApiClient)
+            api_client = getattr(getattr(self, 'account_api', None), 'api_client', None)
+            if api_client is not None:
+                rest_client = getattr(api_client, 'rest_client', None)
+                # 已注入共享 HTTP 會話時由下方統一關閉一次
+                if rest_client and getattr(rest_client, 'pool_manager', None) is not self._http_session:
+                    closers.append(self._safe_close("查詢 API 會話", rest_client.close()))
+                if getattr(api_client, '_session', None):
+                    closers.append(self._safe_close("查詢 API 內部 session", api_client._session.close()))
+            
+            await asyncio.gather(*closers)
+            
+            # 停止簽名線程
+            self._sign_executor.shutdown(wait=False)
+            
+            # 關閉共享的 HTTP 會話 (若上面的 SDK 關閉流程已關閉則為空操作)
             try:
-                if hasattr(self, 'order_api') and self.order_api and hasattr(self.order_api, 'api_client'):
-                    api_client = self.order_api.api_client
-                    if hasattr(api_client, 'rest_client') and api_client.rest_client:
-                        await api_client.rest_client.close()
-                    if hasattr(api_client, '_session') and api_client._session:
-                        await api_client._session.close()
-                    logger.debug("OrderAPI 會話已關閉")
+                if self._http_session is not None and not self._http_session.closed:
+                    await self._http_session.close()
+                    logger.debug("共享 HTTP 會話已關閉")
             except Exception as e:
-                logger.warning(f"關閉 OrderAPI 會話時出錯: {e}")
+                logger.warning(f"關閉共享 HTTP 會話時出錯: {e}")
+            finally:
+                self._http_session = None
             
             logger.info("Lighter 客戶端已安全關閉")
             
@@ -3192,6 +4366,15 @@ class LighterClient:
             logger.error(f"關閉客戶端時發生未預期錯誤: {e}")
             # 即使出錯也不拋出異常，確保程序能正常退出
     
+    @staticmethod
+    async def _safe_close(description: str, closing) -> None:
+        """等待一個關閉操作，出錯時只記錄警告"""
+        try:
+            await closing
+            logger.debug("%s已關閉", description)
+        except Exception as e:
+            logger.warning(f"關閉{description}時出錯: {e}")
+    
     def __del__(self):
         """析構函數"""
         try:
@@ -3,8 +3,13 @@ Lighter Quant Trading Bot
 主程式入口
 """
 import asyncio
+import collections
+import json
 import signal
+import time
+from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta, timezone
+from pathlib import Path
 from typing import Optional
 import uuid
 import os
@@ -37,6 +42,7 @@ from exchange import (
     lighter_client,
     data_fetcher,
     Position,
+    AccountInfo,
 )
 from utils import (
     bot_logger as logger,
@@ -47,6 +53,25 @@ from utils import (
 )
 
 
+@dataclass
+class _AccountSnapshot:
+    """單次輪詢的帳戶快照 (所有市場共用)"""
+    account: AccountInfo
+    fetched_at: float             # time.monotonic() 時間戳
+
+    def position_for(self, market_id: int) -> Optional[Position]:
+        """取得指定市場的持倉"""
+        for pos in self.account.positions:
+            if pos.market_id == market_id:
+                return pos
+        return None
+
+    @property
+    def fetched_at_wall(self) -> float:
+        """快照取得時的 Unix 時間"""
+        return time.time() - (time.monotonic() - self.fetched_at)
+
+
 class TradingBot:
     """
     量化交易機器人
@@ -54,6 +79,31 @@ class TradingBot:
     整合所有模組，執行自動交易
     """
     
+    # 狀態報告分隔線
+    REPORT_SEPARATOR = "=" * 80
+    
+    # 交易 ID 池每次批量生成的數量
+    TRADE_ID_BATCH = 256
+    
+    # Discord 通知合併窗口 (秒) 與單則訊息長度上限
+    NOTIFICATION_BATCH_WINDOW = 0.2
+    NOTIFICATION_MAX_LENGTH = 2000
+    
+    # 關閉時等待剩餘通知發送完畢的最長時間 (秒)
+    NOTIFICATION_DRAIN_TIMEOUT = 5.0
+    
+    # 每個週期同時執行的市場交易邏輯上限
+    CYCLE_CONCURRENCY = 16
+    
+    # 重啟後無訊號記錄時的基本止損比例
+    RESTART_STOP_LOSS = 0.05
+    
+    # 持倉訊號與進場時間的保存路徑 (重啟後恢復)
+    STATE_PATH = Path("data/bot_state.json")
+    
+    # 關閉時單個連接的最長等待 (秒)
+    SHUTDOWN_TIMEOUT = 5.0
+    
     def __init__(self):
         self.config = settings
         self.risk_manager: Optional[RiskManager] = None
@@ -73,12 +123,51 @@ class TradingBot:
         self.signals: dict[str, Optional[Signal]] = {}
         self.entry_times: dict[str, Optional[datetime]] = {}
         
+        # 市場列表的固定顯示文字 (市場配置在運行期間不變)
+        self._market_symbols_text = ", ".join(f"{s}({id})" for s, id in self.market_configs)
+        self._market_report_prefixes = [
+            (symbol, market_id, f"  {symbol:<5} (ID: {market_id:<2}) | 狀態: ")
+            for symbol, market_id in self.market_configs
+        ]
+        
         # 初始化每個市場的狀態
         for symbol, _ in self.market_configs:
             self.positions[symbol] = None
             self.signals[symbol] = None
             self.entry_times[symbol] = None
         
+        # 帳戶快照快取 (同一週期內所有市場共用，TTL 在 run() 中按間隔設置)
+        self._account_snapshot: Optional[_AccountSnapshot] = None
+        self._account_lock = asyncio.Lock()
+        self._account_ttl: float = 0.0
+        
+        # 指標快取 {market_id: (K線鍵, IndicatorValues)}，最後一根K線未變時跳過重算
+        self._indicator_cache: dict[int, tuple[tuple, IndicatorValues]] = {}
+        
+        # 各市場上次處理的快速時間框架最後一根K線時間 {market_id: timestamp}
+        self._last_fast_ts: dict[int, datetime] = {}
+        
+        # 狀態報告請求 (事件循環與事件在 initialize() 中創建)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._report_event: Optional[asyncio.Event] = None
+        
+        # 停止事件 (在 initialize() 中創建)，設置後立即喚醒所有等待中的循環
+        self._stop_event: Optional[asyncio.Event] = None
+        
+        # Discord 通知隊列 (在 initialize() 中創建，由 _notification_worker 合併發送)
+        self._notif_queue: Optional[asyncio.Queue] = None
+        self._notification_task: Optional[asyncio.Task] = None
+        
+        # 預生成的交易 ID (UUID4 字串)
+        self._trade_id_pool: collections.deque[str] = collections.deque()
+        
+        # 當前週期開始時的 Unix 時間 (同一週期內各市場共用)
+        self._tick_now: float = 0.0
+        
+        # 每週期使用的固定配置
+        self._fast_tf_seconds: int = data_fetcher.TIMEFRAME_SECONDS[self.config.timeframe.fast_tf]
+        self._mr_max_holding_periods = self.config.mean_reversion.max_holding_periods
+        
         # 運行狀態
         self.is_running = False
         self.should_stop = False
@@ -90,18 +179,156 @@ class TradingBot:
         if hasattr(signal, 'SIGUSR1'):
             signal.signal(signal.SIGUSR1, self._handle_report_signal)
     
+    @staticmethod
+    def _pnl_percent(position: Position) -> float:
+        """持倉未實現盈虧百分比"""
+        if not position.entry_price:
+            return 0.0
+        return position.unrealized_pnl / position.entry_value * 100
+
+    def _open_positions(self) -> list[tuple[str, Position]]:
+        """內存中所有非零持倉 [(symbol, position)]"""
+        return [
+            (symbol, position)
+            for symbol, position in self.positions.items()
+            if position and position.size != 0
+        ]
+
+    def _signal_fields(self, symbol: str) -> dict:
+        """持倉對應的訊號資訊 (策略/止損/止盈)，無訊號時為空"""
+        sig = self.signals.get(symbol)
+        if not sig:
+            return {}
+        return {
+            "strategy": sig.strategy.value,
+            "sl": sig.stop_loss,
+            "tp": sig.take_profit
+        }
+
+    def _next_trade_id(self) -> str:
+        """取得交易 ID，池空時一次讀取隨機數批量生成，避免每筆平倉單獨讀取 urandom"""
+        if not self._trade_id_pool:
+            raw = os.urandom(16 * self.TRADE_ID_BATCH)
+            self._trade_id_pool.extend(
+                str(uuid.UUID(bytes=raw[i:i + 16], version=4))
+                for i in range(0, len(raw), 16)
+            )
+        return self._trade_id_pool.popleft()
+
+    def _market_status(self, symbol: str) -> str:
+        """市場監控狀態文字"""
+        sig = self.signals.get(symbol)
+        if sig:
+            return f"已開倉 ({sig.strategy.value})"
+        if self.positions.get(symbol):
+            return "持有倉位 (無信號)"
+        return "監控中"
+
+    def _save_state(self):
+        """保存各市場的持倉訊號與進場時間，供重啟後恢復"""
+        state = {}
+        for symbol, sig in self.signals.items():
+            entry_time = self.entry_times.get(symbol)
+            if not sig or not entry_time:
+                continue
+            state[symbol] = {
+                "signal": {
+                    **asdict(sig),
+                    "signal_type": sig.signal_type.value,
+                    "strategy": sig.strategy.value,
+                    "timestamp": sig.timestamp.isoformat()
+                },
+                "entry_time": entry_time.isoformat()
+            }
+        
+        try:
+            self.STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.STATE_PATH, 'w') as f:
+                json.dump(state, f, indent=2, ensure_ascii=False)
+        except Exception as e:
+            logger.warning(f"保存持倉狀態失敗: {e}")
+
+    def _clear_position_state(self, symbol: str, as_of: Optional[float] = None):
+        """
+        清除市場的持倉記錄 (倉位、訊號、進場時間)，並同步更新保存的狀態
+        
+        Args:
+            as_of: 判定無持倉的帳戶快照時間 (Unix 時間)；進場晚於此時間的記錄屬於快照之後的新倉位，不清除
+        """
+        entry_time = self.entry_times.get(symbol)
+        if as_of is not None and entry_time and entry_time.timestamp() >= as_of:
+            return
+        
+        had_state = self.signals.get(symbol) is not None or entry_time is not None
+        self.signals[symbol] = None
+        self.entry_times[symbol] = None
+        self.positions[symbol] = None
+        if had_state:
+            self._save_state()
+
+    def _load_state(self):
+        """恢復現有持倉的訊號與進場時間 (只恢復方向與當前持倉一致的記錄)"""
+        if not self.STATE_PATH.exists():
+            return
+        
+        try:
+            with open(self.STATE_PATH, 'r') as f:
+                state = json.load(f)
+        except Exception as e:
+            logger.warning(f"讀取持倉狀態失敗: {e}")
+            return
+        
+        for symbol, record in state.items():
+            position = self.positions.get(symbol)
+            if not position or position.size == 0:
+                continue
+            try:
+                data = record["signal"]
+                sig = Signal(
+                    **{
+                        **data,
+                        "signal_type": SignalType(data["signal_type"]),
+                        "strategy": StrategyType(data["strategy"]),
+                        "timestamp": datetime.fromisoformat(data["timestamp"])
+                    }
+                )
+                entry_time = datetime.fromisoformat(record["entry_time"])
+            except Exception as e:
+                logger.warning(f"[{symbol}] 持倉狀態記錄無效: {e}")
+                continue
+            
+            if (position.size > 0) != (sig.signal_type == SignalType.LONG):
+                logger.warning(f"[{symbol}] 保存的訊號方向與當前持倉不一致，忽略")
+                continue
+            
+            self.signals[symbol] = sig
+            self.entry_times[symbol] = entry_time
+            logger.info(f"[{symbol}] 已恢復持倉訊號: {sig.strategy.value} | SL: {sig.stop_loss:.2f} | TP: {sig.take_profit:.2f}")
+
     def _handle_report_signal(self, signum, frame):
-        """處理報告請求信號"""
+        """處理報告請求信號 (只設置事件，報告由 _report_worker 生成)"""
         logger.info("收到報告請求信號，正在生成當前交易報告...")
-        # 由於這是信號處理程序，最好異步調用或安排任務
-        # 這裡我們簡單地打印到控制台
-        self._print_current_status_report()
+        if self._loop is None:
+            # 事件循環尚未就緒，直接打印
+            self._print_current_status_report()
+            return
+        self._loop.call_soon_threadsafe(self._report_event.set)
+
+    async def _report_worker(self):
+        """等待報告請求，在線程中生成報告，避免在信號處理程序中阻塞事件循環"""
+        while not self.should_stop:
+            await self._report_event.wait()
+            self._report_event.clear()
+            try:
+                await asyncio.to_thread(self._print_current_status_report)
+            except Exception as e:
+                logger.error(f"生成狀態報告失敗: {e}")
 
     def _print_current_status_report(self):
         """打印當前狀態報告"""
-        print("\n" + "=" * 80)
+        print("\n" + self.REPORT_SEPARATOR)
         print(f"                    實時交易狀態報告 ({datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')} UTC)")
-        print("=" * 80)
+        print(self.REPORT_SEPARATOR)
         
         # 1. 帳戶概況
         print(f"\n【帳戶概況】")
@@ -117,33 +344,26 @@ class TradingBot:
             
         # 2. 持倉狀態
         print(f"\n【持倉狀態】")
-        has_positions = False
-        for symbol, position in self.positions.items():
-            if position and position.size != 0:
-                has_positions = True
-                pnl_percent = (position.unrealized_pnl / (position.entry_price * abs(position.size))) * 100 if position.entry_price else 0
-                print(f"  {symbol:<5} | 方向: {position.side:<5} | 數量: {position.size:.6f} | "
-                      f"入場: ${position.entry_price:.2f} | PnL: ${position.unrealized_pnl:.2f} ({pnl_percent:.2f}%)")
-                
-                # 如果有相關信號信息
-                if self.signals.get(symbol):
-                    sig = self.signals[symbol]
-                    print(f"        策略: {sig.strategy.value} | SL: ${sig.stop_loss:.2f} | TP: ${sig.take_profit:.2f}")
+        open_positions = self._open_positions()
+        for symbol, position in open_positions:
+            pnl_percent = self._pnl_percent(position)
+            print(f"  {symbol:<5} | 方向: {position.side:<5} | 數量: {position.size:.6f} | "
+                  f"入場: ${position.entry_price:.2f} | PnL: ${position.unrealized_pnl:.2f} ({pnl_percent:.2f}%)")
+            
+            # 如果有相關信號信息
+            if self.signals.get(symbol):
+                sig = self.signals[symbol]
+                print(f"        策略: {sig.strategy.value} | SL: ${sig.stop_loss:.2f} | TP: ${sig.take_profit:.2f}")
         
-        if not has_positions:
+        if not open_positions:
             print("  目前無持倉")
             
         # 3. 市場監控
         print(f"\n【監控市場】")
-        for symbol, market_id in self.market_configs:
-            status = "監控中"
-            if self.signals.get(symbol):
-                status = f"已開倉 ({self.signals[symbol].strategy.value})"
-            elif self.positions.get(symbol):
-                 status = "持有倉位 (無信號)"
-            print(f"  {symbol:<5} (ID: {market_id:<2}) | 狀態: {status}")
+        for symbol, _, prefix in self._market_report_prefixes:
+            print(prefix + self._market_status(symbol))
             
-        print("\n" + "=" * 80 + "\n")
+        print("\n" + self.REPORT_SEPARATOR + "\n")
         
     async def get_status_report_dict(self, fetch_realtime: bool = False):
         """
@@ -159,8 +379,8 @@ class TradingBot:
         if fetch_realtime:
             # 從 API 獲取實時數據
             try:
-                from exchange import lighter_client as lc_module
-                account_info = await lc_module.get_account_info()
+                snapshot = await self._get_account_cached()
+                account_info = snapshot.account
 
                 # 計算盈虧
                 initial_balance = self.risk_manager.initial_balance if self.risk_manager else account_info.balance
@@ -204,34 +424,21 @@ class TradingBot:
         if fetch_realtime:
             # 從 API 獲取實時持倉
             try:
-                from exchange import lighter_client as lc_module
+                snapshot = await self._get_account_cached()
                 for symbol, market_id in self.market_configs:
-                    position = await lc_module.get_position(market_id=market_id)
+                    position = snapshot.position_for(market_id)
                     if position and position.size != 0:
-                        side = "LONG" if position.size > 0 else "SHORT"
-                        pnl_percent = (position.unrealized_pnl / (position.entry_price * abs(position.size))) * 100 if position.entry_price else 0
-
-                        pos_info = {
+                        positions_data.append({
                             "symbol": symbol,
-                            "side": side,
+                            "side": position.side,
                             "size": abs(position.size),
                             "entry_price": position.entry_price,
                             "pnl": position.unrealized_pnl,
-                            "pnl_percent": pnl_percent,
+                            "pnl_percent": self._pnl_percent(position),
                             "liquidation_price": position.liquidation_price,
-                            "leverage": position.leverage
-                        }
-
-                        # 如果有相關信號信息
-                        if self.signals.get(symbol):
-                            sig = self.signals[symbol]
-                            pos_info.update({
-                                "strategy": sig.strategy.value,
-                                "sl": sig.stop_loss,
-                                "tp": sig.take_profit
-                            })
-
-                        positions_data.append(pos_info)
+                            "leverage": position.leverage,
+                            **self._signal_fields(symbol)
+                        })
             except Exception as e:
                 logger.error(f"獲取實時持倉數據失敗: {e}")
                 # 降級到內存數據
@@ -239,44 +446,28 @@ class TradingBot:
 
         if not fetch_realtime:
             # 使用內存數據
-            for symbol, position in self.positions.items():
-                if position and position.size != 0:
-                    pnl_percent = (position.unrealized_pnl / (position.entry_price * abs(position.size))) * 100 if position.entry_price else 0
-
-                    pos_info = {
-                        "symbol": symbol,
-                        "side": position.side,
-                        "size": abs(position.size),
-                        "entry_price": position.entry_price,
-                        "pnl": position.unrealized_pnl,
-                        "pnl_percent": pnl_percent
-                    }
-
-                    # 如果有相關信號信息
-                    if self.signals.get(symbol):
-                        sig = self.signals[symbol]
-                        pos_info.update({
-                            "strategy": sig.strategy.value,
-                            "sl": sig.stop_loss,
-                            "tp": sig.take_profit
-                        })
-
-                    positions_data.append(pos_info)
+            positions_data.extend(
+                {
+                    "symbol": symbol,
+                    "side": position.side,
+                    "size": abs(position.size),
+                    "entry_price": position.entry_price,
+                    "pnl": position.unrealized_pnl,
+                    "pnl_percent": self._pnl_percent(position),
+                    **self._signal_fields(symbol)
+                }
+                for symbol, position in self._open_positions()
+            )
 
         # 3. 市場監控
-        markets_data = []
-        for symbol, market_id in self.market_configs:
-            status = "監控中"
-            if self.signals.get(symbol):
-                status = f"已開倉 ({self.signals[symbol].strategy.value})"
-            elif self.positions.get(symbol):
-                 status = "持有倉位 (無信號)"
-
-            markets_data.append({
+        markets_data = [
+            {
                 "symbol": symbol,
                 "id": market_id,
-                "status": status
-            })
+                "status": self._market_status(symbol)
+            }
+            for symbol, market_id in self.market_configs
+        ]
 
         return {
             "timestamp": datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC'),
@@ -287,21 +478,128 @@ class TradingBot:
         }
         
     async def _send_discord_notification(self, message: str):
-        """發送 Discord 通知（安全版本，不會拋出異常）"""
+        """將 Discord 通知放入隊列（不會拋出異常，也不等待發送完成）"""
+        if self._notif_queue is not None:
+            self._notif_queue.put_nowait(message)
+
+    def _pack_notifications(self, messages: list[str]) -> list[str]:
+        """將多則通知合併為不超過長度上限的訊息 (單則超長的訊息原樣保留)"""
+        packed = []
+        current = ""
+        for message in messages:
+            if current and len(current) + 2 + len(message) > self.NOTIFICATION_MAX_LENGTH:
+                packed.append(current)
+                current = message
+            else:
+                current = f"{current}\n\n{message}" if current else message
+        if current:
+            packed.append(current)
+        return packed
+
+    async def _notification_worker(self):
+        """合併短時間內的多則通知後一次發送，避免突發事件時逐則等待 Discord 請求"""
         try:
             from discord.bot import send_notification
-            await send_notification(message)
         except ImportError:
-            # Discord 模組未安裝或未配置
-            pass
-        except Exception as e:
-            logger.error(f"發送 Discord 通知失敗: {e}")
+            # Discord 模組未安裝或未配置，停止排隊
+            self._notif_queue = None
+            return
+        
+        queue = self._notif_queue
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            # None 為停止標記 (見 _stop_notification_worker)
+            message = await queue.get()
+            stopping = message is None
+            messages = [] if stopping else [message]
+            deadline = loop.time() + self.NOTIFICATION_BATCH_WINDOW
+            while not stopping and (timeout := deadline - loop.time()) > 0:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if message is None:
+                    stopping = True
+                else:
+                    messages.append(message)
+            
+            if stopping:
+                # 停止前取出隊列中剩餘的通知，之後的通知不再排隊
+                self._notif_queue = None
+                while not queue.empty():
+                    message = queue.get_nowait()
+                    if message is not None:
+                        messages.append(message)
+            
+            for message in self._pack_notifications(messages):
+                try:
+                    await send_notification(message)
+                except Exception as e:
+                    logger.error(f"發送 Discord 通知失敗: {e}")
+    
+    async def _stop_notification_worker(self):
+        """停止通知任務：發送停止標記，等待剩餘通知發送完畢 (有超時) 後再取消"""
+        task = self._notification_task
+        if task is None:
+            return
+        if self._notif_queue is not None and not task.done():
+            self._notif_queue.put_nowait(None)
+            try:
+                await asyncio.wait_for(task, timeout=self.NOTIFICATION_DRAIN_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.warning(f"發送剩餘 Discord 通知超時 ({self.NOTIFICATION_DRAIN_TIMEOUT:.0f}s)，部分通知未發送")
+            except Exception as e:
+                logger.error(f"發送剩餘 Discord 通知失敗: {e}")
+        task.cancel()
+        self._notification_task = None
     
     def _handle_shutdown(self, signum, frame):
         """處理關閉信號"""
         logger.info("收到關閉信號，準備停止...")
+        if self._loop is None:
+            self.should_stop = True
+            return
+        self._loop.call_soon_threadsafe(self._request_stop)
+
+    def _request_stop(self):
+        """標記停止並喚醒等待中的循環 (進行中的交易週期會執行完畢)"""
         self.should_stop = True
+        if self._stop_event is not None:
+            self._stop_event.set()
+
+    async def _sleep_until_stop(self, seconds: float):
+        """等待指定秒數，收到停止請求時提前返回"""
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
     
+    async def _refresh_account_snapshot(self) -> _AccountSnapshot:
+        """從 API 獲取帳戶資訊並更新快照"""
+        account = await lighter_client.get_account_info()
+        self._account_snapshot = _AccountSnapshot(account, time.monotonic())
+        return self._account_snapshot
+
+    async def _get_account_cached(self) -> _AccountSnapshot:
+        """
+        獲取帳戶快照 (TTL 內共用，避免每個市場重複請求)
+
+        使用雙重檢查鎖，並發調用時只會發出一次請求
+        """
+        snapshot = self._account_snapshot
+        if snapshot and time.monotonic() - snapshot.fetched_at < self._account_ttl:
+            return snapshot
+        async with self._account_lock:
+            snapshot = self._account_snapshot
+            if snapshot and time.monotonic() - snapshot.fetched_at < self._account_ttl:
+                return snapshot
+            return await self._refresh_account_snapshot()
+
+    def _invalidate_account_snapshot(self):
+        """下單/平倉後使快照失效，下次讀取時重新獲取"""
+        self._account_snapshot = None
+
     async def initialize(self):
         """初始化機器人"""
         logger.info("=" * 50)
@@ -309,27 +607,39 @@ class TradingBot:
         logger.info("=" * 50)
         
         # 顯示配置
-        market_symbols = ", ".join([f"{s}({id})" for s, id in self.market_configs])
-        logger.info(f"交易市場: {market_symbols}")
+        logger.info(f"交易市場: {self._market_symbols_text}")
         logger.info(f"時間框架: {self.config.timeframe.fast_tf} / {self.config.timeframe.slow_tf}")
         logger.info(f"模擬模式: {self.config.dry_run}")
         
+        # 報告請求事件 (需在事件循環內創建)
+        self._loop = asyncio.get_running_loop()
+        self._report_event = asyncio.Event()
+        self._notif_queue = asyncio.Queue()
+        self._stop_event = asyncio.Event()
+        if self.should_stop:
+            self._stop_event.set()
+        
         # 初始化交易所客戶端
         await lighter_client.initialize()
         await data_fetcher.initialize()
 
-        # 预加载每个市场的历史数据
+        # 并行预加载每个市场的历史数据
         logger.info("开始预加载历史数据...")
-        for symbol, market_id in self.market_configs:
-            logger.info(f"[{symbol}] 预加载市场数据 (ID: {market_id})...")
-            success = await data_fetcher.preload_data(market_id=market_id, min_candles=500)
+        preload_results = await asyncio.gather(
+            *(
+                data_fetcher.preload_data(market_id=market_id, min_candles=500)
+                for _, market_id in self.market_configs
+            )
+        )
+        for (symbol, _), success in zip(self.market_configs, preload_results):
             if success:
                 logger.info(f"[{symbol}] 预加载完成")
             else:
                 logger.warning(f"[{symbol}] 预加载失败，将使用正常API获取数据")
         
-        # 取得帳戶資訊
-        account = await lighter_client.get_account_info()
+        # 取得帳戶資訊 (同時包含所有市場的持倉)
+        snapshot = await self._refresh_account_snapshot()
+        account = snapshot.account
         logger.info(f"帳戶餘額: ${account.balance:.2f}")
         
         # 初始化風險管理器
@@ -337,10 +647,13 @@ class TradingBot:
         
         # 檢查每個市場的現有持倉
         for symbol, market_id in self.market_configs:
-            position = await lighter_client.get_position(market_id=market_id)
+            position = snapshot.position_for(market_id)
             if position and position.size != 0:
                 logger.warning(f"[{symbol}] 檢測到現有持倉: {position.size:.6f}")
                 self.positions[symbol] = position
+        
+        # 恢復現有持倉的訊號記錄 (避免重啟後退化為基本止損)
+        self._load_state()
 
         # 為每個市場初始化槓桿
         base_leverage = self.config.leverage.base_leverage
@@ -415,7 +728,8 @@ class TradingBot:
         self.is_running = True
         
         # 計算循環間隔 (快速時間框架的秒數)
-        interval_seconds = data_fetcher.TIMEFRAME_SECONDS[self.config.timeframe.fast_tf]
+        interval_seconds = self._fast_tf_seconds
+        self._account_ttl = interval_seconds / 2
         
         logger.info(f"開始多市場交易循環，間隔: {interval_seconds} 秒")
         logger.info(f"並行交易市場: {len(self.market_configs)} 個")
@@ -432,13 +746,16 @@ class TradingBot:
         )
         tasks.append(sync_task)
 
-        # 2. 為每個市場創建交易任務
-        for symbol, market_id in self.market_configs:
-            task = asyncio.create_task(
-                self._market_trading_loop(symbol, market_id, interval_seconds),
-                name=f"Trading-{symbol}"
-            )
-            tasks.append(task)
+        # 2. 所有市場共用的交易任務 (每個週期統一獲取數據後並行處理)
+        trading_task = asyncio.create_task(
+            self._trading_loop(interval_seconds),
+            name="Trading"
+        )
+        tasks.append(trading_task)
+
+        # 狀態報告與通知任務 (不參與 gather；報告任務停止時取消，通知任務在 shutdown() 中送完剩餘通知後停止)
+        report_task = asyncio.create_task(self._report_worker(), name="StatusReport")
+        self._notification_task = asyncio.create_task(self._notification_worker(), name="Notification")
 
         # 並行運行所有任務
         try:
@@ -450,23 +767,50 @@ class TradingBot:
                     logger.error(f"任務 {task_name} 發生錯誤: {result}")
         except Exception as e:
             logger.error(f"交易系統錯誤: {e}")
+        finally:
+            report_task.cancel()
         
         await self.shutdown()
     
-    async def _market_trading_loop(self, symbol: str, market_id: int, interval_seconds: int):
-        """單一市場的交易循環"""
-        logger.info(f"[{symbol}] 開始交易循環")
+    async def _trading_loop(self, interval_seconds: int):
+        """
+        多市場交易循環
+
+        每個週期批量獲取所有市場的 K 線與帳戶快照，再並行執行各市場的交易邏輯，
+        並按實際耗時補足等待時間，避免各市場各自休眠造成的漂移
+        """
+        logger.info("開始交易循環")
+        loop = asyncio.get_running_loop()
+        market_ids = [market_id for _, market_id in self.market_configs]
+        semaphore = asyncio.Semaphore(self.CYCLE_CONCURRENCY)
+
+        async def run_cycle(symbol: str, market_id: int, snapshot: _AccountSnapshot, data):
+            async with semaphore:
+                try:
+                    await self._trading_cycle_for_market(symbol, market_id, snapshot, data)
+                except Exception as e:
+                    # 單一市場的錯誤不影響其他市場
+                    logger.error(f"[{symbol}] 交易循環錯誤: {e}")
 
         while not self.should_stop:
+            started = loop.time()
+            self._tick_now = time.time()
             try:
-                await self._trading_cycle_for_market(symbol, market_id)
+                market_data, snapshot = await asyncio.gather(
+                    data_fetcher.get_dual_timeframe_batch(market_ids),
+                    self._refresh_account_snapshot()
+                )
+            except Exception as e:
+                logger.error(f"交易循環錯誤: {e}")
+                await self._sleep_until_stop(10)  # 錯誤後等待 10 秒
+                continue
 
-                # 等待下一個週期
-                await asyncio.sleep(interval_seconds)
+            async with asyncio.TaskGroup() as tg:
+                for symbol, market_id in self.market_configs:
+                    tg.create_task(run_cycle(symbol, market_id, snapshot, market_data[market_id]))
 
-            except Exception as e:
-                logger.error(f"[{symbol}] 交易循環錯誤: {e}")
-                await asyncio.sleep(10)  # 錯誤後等待 10 秒
+            # 等待下一個週期 (扣除本週期耗時)
+            await self._sleep_until_stop(max(0.0, interval_seconds - (loop.time() - started)))
 
     async def _account_sync_loop(self, interval_seconds: int):
         """
@@ -477,8 +821,12 @@ class TradingBot:
 
         while not self.should_stop:
             try:
-                # 獲取實時帳戶數據
-                account_info = await lighter_client.get_account_info()
+                # 獲取實時帳戶數據 (包含所有市場的持倉)
+                # 交易週期剛刷新過的快照視為本次同步，不重複請求
+                snapshot = self._account_snapshot
+                if not snapshot or time.monotonic() - snapshot.fetched_at >= interval_seconds:
+                    snapshot = await self._refresh_account_snapshot()
+                account_info = snapshot.account
 
                 # 更新風險管理器的餘額
                 if self.risk_manager:
@@ -495,8 +843,8 @@ class TradingBot:
 
                 # 同步各市場的持倉數據
                 for symbol, market_id in self.market_configs:
-                    # 從 API 獲取實時持倉
-                    api_position = await lighter_client.get_position(market_id=market_id)
+                    # 從帳戶快照取得實時持倉
+                    api_position = snapshot.position_for(market_id)
 
                     # 更新內存中的持倉
                     if api_position and api_position.size != 0:
@@ -506,48 +854,71 @@ class TradingBot:
 
                         self.positions[symbol] = api_position
                     else:
-                        # API 無持倉，清空內存記錄
+                        # API 無持倉 (外部平倉、強平或止損/止盈成交)，清空內存記錄與保存的狀態
                         if self.positions.get(symbol) and self.positions[symbol].size != 0:
                             logger.warning(f"[{symbol}] API 無持倉但內存中有記錄，已清除")
-                            self.positions[symbol] = None
+                        self._clear_position_state(symbol, as_of=snapshot.fetched_at_wall)
 
                 # 等待下一個同步週期
-                await asyncio.sleep(interval_seconds)
+                await self._sleep_until_stop(interval_seconds)
 
             except Exception as e:
                 logger.error(f"帳戶同步錯誤: {e}")
                 # 錯誤後等待較短時間重試
-                await asyncio.sleep(min(10, interval_seconds))
+                await self._sleep_until_stop(min(10, interval_seconds))
 
-    async def _trading_cycle_for_market(self, symbol: str, market_id: int):
-        """單一市場的交易循環"""
+    async def _trading_cycle_for_market(
+        self,
+        symbol: str,
+        market_id: int,
+        snapshot: _AccountSnapshot,
+        market_data: tuple | Exception
+    ):
+        """
+        單一市場的交易循環
+
+        Args:
+            snapshot: 本週期共用的帳戶快照
+            market_data: 本週期批量獲取的 (fast_df, slow_df)，獲取失敗時為異常
+        """
+        
+        risk_manager = self.risk_manager
         
         # 1. 檢查是否可以交易
-        can_trade, reason = self.risk_manager.can_trade()
+        can_trade, reason = risk_manager.can_trade()
         if not can_trade:
             logger.debug(f"[{symbol}] 無法交易: {reason}")
             return
         
         # 2. 檢查緊急停止
-        should_stop, stop_reason = self.risk_manager.should_emergency_stop()
+        should_stop, stop_reason = risk_manager.should_emergency_stop()
         if should_stop:
             logger.error(f"[{symbol}] 緊急停止: {stop_reason}")
             await self._emergency_close_market(symbol, market_id)
             return
         
-        # 3. 獲取市場數據
-        try:
-            fast_df, slow_df = await data_fetcher.get_dual_timeframe_data(market_id=market_id)
-        except Exception as e:
-            logger.error(f"[{symbol}] 獲取數據失敗: {e}")
+        # 3. 取得本週期的市場數據
+        if isinstance(market_data, Exception):
+            logger.error(f"[{symbol}] 獲取數據失敗: {market_data}")
             return
+        fast_df, slow_df = market_data
         
         if len(fast_df) < self.config.timeframe.candle_count * 0.5:
             logger.debug(f"[{symbol}] 數據不足，跳過本次循環")
             return
         
-        # 4. 計算指標
-        indicator_values = indicators.calculate_all(fast_df, slow_df)
+        # 3.5 無持倉且沒有新K線時跳過 (有持倉時仍需檢查出場條件)
+        position = snapshot.position_for(market_id)
+        has_position = bool(position and position.size != 0)
+        last_fast_ts = fast_df['timestamp'].iloc[-1]
+        if self._last_fast_ts.get(market_id) == last_fast_ts:
+            if not has_position:
+                logger.debug(f"[{symbol}] 無新K線，跳過本次循環")
+                return
+        self._last_fast_ts[market_id] = last_fast_ts
+        
+        # 4. 計算指標 (最後一根K線未變化時沿用上次結果)
+        indicator_values = self._calculate_indicators_cached(market_id, fast_df, slow_df)
         
         # 4.1 更新 Discord Bot 的指標數據 (用於價格通知)
         try:
@@ -575,55 +946,48 @@ class TradingBot:
         except Exception as e:
             logger.debug(f"[{symbol}] 訊號準備度更新失敗: {e}")
         
-        # 6. 檢查現有持倉
-        self.positions[symbol] = await lighter_client.get_position(market_id=market_id)
-        has_position = self.positions[symbol] and self.positions[symbol].size != 0
-        
-        # 7. 如果有持倉，檢查出場條件
-        if has_position and self.signals[symbol]:
-            should_exit, exit_reason = await self._check_exit_for_market(
-                symbol, indicator_values
-            )
-            if should_exit:
+        # 6. 記錄現有持倉 (使用本週期共用的帳戶快照)
+        if not has_position:
+            # 倉位已在外部關閉時一併清除訊號與進場時間
+            self._clear_position_state(symbol, as_of=snapshot.fetched_at_wall)
+        self.positions[symbol] = position
+        sig = self.signals[symbol]
+        
+        # 7. 如果有持倉，一次性檢查所有出場條件 (策略出場 / 時間止損 / 重啟後基本止損)
+        if has_position:
+            exit_reason = self._evaluate_exit_for_market(symbol, position, sig, indicator_values)
+            if exit_reason:
                 await self._close_position_for_market(symbol, market_id, exit_reason)
                 return
-            
-            # 檢查時間止損 (Mean Reversion)
-            if self.signals[symbol].strategy == StrategyType.MEAN_REVERSION:
-                if self.entry_times[symbol]:
-                    holding_periods = (datetime.now(timezone.utc) - self.entry_times[symbol]).total_seconds()
-                    holding_periods /= data_fetcher.TIMEFRAME_SECONDS[self.config.timeframe.fast_tf]
-                    
-                    if holding_periods > self.config.mean_reversion.max_holding_periods:
-                        await self._close_position_for_market(symbol, market_id, "時間止損")
-                        return
-        
-        # 7.5 如果有持倉但沒有訊號記錄（可能是重啟後），記錄警告並使用基本止損檢查
-        elif has_position and not self.signals[symbol]:
-            logger.warning(f"[{symbol}] 檢測到持倉但無訊號記錄（可能是重啟後），使用基本止損邏輯")
-            
-            # 基本止損檢查：如果虧損超過 5%，平倉
-            if self.positions[symbol].unrealized_pnl < 0:
-                entry_value = abs(self.positions[symbol].size) * self.positions[symbol].entry_price
-                loss_percent = abs(self.positions[symbol].unrealized_pnl) / entry_value if entry_value > 0 else 0
-                
-                if loss_percent > 0.05:  # 虧損超過 5%
-                    await self._close_position_for_market(
-                        symbol, market_id, f"重啟後止損 (虧損 {loss_percent*100:.2f}%)"
-                    )
-                    return
         
         # 8. 如果沒有持倉，檢查進場條件
         if not has_position:
-            signal = await self._check_entry(indicator_values, market_state)
-            if signal:
-                await self._open_position_for_market(symbol, market_id, signal, indicator_values)
+            entry_signal = await self._check_entry(indicator_values, market_state)
+            if entry_signal:
+                await self._open_position_for_market(symbol, market_id, entry_signal, indicator_values)
         
         # 9. 更新績效追蹤
-        account = await lighter_client.get_account_info()
-        self.risk_manager.update_balance(account.balance)
+        account = (await self._get_account_cached()).account
+        risk_manager.update_balance(account.balance)
         metrics_tracker.update_equity(account.balance)
     
+    @staticmethod
+    def _last_bar_key(df) -> tuple:
+        """最後一根K線的 (時間, 最高, 最低, 收盤)，未收盤K線的價格變化也會改變此鍵"""
+        last = df.iloc[-1]
+        return (last['timestamp'], last['high'], last['low'], last['close'])
+
+    def _calculate_indicators_cached(self, market_id: int, fast_df, slow_df) -> IndicatorValues:
+        """計算指標，快速/慢速時間框架的最後一根K線都未變化時直接返回快取"""
+        key = (self._last_bar_key(fast_df), self._last_bar_key(slow_df))
+        cached = self._indicator_cache.get(market_id)
+        if cached and cached[0] == key:
+            return cached[1]
+        
+        indicator_values = indicators.calculate_all(fast_df, slow_df)
+        self._indicator_cache[market_id] = (key, indicator_values)
+        return indicator_values
+    
     async def _check_entry(
         self,
         indicators: IndicatorValues,
@@ -668,7 +1032,7 @@ class TradingBot:
         
         entry_price = self.current_position.entry_price
         current_pnl = self.current_position.unrealized_pnl
-        current_pnl_percent = current_pnl / (entry_price * abs(self.current_position.size))
+        current_pnl_percent = current_pnl / self.current_position.entry_value
         
         if self.current_signal.strategy == StrategyType.MOMENTUM:
             return momentum_strategy.check_exit(
@@ -685,33 +1049,52 @@ class TradingBot:
                 current_pnl_percent
             )
     
-    async def _check_exit_for_market(
+    def _evaluate_exit_for_market(
         self,
         symbol: str,
+        position: Position,
+        sig: Optional[Signal],
         indicators: IndicatorValues
-    ) -> tuple[bool, str]:
-        """檢查單一市場的出場條件"""
-        if not self.signals[symbol] or not self.positions[symbol]:
-            return False, ""
-        
-        entry_price = self.positions[symbol].entry_price
-        current_pnl = self.positions[symbol].unrealized_pnl
-        current_pnl_percent = current_pnl / (entry_price * abs(self.positions[symbol].size))
+    ) -> Optional[str]:
+        """
+        檢查單一市場持倉的所有出場條件
+
+        Returns:
+            需要平倉時返回平倉原因，否則返回 None
+        """
+        entry_value = position.entry_value
         
-        if self.signals[symbol].strategy == StrategyType.MOMENTUM:
-            return momentum_strategy.check_exit(
-                indicators,
-                entry_price,
-                self.signals[symbol],
-                current_pnl_percent
+        # 有持倉但沒有訊號記錄（可能是重啟後），使用基本止損檢查
+        if not sig:
+            logger.warning(f"[{symbol}] 檢測到持倉但無訊號記錄（可能是重啟後），使用基本止損邏輯")
+            if position.unrealized_pnl < 0 and entry_value > 0:
+                loss_percent = -position.unrealized_pnl / entry_value
+                if loss_percent > self.RESTART_STOP_LOSS:
+                    return f"重啟後止損 (虧損 {loss_percent*100:.2f}%)"
+            return None
+        
+        # 策略出場條件
+        current_pnl_percent = position.unrealized_pnl / entry_value
+        if sig.strategy == StrategyType.MOMENTUM:
+            should_exit, exit_reason = momentum_strategy.check_exit(
+                indicators, position.entry_price, sig, current_pnl_percent
             )
         else:
-            return mean_reversion_strategy.check_exit(
-                indicators,
-                entry_price,
-                self.signals[symbol],
-                current_pnl_percent
+            should_exit, exit_reason = mean_reversion_strategy.check_exit(
+                indicators, position.entry_price, sig, current_pnl_percent
             )
+        if should_exit:
+            return exit_reason
+        
+        # 時間止損 (Mean Reversion)
+        if sig.strategy == StrategyType.MEAN_REVERSION:
+            entry_time = self.entry_times[symbol]
+            if entry_time:
+                holding_periods = (self._tick_now - entry_time.timestamp()) / self._fast_tf_seconds
+                if holding_periods > self._mr_max_holding_periods:
+                    return "時間止損"
+        
+        return None
     
     async def _open_position_for_market(
         self,
@@ -729,7 +1112,7 @@ class TradingBot:
             return
         
         # 計算倉位大小
-        account = await lighter_client.get_account_info()
+        account = (await self._get_account_cached()).account
         position_size = position_manager.calculate_position_size(
             balance=account.available_balance,
             leverage=leverage,
@@ -766,10 +1149,12 @@ class TradingBot:
             market_id=market_id,
             current_price=signal.entry_price
         )
+        self._invalidate_account_snapshot()
         
         if result.success:
             self.signals[symbol] = signal
             self.entry_times[symbol] = datetime.now(timezone.utc)
+            self._save_state()
             
             # 設置止損止盈單
             await self._set_sl_tp_orders_for_market(symbol, market_id, signal, position_size.base_amount)
@@ -840,6 +1225,7 @@ class TradingBot:
         
         # 市價平倉
         result = await lighter_client.close_position(market_id=market_id)
+        self._invalidate_account_snapshot()
         
         if result.success:
             # 計算盈虧
@@ -850,7 +1236,7 @@ class TradingBot:
             # 記錄交易
             if self.signals[symbol] and self.entry_times[symbol]:
                 metrics_tracker.record_trade(
-                    trade_id=str(uuid.uuid4()),
+                    trade_id=self._next_trade_id(),
                     strategy=self.signals[symbol].strategy,
                     side=self.signals[symbol].signal_type.value,
                     entry_price=entry_price,
@@ -884,13 +1270,13 @@ class TradingBot:
                 leverage=metrics.current_leverage,
                 win_rate=metrics.win_rate,
                 drawdown=metrics.current_drawdown,
-                daily_pnl=f"{metrics.daily_pnl*100:.2f}%"
+                daily_pnl=metrics.daily_pnl
             )
             
             # 發送 Discord 通知
             position = self.positions[symbol]
             pnl_emoji = "🟢" if pnl >= 0 else "🔴"
-            pnl_percent = (pnl / (entry_price * abs(position.size))) * 100 if entry_price else 0
+            pnl_percent = (pnl / position.entry_value) * 100 if entry_price else 0
             
             msg = (
                 f"🔴 **平倉通知** - {symbol}\n"
@@ -901,18 +1287,29 @@ class TradingBot:
             await self._send_discord_notification(msg)
             
             # 重置狀態
-            self.signals[symbol] = None
-            self.entry_times[symbol] = None
-            self.positions[symbol] = None
+            self._clear_position_state(symbol)
         else:
             logger.error(f"[{symbol}] 平倉失敗: {result.message}")
     
+    @staticmethod
+    def _log_emergency_errors(symbol: str, results: list):
+        """記錄緊急撤單/平倉的異常 (緊急流程中不再拋出)"""
+        for action, result in zip(("撤單", "平倉"), results):
+            if isinstance(result, Exception):
+                logger.error(f"[{symbol}] 緊急{action}失敗: {result}")
+    
     async def _emergency_close_market(self, symbol: str, market_id: int):
         """緊急平倉指定市場"""
         logger.error(f"[{symbol}] 執行緊急平倉!")
         
-        await lighter_client.cancel_all_orders(market_id=market_id)
-        await lighter_client.close_position(market_id=market_id)
+        # 撤單與市價平倉同時發出，不等待撤單完成
+        results = await asyncio.gather(
+            lighter_client.cancel_all_orders(market_id=market_id),
+            lighter_client.close_position(market_id=market_id),
+            return_exceptions=True
+        )
+        self._log_emergency_errors(symbol, results)
+        self._invalidate_account_snapshot()
 
     
     async def _open_position(
@@ -1042,7 +1439,7 @@ class TradingBot:
             # 記錄交易
             if self.current_signal and self.entry_time:
                 metrics_tracker.record_trade(
-                    trade_id=str(uuid.uuid4()),
+                    trade_id=self._next_trade_id(),
                     strategy=self.current_signal.strategy,
                     side=self.current_signal.signal_type.value,
                     entry_price=entry_price,
@@ -1081,7 +1478,7 @@ class TradingBot:
                 leverage=metrics.current_leverage,
                 win_rate=metrics.win_rate,
                 drawdown=metrics.current_drawdown,
-                daily_pnl=f"{metrics.daily_pnl*100:.2f}%"
+                daily_pnl=metrics.daily_pnl
             )
         else:
             logger.error(f"平倉失敗: {result.message}")
@@ -1090,35 +1487,52 @@ class TradingBot:
         """緊急平倉"""
         logger.error("執行緊急平倉!")
         
-        await lighter_client.cancel_all_orders()
-        await lighter_client.close_position()
+        results = await asyncio.gather(
+            lighter_client.cancel_all_orders(),
+            lighter_client.close_position(),
+            return_exceptions=True
+        )
+        self._log_emergency_errors(self.config.trading.market_symbol, results)
         
-        self.should_stop = True
+        self._request_stop()
     
     async def shutdown(self):
         """關閉機器人"""
         logger.info("正在關閉機器人...")
         
         # 檢查所有市場的持倉
-        has_open_positions = False
-        for symbol in self.positions.keys():
-            if self.positions[symbol] and self.positions[symbol].size != 0:
-                has_open_positions = True
-                logger.warning(f"警告: [{symbol}] 仍有未平倉位!")
-                logger.warning(f"[{symbol}] 持倉: {self.positions[symbol].size:.6f}")
-        
-        if not has_open_positions:
+        open_positions = self._open_positions()
+        for symbol, position in open_positions:
+            logger.warning(f"警告: [{symbol}] 仍有未平倉位!")
+            logger.warning(f"[{symbol}] 持倉: {position.size:.6f}")
+        
+        if not open_positions:
             logger.info("無未平倉位")
         
-        # 關閉連接
-        await lighter_client.close()
-        await data_fetcher.close()
+        # 並行關閉連接 (各自設超時，對端不回應時不會卡住關閉流程)
+        results = await asyncio.gather(
+            asyncio.wait_for(lighter_client.close(), timeout=self.SHUTDOWN_TIMEOUT),
+            asyncio.wait_for(data_fetcher.close(), timeout=self.SHUTDOWN_TIMEOUT),
+            return_exceptions=True
+        )
+        for name, result in zip(("交易所客戶端", "數據獲取器"), results):
+            if isinstance(result, asyncio.TimeoutError):
+                logger.warning(f"關閉{name}超時 ({self.SHUTDOWN_TIMEOUT:.0f}s)，跳過")
+            elif isinstance(result, Exception):
+                logger.error(f"關閉{name}失敗: {result}")
+        
+        # 顯示績效摘要 (在線程中計算，經日誌隊列輸出)
+        summary = await asyncio.to_thread(metrics_tracker.get_summary)
+        logger.info("{}", summary)
         
-        # 顯示績效摘要
-        print(metrics_tracker.get_summary())
+        # 送出最後一個週期與關閉過程中排隊的通知
+        await self._stop_notification_worker()
         
         logger.info("機器人已關閉")
         self.is_running = False
+        
+        # 等待隊列中的日誌寫出
+        await logger.complete()
 
 
 async def main():
@@ -1128,4 +1542,17 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # 優先使用 uvloop 事件循環 (不支持 Windows；未安裝時回退到標準 asyncio)
+    try:
+        import uvloop
+    except ImportError:
+        uvloop = None
+    
+    try:
+        if uvloop is not None:
+            uvloop.run(main())
+        else:
+            asyncio.run(main())
+    except KeyboardInterrupt:
+        # 信號處理程序安裝前 (啟動階段) 的中斷
+        pass
@@ -0,0 +1,29 @@
+"""
+lighter_client 導入冒煙測試
+模塊導入時綁定的 SDK 常數必須兼容 requirements.txt 固定的 lighter-sdk 版本
+"""
+import importlib
+
+import pytest
+
+pytest.importorskip("lighter")
+pytest.importorskip("aiohttp")
+pytest.importorskip("websockets")
+
+from lighter.signer_client import SignerClient  # noqa: E402
+
+
+def test_module_imports_against_pinned_sdk():
+    module = importlib.import_module("lighter_client")
+    assert module.LighterClient is not None
+
+
+@pytest.mark.parametrize("name, attr, protocol_value", [
+    ("_TX_CREATE_ORDER", "TX_TYPE_CREATE_ORDER", 14),
+    ("_TX_CANCEL_ORDER", "TX_TYPE_CANCEL_ORDER", 15),
+    ("_TX_CANCEL_ALL_ORDERS", "TX_TYPE_CANCEL_ALL_ORDERS", 16),
+    ("_IOC_EXPIRY", "DEFAULT_IOC_EXPIRY", 0),
+])
+def test_tx_constants_match_sdk_or_protocol(name, attr, protocol_value):
+    module = importlib.import_module("lighter_client")
+    assert getattr(module, name) == getattr(SignerClient, attr, protocol_value)
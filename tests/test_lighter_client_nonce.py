@@ -0,0 +1,112 @@
+"""
+LighterClient nonce 分配測試
+交易簽名或發送失敗後，下一個分配的 nonce 應重新對齊鏈上 nonce
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("lighter")
+pytest.importorskip("aiohttp")
+pytest.importorskip("websockets")
+
+from lighter_client import LighterClient  # noqa: E402
+
+
+class _OptimisticNonceManager:
+    """模擬 SDK 的樂觀 nonce 管理器：本地遞增，失敗時 acknowledge_failure 回退一個"""
+
+    def __init__(self, chain_nonce: int, api_key_index: int = 0):
+        self.chain_nonce = chain_nonce
+        self.api_key_index = api_key_index
+        self.nonce = {api_key_index: chain_nonce - 1}
+
+    def next_nonce(self):
+        self.nonce[self.api_key_index] += 1
+        return self.api_key_index, self.nonce[self.api_key_index]
+
+    def acknowledge_failure(self, api_key_index: int):
+        self.nonce[api_key_index] -= 1
+
+
+class _RefreshableNonceManager(_OptimisticNonceManager):
+    """支持 hard_refresh_nonce 的 nonce 管理器，刷新時讀取鏈上 nonce"""
+
+    def hard_refresh_nonce(self, api_key: int):
+        self.nonce[api_key] = self.chain_nonce - 1
+
+
+def _make_client(nonce_manager) -> LighterClient:
+    """建立只含 nonce 分配與 WebSocket 發送所需狀態的客戶端"""
+    client = LighterClient.__new__(LighterClient)
+    client.api_key_index = nonce_manager.api_key_index
+    client._sdk_nonce_manager = nonce_manager
+    client._sdk_nonce_stale = False
+    client._next_nonce = None
+    client._nonce_lock = asyncio.Lock()
+    client._last_ws_error_time = 0
+
+    async def _broken_connection(*args, **kwargs):
+        raise ConnectionError("websocket connection closed")
+
+    async def _noop_close():
+        return None
+
+    client._ensure_websocket_connection = _broken_connection
+    client._close_websocket_connection = _noop_close
+    client._ensure_initialized = lambda: None
+    client._sign_executor = ThreadPoolExecutor(max_workers=1)
+
+    def _sign_error(**kwargs):
+        return None, "invalid signature"
+
+    client.signer_client = SimpleNamespace(
+        sign_create_order=_sign_error,
+        sign_cancel_order=_sign_error,
+        sign_cancel_all_orders=_sign_error,
+    )
+    return client
+
+
+@pytest.mark.parametrize("manager_cls", [_RefreshableNonceManager, _OptimisticNonceManager])
+def test_failed_send_resyncs_sdk_nonce(manager_cls):
+    async def scenario():
+        manager = manager_cls(chain_nonce=10)
+        client = _make_client(manager)
+
+        assert await client._allocate_nonce() == 10
+
+        # nonce 10 的交易未上鏈
+        result = await client._ws_send_transaction(14, "{}", "測試下單")
+        assert result["success"] is False
+
+        # 下一筆必須重用 10，否則之後的交易都會因 nonce 斷檔而失敗
+        assert await client._allocate_nonce() == 10
+        assert await client._allocate_nonce() == 11
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("manager_cls", [_RefreshableNonceManager, _OptimisticNonceManager])
+@pytest.mark.parametrize("call", [
+    lambda c: c._ws_sign_and_send_order(
+        "測試下單", market_index=0, client_order_index=1, base_amount=1, price=1, is_ask=False,
+        order_type=0, time_in_force=1, reduce_only=False, trigger_price=0, order_expiry=-1
+    ),
+    lambda c: c.ws_cancel_order(market_index=0, order_index=1),
+    lambda c: c.ws_cancel_all_orders(),
+], ids=["create_order", "cancel_order", "cancel_all_orders"])
+def test_sign_error_resyncs_sdk_nonce(manager_cls, call):
+    async def scenario():
+        manager = manager_cls(chain_nonce=10)
+        client = _make_client(manager)
+
+        # 簽名失敗，nonce 10 未被使用
+        result = await call(client)
+        assert result["success"] is False
+
+        assert await client._allocate_nonce() == 10
+
+    asyncio.run(scenario())
@@ -0,0 +1,82 @@
+"""
+LighterClient 持倉解析與緩存測試
+批量解析 (_parse_positions_frame) 與逐條解析 (_parse_position) 對同一數據的結果必須一致；
+查詢期間被失效的持倉緩存不應寫回舊結果
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("lighter")
+pytest.importorskip("aiohttp")
+pytest.importorskip("websockets")
+
+from lighter_client import LighterClient  # noqa: E402
+
+
+class _SlotPosition:
+    """沒有 __dict__ 的持倉對象，走 _POS_FIELDS 逐欄位讀取"""
+    __slots__ = ("market_id", "position", "sign", "avg_entry_price")
+
+    def __init__(self, market_id, position, sign, avg_entry_price):
+        self.market_id = market_id
+        self.position = position
+        self.sign = sign
+        self.avg_entry_price = avg_entry_price
+
+
+PAYLOAD = [
+    # 官方字串欄位
+    SimpleNamespace(market_id=0, position="1.5", sign=1, avg_entry_price="3000.5",
+                    position_value="4500.75", unrealized_pnl="12.3", realized_pnl="0",
+                    open_order_count=2, symbol="ETH", liquidation_price="2500"),
+    # 字串 sign / market_id，包括無法轉為整數的值
+    SimpleNamespace(market_id="1", position="-0.2", sign="-1", avg_entry_price="60000"),
+    SimpleNamespace(market_id="2.0", position="0.3", sign="1.7", avg_entry_price="10"),
+    SimpleNamespace(market_id="abc", position="abc", sign=None, avg_entry_price=None),
+    # market_id 缺失時回退 market_index；數量在其他候選欄位
+    SimpleNamespace(market_id=None, market_index=3, base_amount="-4", sign=0,
+                    avg_entry_price="0", average_entry_price="25.5"),
+    SimpleNamespace(market_index="4", size=2.5, sign=0),
+    # 零持倉
+    SimpleNamespace(market_id=5, position="0", sign=0, avg_entry_price="0"),
+    # 沒有 __dict__ 的對象
+    _SlotPosition(6, "7.25", 1, "1.5"),
+    _SlotPosition("7", "-1", "-1", None),
+]
+
+
+def test_frame_parser_matches_scalar_parser():
+    expected = [LighterClient._parse_position(p) for p in PAYLOAD]
+    actual = LighterClient._parse_positions_frame(PAYLOAD)
+
+    assert actual == expected
+    for exp_row, act_row in zip(expected, actual):
+        for key, value in exp_row.items():
+            assert type(act_row[key]) is type(value), key
+
+
+def test_frame_parser_handles_empty_payload():
+    assert LighterClient._parse_positions_frame([]) == []
+
+
+def test_positions_fetched_across_invalidation_are_not_cached():
+    client = LighterClient.__new__(LighterClient)
+    client._ensure_initialized = lambda: None
+    client.account_index = 1
+    client._orders_cache_ts = {}
+    client._positions_cache = None
+    client._positions_cache_gen = 0
+
+    async def account(by, value):
+        # 查詢途中有成交，緩存被失效
+        client._invalidate_open_orders_cache()
+        return SimpleNamespace(accounts=[SimpleNamespace(positions=[PAYLOAD[0]])])
+
+    client.account_api = SimpleNamespace(account=account)
+
+    by_market = asyncio.run(client._positions_by_market())
+
+    assert by_market[0]["position_amount"] == 1.5
+    assert client._positions_cache is None
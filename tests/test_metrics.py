@@ -0,0 +1,76 @@
+"""
+MetricsTracker 測試
+get_summary() 的累計值應與 calculate_metrics() 對同一數據的結果一致
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("pydantic_settings")
+pytest.importorskip("loguru")
+
+from config import StrategyType  # noqa: E402
+from utils.metrics import MetricsTracker  # noqa: E402
+
+SUMMARY_FIELDS = ("total_trades", "win_rate", "profit_factor", "total_pnl", "max_drawdown", "sharpe_ratio")
+
+
+def _record(tracker: MetricsTracker, i: int, side: str, entry: float, exit_: float, strategy=StrategyType.MOMENTUM):
+    exit_time = datetime.now(timezone.utc) - timedelta(minutes=100 - i)
+    tracker.record_trade(
+        trade_id=f"t{i}",
+        strategy=strategy,
+        side=side,
+        entry_price=entry,
+        exit_price=exit_,
+        amount=0.5,
+        entry_time=exit_time - timedelta(minutes=30),
+        exit_time=exit_time,
+        exit_reason="測試"
+    )
+
+
+def _assert_summary_matches(tracker: MetricsTracker):
+    summary = tracker._summary_metrics()
+    metrics = tracker.calculate_metrics()
+    for field in SUMMARY_FIELDS:
+        assert summary[field] == pytest.approx(getattr(metrics, field), rel=1e-9, abs=1e-12), field
+
+
+@pytest.fixture
+def tracker(tmp_path):
+    return MetricsTracker(save_path=str(tmp_path / "metrics.json"))
+
+
+def test_empty_summary_matches(tracker):
+    _assert_summary_matches(tracker)
+
+
+def test_summary_matches_after_record_and_load(tracker):
+    prices = [(100, 103), (103, 101), (101, 101.5), (99, 97), (97, 92), (92, 95.5), (95, 95)]
+    for i, (entry, exit_) in enumerate(prices):
+        side = "LONG" if i % 2 == 0 else "SHORT"
+        strategy = StrategyType.MOMENTUM if i % 3 else StrategyType.MEAN_REVERSION
+        _record(tracker, i, side, entry, exit_, strategy)
+    for equity in (1000, 1020, 1015, 980, 990, 1040, 1001):
+        tracker.update_equity(equity)
+    _assert_summary_matches(tracker)
+
+    # 權益曲線在 _save 中保存，重新載入後累計值應由歷史重建
+    tracker._save()
+    reloaded = MetricsTracker(save_path=str(tracker.save_path))
+    _assert_summary_matches(reloaded)
+    assert reloaded._summary_metrics() == pytest.approx(tracker._summary_metrics())
+
+
+def test_sharpe_with_tightly_clustered_returns(tracker):
+    # 報酬幾乎相同：E[x²]-mean² 會因相消而失真，Welford 應與 np.std 結果一致
+    for i in range(50):
+        _record(tracker, i, "LONG", 1000.0, 1000.0 * (1.01 + 1e-9 * (i % 3)))
+    _assert_summary_matches(tracker)
+
+
+def test_identical_returns_give_zero_sharpe(tracker):
+    for i in range(5):
+        _record(tracker, i, "LONG", 100.0, 101.0)
+    assert tracker._summary_metrics()["sharpe_ratio"] == tracker.calculate_metrics().sharpe_ratio == 0
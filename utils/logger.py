@@ -24,12 +24,16 @@ def setup_logger():
         "<level>{message}</level>"
     )
     
+    # 所有 sink 使用 enqueue=True：調用方只將記錄放入隊列，
+    # 格式化輸出與文件寫入由 loguru 的後台線程完成，不阻塞事件循環
+    
     # 控制台輸出
     logger.add(
         sys.stdout,
         format=log_format,
         level="DEBUG" if settings.debug else "INFO",
-        colorize=True
+        colorize=True,
+        enqueue=True
     )
     
     # 確保日誌目錄存在
@@ -43,7 +47,8 @@ def setup_logger():
         level="INFO",
         rotation="00:00",
         retention="30 days",
-        compression="gz"
+        compression="gz",
+        enqueue=True
     )
     
     # 錯誤日誌文件
@@ -53,7 +58,8 @@ def setup_logger():
         level="ERROR",
         rotation="00:00",
         retention="30 days",
-        compression="gz"
+        compression="gz",
+        enqueue=True
     )
     
     # 交易日誌文件
@@ -63,7 +69,8 @@ def setup_logger():
         level="INFO",
         filter=lambda record: record["extra"].get("trade", False),
         rotation="00:00",
-        retention="90 days"
+        retention="90 days",
+        enqueue=True
     )
     
     return logger
@@ -122,17 +129,26 @@ def log_risk(
     leverage: float,
     win_rate: float,
     drawdown: float,
+    daily_pnl: float = None,
     **kwargs
 ):
-    """記錄風險日誌"""
-    extra_info = " | ".join([f"{k}={v}" for k, v in kwargs.items()])
-    message = (
-        f"RISK | {event} | leverage={leverage:.2f}x | "
-        f"win_rate={win_rate*100:.1f}% | drawdown={drawdown*100:.2f}%"
-    )
-    if extra_info:
-        message += f" | {extra_info}"
-    logger.info(message)
+    """
+    記錄風險日誌
+
+    數值以參數傳給 loguru，只有在記錄實際輸出時才進行格式化
+
+    Args:
+        daily_pnl: 日內盈虧比例 (0.01 = 1%)
+    """
+    message = "RISK | {} | leverage={:.2f}x | win_rate={:.1%} | drawdown={:.2%}"
+    args = [event, leverage, win_rate, drawdown]
+    if daily_pnl is not None:
+        message += " | daily_pnl={:.2%}"
+        args.append(daily_pnl)
+    for key, value in kwargs.items():
+        message += f" | {key}={{}}"
+        args.append(value)
+    logger.info(message, *args)
 
 
 # 初始化日誌
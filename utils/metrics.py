@@ -71,9 +71,47 @@ class MetricsTracker:
         self.trades: List[TradeMetric] = []
         self.equity_curve: List[tuple[datetime, float]] = []
         
+        # 摘要用的累計值 (記錄交易/權益時增量更新，get_summary 無需掃描全部交易)
+        self._reset_aggregates()
+        
         # 載入歷史數據
         self._load()
     
+    def _reset_aggregates(self):
+        """重置累計值"""
+        self._trade_count = 0
+        self._win_count = 0
+        self._total_pnl = 0.0
+        self._gross_profit = 0.0
+        self._gross_loss = 0.0
+        # 報酬的 Welford 累計 (均值與離均差平方和)，報酬集中時仍保持數值精度
+        self._return_mean = 0.0
+        self._return_m2 = 0.0
+        self._peak_equity = 0.0
+        self._max_drawdown = 0.0
+    
+    def _accumulate_trade(self, trade: TradeMetric):
+        """將一筆交易計入累計值"""
+        self._trade_count += 1
+        self._total_pnl += trade.pnl
+        if trade.pnl > 0:
+            self._win_count += 1
+            self._gross_profit += trade.pnl
+        else:
+            self._gross_loss += abs(trade.pnl)
+        delta = trade.pnl_percent - self._return_mean
+        self._return_mean += delta / self._trade_count
+        self._return_m2 += delta * (trade.pnl_percent - self._return_mean)
+    
+    def _accumulate_equity(self, equity: float):
+        """以新權益更新峰值與最大回撤水位"""
+        if equity > self._peak_equity:
+            self._peak_equity = equity
+        elif self._peak_equity > 0:
+            dd = (self._peak_equity - equity) / self._peak_equity
+            if dd > self._max_drawdown:
+                self._max_drawdown = dd
+    
     def record_trade(
         self,
         trade_id: str,
@@ -112,11 +150,13 @@ class MetricsTracker:
         )
         
         self.trades.append(trade)
+        self._accumulate_trade(trade)
         self._save()
     
     def update_equity(self, equity: float):
         """更新權益曲線"""
         self.equity_curve.append((datetime.now(timezone.utc), equity))
+        self._accumulate_equity(equity)
         
         # 只保留最近 30 天
         cutoff = datetime.now(timezone.utc) - timedelta(days=30)
@@ -303,20 +343,51 @@ class MetricsTracker:
             by_strategy={}
         )
     
+    def _summary_metrics(self) -> Dict[str, float]:
+        """
+        由累計值計算摘要指標 (O(1))，與 calculate_metrics() 的對應欄位一致
+        
+        最大回撤為自啟動/載入以來的水位，不受權益曲線 30 天裁剪影響。
+        """
+        n = self._trade_count
+        win_rate = self._win_count / n if n > 0 else 0
+        if n == 0:
+            profit_factor = 0
+        elif self._gross_loss > 0:
+            profit_factor = self._gross_profit / self._gross_loss
+        else:
+            profit_factor = float('inf')
+        
+        # Sharpe: 與 _calculate_sharpe 相同 (母體標準差、標準差為 0 時返回 0)
+        sharpe = 0
+        if n >= 2:
+            std_return = np.sqrt(self._return_m2 / n)
+            if std_return != 0:
+                sharpe = (self._return_mean / std_return) * np.sqrt(252)
+        
+        return {
+            "total_trades": n,
+            "win_rate": win_rate,
+            "profit_factor": profit_factor,
+            "total_pnl": self._total_pnl,
+            "max_drawdown": self._max_drawdown,
+            "sharpe_ratio": sharpe
+        }
+    
     def get_summary(self) -> str:
-        """取得績效摘要"""
-        metrics = self.calculate_metrics()
+        """取得績效摘要 (由累計值計算；完整指標請用 calculate_metrics())"""
+        m = self._summary_metrics()
         
         summary = f"""
 ╔══════════════════════════════════════╗
 ║         績效摘要                      ║
 ╠══════════════════════════════════════╣
-║ 總交易次數: {metrics.total_trades:>20} ║
-║ 勝率:      {metrics.win_rate*100:>19.1f}% ║
-║ 獲利因子:  {metrics.profit_factor:>20.2f} ║
-║ 總盈虧:    ${metrics.total_pnl:>18.2f} ║
-║ 最大回撤:  {metrics.max_drawdown*100:>19.2f}% ║
-║ Sharpe:    {metrics.sharpe_ratio:>20.2f} ║
+║ 總交易次數: {m['total_trades']:>20} ║
+║ 勝率:      {m['win_rate']*100:>19.1f}% ║
+║ 獲利因子:  {m['profit_factor']:>20.2f} ║
+║ 總盈虧:    ${m['total_pnl']:>18.2f} ║
+║ 最大回撤:  {m['max_drawdown']*100:>19.2f}% ║
+║ Sharpe:    {m['sharpe_ratio']:>20.2f} ║
 ╚══════════════════════════════════════╝
 """
         return summary
@@ -373,6 +444,13 @@ class MetricsTracker:
             
         except Exception:
             pass
+        
+        # 由載入的歷史重建累計值
+        self._reset_aggregates()
+        for trade in self.trades:
+            self._accumulate_trade(trade)
+        for _, equity in self.equity_curve:
+            self._accumulate_equity(equity)
 
 
 # 全域績效追蹤器